@@ -1,9 +1,17 @@
+import asyncio
+import copy
+import hashlib
 import json
 import os
-from typing import Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
 
 import firebase_admin
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import HTTPException, Request, status
 from firebase_admin import auth as admin_auth
 from firebase_admin import credentials, firestore
 
@@ -41,6 +49,111 @@ def get_db():
     return firestore.client()
 
 
+class TokenCache:
+    """Verified ID-token claims keyed by SHA-256 of the token, valid until the token's ``exp``.
+
+    Bounded LRU; ``skew_s`` drops entries a little before expiry so a cached token is never
+    accepted after Firebase would reject it.
+    """
+
+    def __init__(self, max_items: int = 10000, skew_s: float = 30.0):
+        self.max_items = max_items
+        self.skew_s = skew_s
+        self._items: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "failures": 0, "evictions": 0}
+        self.verify = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is not None:
+                if hit[0] - self.skew_s > time.time():
+                    self._items.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return hit[1]
+                del self._items[key]
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key: str, claims: Dict[str, Any]) -> None:
+        exp = float(claims.get("exp", 0))
+        with self._lock:
+            self._items[key] = (exp, claims)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def observe(self, ms: float, ok: bool) -> None:
+        with self._lock:
+            self.verify["count"] += 1
+            self.verify["total_ms"] += ms
+            self.verify["max_ms"] = max(self.verify["max_ms"], ms)
+            if not ok:
+                self.counters["failures"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c: Dict[str, Any] = dict(self.counters)
+            c["items"] = len(self._items)
+            v = dict(self.verify)
+        lookups = c["hits"] + c["misses"]
+        c["hit_rate"] = round(c["hits"] / lookups, 4) if lookups else 0.0
+        v["avg_ms"] = round(v["total_ms"] / v["count"], 3) if v["count"] else 0.0
+        v["total_ms"] = round(v["total_ms"], 3)
+        v["max_ms"] = round(v["max_ms"], 3)
+        c["verify"] = v
+        return c
+
+
+TOKENS = TokenCache(
+    max_items=int(os.getenv("TOKEN_CACHE_MAX_ITEMS", "10000")),
+    skew_s=float(os.getenv("TOKEN_CACHE_SKEW_S", "30")),
+)
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("TOKEN_VERIFY_WORKERS", "4")), thread_name_prefix="verify-token")
+_INFLIGHT: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+def _timed_verify(id_token: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    ok = False
+    try:
+        decoded = admin_auth.verify_id_token(id_token)
+        ok = True
+        return decoded
+    finally:
+        TOKENS.observe((time.perf_counter() - started) * 1000.0, ok)
+
+
+def _verified(key: str, fut: "asyncio.Future[Dict[str, Any]]") -> None:
+    # Runs on the loop when a verification ends, whether or not any request still waits for it
+    _INFLIGHT.pop(key, None)
+    if not fut.cancelled() and fut.exception() is None:
+        TOKENS.put(key, fut.result())
+
+
+async def verify_id_token_cached(id_token: str) -> Dict[str, Any]:
+    """Verify off the event loop; concurrent requests with the same token share one verification.
+
+    The verification belongs to no single request: every caller awaits it through
+    ``asyncio.shield``, so a cancelled request (client gone) leaves it running for the others,
+    and it caches and leaves ``_INFLIGHT`` on its own. Callers get their own copy of the claims.
+    """
+    key = hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+    claims = TOKENS.get(key)
+    if claims is not None:
+        return copy.deepcopy(claims)
+    pending = _INFLIGHT.get(key)
+    if pending is None:
+        pending = asyncio.get_running_loop().run_in_executor(_VERIFY_POOL, _timed_verify, id_token)
+        _INFLIGHT[key] = pending
+        pending.add_done_callback(partial(_verified, key))
+    else:
+        TOKENS.counters["coalesced"] += 1
+    return copy.deepcopy(await asyncio.shield(pending))
+
+
 async def verify_token(request: Request) -> Dict[str, Any]:
     if _insecure_mode():
         return {"uid": "dev-user"}
@@ -51,11 +164,8 @@ async def verify_token(request: Request) -> Dict[str, Any]:
         )
     id_token = auth_header.split(" ", 1)[1]
     try:
-        decoded = admin_auth.verify_id_token(id_token)
-        return decoded
+        return await verify_id_token_cached(id_token)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token"
         )
-
-
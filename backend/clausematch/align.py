@@ -1,8 +1,10 @@
 from typing import Dict, List
 
+from clausematch_engine.align import align
 
-def align_segments(src_segments: List[str], tgt_segments: List[str]) -> List[Dict]:
-    # Minimal baseline: index-wise pairing, pad shorter list
+
+def index_align(src_segments: List[str], tgt_segments: List[str]) -> List[Dict]:
+    # Index-wise pairing, pad shorter list (previous default, kept for comparison)
     max_len = max(len(src_segments), len(tgt_segments))
     pairs: List[Dict] = []
     for i in range(max_len):
@@ -16,3 +18,9 @@ def align_segments(src_segments: List[str], tgt_segments: List[str]) -> List[Dic
     return pairs
 
 
+def align_segments(src_segments: List[str], tgt_segments: List[str]) -> List[Dict]:
+    # Gale-Church alignment banded around numeric anchors; merged beads are space-joined
+    return [
+        {"index": k, "source": source, "target": target}
+        for k, (source, target) in enumerate(align(src_segments, tgt_segments))
+    ]
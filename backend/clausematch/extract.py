@@ -1,21 +1,13 @@
 from typing import Dict, List
 
+from .records import PairMetrics
 
-def extract_entities(pairs: List[Dict]) -> List[Dict]:
+
+def extract_entities(pairs: List[Dict]) -> List[PairMetrics]:
     # Minimal placeholder: return lengths and simple stats per pair
-    results: List[Dict] = []
+    results: List[PairMetrics] = []
     for p in pairs:
         src = p.get("source", "")
         tgt = p.get("target", "")
-        results.append(
-            {
-                "index": p.get("index"),
-                "sourceLength": len(src),
-                "targetLength": len(tgt),
-                "sourceWordCount": len(src.split()),
-                "targetWordCount": len(tgt.split()),
-            }
-        )
+        results.append(PairMetrics(p.get("index"), len(src), len(tgt), len(src.split()), len(tgt.split())))
     return results
-
-
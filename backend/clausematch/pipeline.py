@@ -0,0 +1,44 @@
+"""The analyze pipeline as an engine graph.
+
+After alignment and the revision split, entity extraction and the similarity batch do not
+depend on each other and run side by side; ``compare`` joins them. Stage executors can be
+overridden with ``ANALYZE_EXECUTORS`` (e.g. ``similarity=inline,extract=thread``).
+"""
+import os
+from typing import Dict, List, Tuple
+
+from clausematch_engine.graph import Graph, Stage, parse_executors
+
+from . import align, compare, extract, report, revision
+from .records import Comparison, PairMetrics
+
+Split = Tuple[List[Dict], Dict[int, Comparison]]
+
+
+def _extract(split: Split) -> List[PairMetrics]:
+    return extract.extract_entities(split[0])
+
+
+def _similarity(split: Split) -> List[float]:
+    return compare.similarities(split[0])
+
+
+def _compare(pairs: List[Dict], split: Split, entities: List[PairMetrics], sims: List[float]) -> Tuple[Dict, List[Comparison]]:
+    todo, carried = split
+    records = revision.merge(pairs, compare.compare_pairs(todo, entities, sims), carried)
+    # Still records: the route turns them into dicts for the response body and Firestore
+    return report.summarize(records), records
+
+
+ANALYZE = Graph(
+    [
+        Stage("align", align.align_segments, ("source", "target")),
+        # Revision mode: pairs unchanged since the previous report keep its comparisons
+        Stage("revision", revision.split_pairs, ("align", "previous")),
+        Stage("extract", _extract, ("revision",)),
+        Stage("similarity", _similarity, ("revision",), executor="thread"),
+        Stage("compare", _compare, ("align", "revision", "extract", "similarity")),
+    ],
+    inputs=("source", "target", "previous"),
+    executors=parse_executors(os.getenv("ANALYZE_EXECUTORS", "")),
+)
@@ -0,0 +1,74 @@
+"""Slotted per-pair records; converted to the JSON/Firestore dict shape only when stored or returned.
+
+These are the report's camelCase pair shape, which the frontend and stored Firestore reports
+read; the clausematch API's ``Finding`` is a different record (a per-clause verdict with its own
+snake_case contract). Both build on ``clausematch_engine.records.Record``.
+"""
+from typing import Any, Dict, Optional
+
+from clausematch_engine.records import Record
+
+
+class PairMetrics(Record):
+    __slots__ = ("index", "source_length", "target_length", "source_word_count", "target_word_count")
+
+    def __init__(self, index: Optional[int], source_length: int, target_length: int, source_word_count: int, target_word_count: int):
+        self.index = index
+        self.source_length = source_length
+        self.target_length = target_length
+        self.source_word_count = source_word_count
+        self.target_word_count = target_word_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "sourceLength": self.source_length,
+            "targetLength": self.target_length,
+            "sourceWordCount": self.source_word_count,
+            "targetWordCount": self.target_word_count,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PairMetrics":
+        return cls(
+            d.get("index"),
+            d.get("sourceLength", 0),
+            d.get("targetLength", 0),
+            d.get("sourceWordCount", 0),
+            d.get("targetWordCount", 0),
+        )
+
+
+class Comparison(Record):
+    __slots__ = ("index", "source", "target", "similarity", "is_mismatch", "metrics")
+
+    def __init__(self, index: Optional[int], source: str, target: str, similarity: float, is_mismatch: bool, metrics: Optional[PairMetrics]):
+        self.index = index
+        # The aligned pair's strings, referenced rather than copied
+        self.source = source
+        self.target = target
+        self.similarity = similarity
+        self.is_mismatch = is_mismatch
+        self.metrics = metrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "source": self.source,
+            "target": self.target,
+            "similarity": self.similarity,
+            "isMismatch": self.is_mismatch,
+            "metrics": self.metrics.to_dict() if self.metrics is not None else {},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Comparison":
+        metrics = d.get("metrics")
+        return cls(
+            d.get("index"),
+            d.get("source", ""),
+            d.get("target", ""),
+            float(d.get("similarity", 0.0)),
+            bool(d.get("isMismatch")),
+            PairMetrics.from_dict(metrics) if metrics else None,
+        )
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Tuple
+
+from clausematch_engine.revision import pair_digest
+
+from .records import Comparison
+
+
+def _record(c: Any) -> Comparison:
+    return c if isinstance(c, Comparison) else Comparison.from_dict(c)
+
+
+def split_pairs(pairs: List[Dict], previous: List[Any]) -> Tuple[List[Dict], Dict[int, Comparison]]:
+    """Split aligned pairs into those still to compare and those a previous revision already did.
+
+    ``previous`` are the stored comparisons of the earlier report: records from the in-memory
+    store or dicts read back from Firestore. Returns (pairs to compute,
+    {position: carried comparison}); carried comparisons are re-indexed to their new position.
+    """
+    done = {pair_digest(c.source or "", c.target or ""): c for c in map(_record, previous)}
+    todo: List[Dict] = []
+    carried: Dict[int, Comparison] = {}
+    for pos, p in enumerate(pairs):
+        old = done.get(pair_digest(p.get("source", ""), p.get("target", "")))
+        if old is None:
+            todo.append(p)
+            continue
+        # Copies: the previous report's records stay as they were stored
+        index = p.get("index")
+        pair_metrics = old.metrics.replace(index=index) if old.metrics is not None else None
+        carried[pos] = old.replace(index=index, metrics=pair_metrics)
+    return todo, carried
+
+
+def merge(pairs: List[Dict], computed: List[Comparison], carried: Dict[int, Comparison]) -> List[Comparison]:
+    # computed holds the comparisons for the non-carried pairs, in order
+    it = iter(computed)
+    return [carried[pos] if pos in carried else next(it) for pos in range(len(pairs))]
@@ -1,5 +1,11 @@
-from fastapi import FastAPI
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+
+from backend.auth import TOKENS
+from clausematch_engine import metrics
 
 # Routers will be imported after app creation to avoid circular imports
 
@@ -17,6 +23,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 
 @app.get("/health")
@@ -24,6 +32,26 @@ def healthcheck():
     return {"status": "ok"}
 
 
+def operational(authorization: Optional[str] = Header(None)) -> None:
+    # /metrics and /auth/stats: off with METRICS_ENABLED=0, behind METRICS_TOKEN when set
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404)
+    if not metrics.authorized(authorization):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@app.get("/auth/stats", dependencies=[Depends(operational)])
+def auth_stats():
+    # Token cache hit rate and verification latency
+    return TOKENS.stats()
+
+
+@app.get("/metrics", dependencies=[Depends(operational)])
+def prometheus_metrics():
+    # Prometheus text format: request latency, analysis stages (incl. Firestore); rendered only when scraped
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # Import routers after app is created
 from backend.routes import analyze  # noqa: E402
 
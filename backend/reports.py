@@ -0,0 +1,113 @@
+"""Firestore persistence for analysis reports.
+
+A report is one document in ``reports`` (owner, filenames, summary) plus its pairs, split
+into chunk documents under ``reports/{id}/pairs`` so no single document approaches
+Firestore's 1 MiB limit. The Firestore client is synchronous, so every call is run in the
+threadpool. Works against the real client, the emulator (``FIRESTORE_EMULATOR_HOST``) or
+the in-process fake the tests use (``tests/firestore_fake.py``).
+"""
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from clausematch_engine.paging import Position
+from clausematch_engine.records import as_dict
+
+
+COLLECTION = "reports"
+PAIRS = "pairs"
+# Firestore allows 500 writes per batch and 1 MiB per document
+MAX_BATCH_WRITES = 500
+CHUNK_BYTES = 512 * 1024
+# Same value as firestore.Query.DESCENDING
+DESCENDING = "DESCENDING"
+
+
+def chunk_pairs(pairs: List[Any], max_bytes: int = CHUNK_BYTES) -> List[List[Dict[str, Any]]]:
+    # Pairs may be comparison records; chunks hold their Firestore dicts
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    size = 0
+    for p in map(as_dict, pairs):
+        n = len(json.dumps(p, ensure_ascii=False).encode("utf-8"))
+        if current and size + n > max_bytes:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(p)
+        size += n
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ReportRepository:
+    def __init__(self, db):
+        self.db = db
+
+    def _ref(self, project_id: str):
+        return self.db.collection(COLLECTION).document(project_id)
+
+    def _save(self, project_id: str, meta: Dict[str, Any], pairs: List[Any]) -> None:
+        ref = self._ref(project_id)
+        chunks = chunk_pairs(pairs)
+        batch, writes = self.db.batch(), 0
+        for k, items in enumerate(chunks):
+            batch.set(ref.collection(PAIRS).document(f"{k:05d}"), {"index": k, "pairs": items})
+            writes += 1
+            if writes == MAX_BATCH_WRITES:
+                batch.commit()
+                batch, writes = self.db.batch(), 0
+        # The report document goes in the last batch, so it is never visible before its pairs
+        batch.set(ref, {**meta, "pairCount": len(pairs), "pairChunks": len(chunks)})
+        batch.commit()
+
+    def _get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        snap = self._ref(project_id).get()
+        return snap.to_dict() if snap.exists else None
+
+    def _pairs(self, project_id: str) -> List[Dict[str, Any]]:
+        query = self._ref(project_id).collection(PAIRS).order_by("index")
+        return [p for snap in query.stream() for p in snap.to_dict()["pairs"]]
+
+    def iter_pairs(self, project_id: str, chunks: int, start: Position = (0, 0)) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(cursor, pair) from ``start`` on, reading one chunk document at a time."""
+        k, i = start
+        pairs = self._ref(project_id).collection(PAIRS)
+        for n in range(k, chunks):
+            snap = pairs.document(f"{n:05d}").get()
+            if not snap.exists:
+                return
+            items = snap.to_dict()["pairs"]
+            for j in range(i if n == k else 0, len(items)):
+                yield f"{n}:{j}", items[j]
+
+    def _page(self, user_id: str, limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        query = (
+            self.db.collection(COLLECTION)
+            .where("userId", "==", user_id)
+            .order_by("createdAt", direction=DESCENDING)
+        )
+        if cursor:
+            last = self._ref(cursor).get()
+            if not last.exists or last.to_dict().get("userId") != user_id:
+                raise KeyError(cursor)
+            query = query.start_after(last)
+        # One extra document tells whether there is a next page
+        snaps = list(query.limit(limit + 1).stream())
+        items = [{"projectId": s.id, **s.to_dict()} for s in snaps[:limit]]
+        next_cursor = items[-1]["projectId"] if len(snaps) > limit else None
+        return items, next_cursor
+
+    async def save(self, project_id: str, meta: Dict[str, Any], pairs: List[Any]) -> None:
+        await run_in_threadpool(self._save, project_id, meta, pairs)
+
+    async def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        return await run_in_threadpool(self._get, project_id)
+
+    async def pairs(self, project_id: str) -> List[Dict[str, Any]]:
+        return await run_in_threadpool(self._pairs, project_id)
+
+    async def page(self, user_id: str, limit: int = 25, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest first; raises KeyError for a cursor that is not one of the user's reports."""
+        return await run_in_threadpool(self._page, user_id, limit, cursor)
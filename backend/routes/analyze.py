@@ -1,37 +1,87 @@
 import os
 import time
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from firebase_admin import firestore as fb_firestore
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from backend.auth import get_db, verify_token
-from backend.clausematch import align, compare, extract, report, segment
+from backend.reports import ReportRepository
+from backend.clausematch import pipeline, segment
+from clausematch_engine import metrics, paging
+from clausematch_engine.records import as_dict, json_default
+from clausematch_engine.store import BoundedStore
 
 
 router = APIRouter(tags=["analyze"])
 INSECURE_MODE = os.getenv("FIREBASE_ALLOW_INSECURE", "").lower() in {"1", "true", "yes"}
-_INMEM_REPORTS: Dict[str, Dict[str, Any]] = {}
+# Insecure (dev) mode keeps reports in memory, bounded by REPORT_STORE_* settings; pairs stay
+# comparison records there
+_INMEM_REPORTS = BoundedStore.from_env("REPORT_STORE", json_default=json_default)
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+
+async def _chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _repo() -> ReportRepository:
+    return ReportRepository(get_db())
+
+
+async def _owned_report(project_id: str, user: Dict[str, Any], missing: str = "Report not found") -> Dict[str, Any]:
+    data = await _repo().get(project_id)
+    if not data:
+        raise HTTPException(status_code=404, detail=missing)
+    if data.get("userId") != user.get("uid"):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return data
+
+
+async def _previous_pairs(project_id: str, user: Dict[str, Any]) -> List[Any]:
+    # Comparisons of an earlier revision owned by the caller, as records or stored dicts
+    if INSECURE_MODE:
+        data = _INMEM_REPORTS.get(project_id)
+        if not data:
+            raise HTTPException(status_code=404, detail="Previous report not found")
+        return data.get("pairs", [])
+    await _owned_report(project_id, user, "Previous report not found")
+    return await _repo().pairs(project_id)
 
 
 @router.post("/analyze")
 async def analyze_endpoint(
     source: UploadFile = File(...),
     target: UploadFile = File(...),
+    previous_project_id: Optional[str] = Form(None),
     user: Dict[str, Any] = Depends(verify_token),
 ):
-    src_bytes = await source.read()
-    tgt_bytes = await target.read()
-    src_text = src_bytes.decode("utf-8", errors="ignore")
-    tgt_text = tgt_bytes.decode("utf-8", errors="ignore")
-
-    src_segments = segment.segment_text(src_text)
-    tgt_segments = segment.segment_text(tgt_text)
-    pairs = align.align_segments(src_segments, tgt_segments)
-    entities = extract.extract_entities(pairs)
-    comparisons = compare.compare_pairs(pairs, entities)
-    summary = report.summarize(comparisons)
+    previous = []
+    if previous_project_id:
+        with metrics.timed("previous"):
+            previous = await _previous_pairs(previous_project_id, user)
+    # Stream the uploads chunk by chunk; neither the raw bytes nor the full text are held
+    with metrics.timed("segment"):
+        src_segments = [s async for s in segment.segment_stream(_chunks(source))]
+        tgt_segments = [s async for s in segment.segment_stream(_chunks(target))]
+    # align -> revision -> (extract | similarity) -> compare, off the event loop
+    stages = await run_in_threadpool(
+        pipeline.ANALYZE.run, {"source": src_segments, "target": tgt_segments, "previous": previous}, metrics.timed
+    )
+    todo, carried = stages["revision"]
+    summary, comparisons = stages["compare"]
+    if previous_project_id:
+        summary["revision"] = {
+            "previousProjectId": previous_project_id,
+            "carriedOver": len(carried),
+            "recomputed": len(todo),
+        }
 
     project_id = str(uuid.uuid4())
     created_at = int(time.time())
@@ -42,73 +92,90 @@ async def analyze_endpoint(
         "createdAt": created_at,
         "filenames": {"source": source.filename, "target": target.filename},
         "summary": summary,
-        "pairs": comparisons,
+        "pairs": [as_dict(c) for c in comparisons],
     }
 
     if INSECURE_MODE:
-        _INMEM_REPORTS[project_id] = {
-            "userId": result["userId"],
-            "createdAt": created_at,
-            "filenames": result["filenames"],
-            "summary": summary,
-            "pairs": comparisons,
-        }
+        with metrics.timed("store"):
+            _INMEM_REPORTS.put(
+                project_id,
+                {
+                    "userId": result["userId"],
+                    "createdAt": created_at,
+                    "filenames": result["filenames"],
+                    "summary": summary,
+                    "pairs": comparisons,
+                },
+                owner=result["userId"],
+                created_at=created_at,
+            )
     else:
-        db = get_db()
-        db.collection("reports").document(project_id).set(
-            {
-                "userId": result["userId"],
-                "createdAt": created_at,
-                "filenames": result["filenames"],
-                "summary": summary,
-            }
-        )
+        # Report document plus chunked pairs, written in batches off the event loop
+        with metrics.timed("firestore"):
+            await _repo().save(
+                project_id,
+                {
+                    "userId": result["userId"],
+                    "createdAt": created_at,
+                    "filenames": result["filenames"],
+                    "summary": summary,
+                },
+                comparisons,
+            )
 
     return result
 
 
 @router.get("/results/{project_id}")
-def get_results(project_id: str, user: Dict[str, Any] = Depends(verify_token)):
+async def get_results(
+    project_id: str,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    user: Dict[str, Any] = Depends(verify_token),
+):
+    # The report with one page of pairs; pass nextCursor for the following page. status filters
+    # pairs (OK, MISMATCH; comma-separated). With Accept: application/x-ndjson, every matching
+    # pair after the cursor is streamed one per line instead, and limit is ignored.
+    filters = paging.parse_filters(status=status)
+    try:
+        start = paging.parse_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     if INSECURE_MODE:
         data = _INMEM_REPORTS.get(project_id)
         if not data:
             raise HTTPException(status_code=404, detail="Report not found")
-        return {"projectId": project_id, **data}
+        meta = {k: v for k, v in data.items() if k != "pairs"}
+        entries = paging.positioned(data.get("pairs", []), start)
     else:
-        db = get_db()
-        doc = db.collection("reports").document(project_id).get()
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail="Report not found")
-        data = doc.to_dict()
-        if data.get("userId") != user.get("uid"):
-            raise HTTPException(status_code=403, detail="Forbidden")
-        return {"projectId": project_id, **data}
+        meta = await _owned_report(project_id, user)
+        entries = _repo().iter_pairs(project_id, meta.get("pairChunks", 0), start)
+    if paging.wants_ndjson(request):
+        # A sync iterator: Starlette pulls it in the threadpool, chunk document by chunk document
+        return StreamingResponse(paging.ndjson_lines(entries, filters), media_type=paging.NDJSON)
+    pairs, next_cursor = await run_in_threadpool(paging.take_page, entries, limit, filters)
+    return {"projectId": project_id, **meta, "pairs": pairs, "nextCursor": next_cursor}
 
 
 @router.get("/reports")
-def list_reports(user: Dict[str, Any] = Depends(verify_token)):
+async def list_reports(
+    limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,
+    user: Dict[str, Any] = Depends(verify_token),
+):
+    # Newest first; pass the returned nextCursor to get the following page
     if INSECURE_MODE:
-        # Return latest 25 by createdAt
-        items = sorted(
-            (
-                {"projectId": pid, **data}
-                for pid, data in _INMEM_REPORTS.items()
-            ),
-            key=lambda x: x.get("createdAt", 0),
-            reverse=True,
-        )[:25]
-        return {"items": items}
+        try:
+            entries, next_cursor = _INMEM_REPORTS.page(user.get("uid"), limit, cursor)
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = [{"projectId": pid, **{k: v for k, v in data.items() if k != "pairs"}} for pid, data in entries]
+        return {"items": page, "nextCursor": next_cursor}
     else:
-        db = get_db()
-        query = (
-            db.collection("reports")
-            .where("userId", "==", user.get("uid"))
-            .order_by("createdAt", direction=fb_firestore.Query.DESCENDING)
-            .limit(25)
-        )
-        items: List[Dict[str, Any]] = []
-        for doc in query.stream():
-            items.append({"projectId": doc.id, **doc.to_dict()})
-        return {"items": items}
-
-
+        try:
+            page, next_cursor = await _repo().page(user.get("uid"), limit, cursor)
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return {"items": page, "nextCursor": next_cursor}
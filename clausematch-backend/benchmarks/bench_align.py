@@ -0,0 +1,72 @@
+"""Compare index-wise pairing with the banded Gale-Church and n-gram embedding aligners.
+
+Run from clausematch-backend/: ``python benchmarks/bench_align.py [--mem] [sizes...]``
+``--mem`` adds a second, tracemalloc-instrumented pass (slow) for peak memory.
+"""
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# The API app, and the repository root for clausematch_engine
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "services" / "api"), str(Path(__file__).resolve().parents[2])]
+
+from app.pipeline import align, semantic  # noqa: E402
+
+_tag_re = re.compile(r"§(\d+)")
+
+
+def make_docs(n: int, edits: int, seed: int = 7):
+    rnd = random.Random(seed)
+    en, de = [], []
+    for i in range(n):
+        filler = " ".join(rnd.choice(["payment", "term", "notice", "party", "invoice"]) for _ in range(rnd.randint(3, 25)))
+        en.append(f"§{i} The supplier shall pay EUR {rnd.randint(1, 99999)} by 2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {filler}")
+    for s in en:
+        de.append(s.replace("The supplier shall pay", "Der Lieferant zahlt").replace("by", "bis") + " zusätzlich")
+    for _ in range(edits):
+        k = rnd.randrange(len(de))
+        if rnd.random() < 0.5:
+            de.insert(k, "Eingefügter Satz ohne Gegenstück im Original")
+        else:
+            del de[k]
+    return en, de
+
+
+def accuracy(pairs) -> float:
+    good = total = 0
+    for _, a, b in pairs:
+        ta, tb = set(_tag_re.findall(a)), set(_tag_re.findall(b))
+        if ta:
+            total += 1
+            good += bool(ta & tb)
+    return good / max(1, total)
+
+
+def run(fn, en, de, mem: bool):
+    t0 = time.perf_counter()
+    pairs = fn(en, de)
+    elapsed = time.perf_counter() - t0
+    peak = 0
+    if mem:
+        tracemalloc.start()
+        fn(en, de)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak, accuracy(pairs)
+
+
+def main(sizes, mem: bool):
+    print(f"{'n':>7} {'aligner':>12} {'seconds':>9} {'peak MiB':>9} {'paired ok':>9}")
+    for n in sizes:
+        en, de = make_docs(n, edits=max(1, n // 200))
+        for name, fn in (("index", align.index_align), ("gale-church", align.anchor_align), ("embed", semantic.embed_align)):
+            elapsed, peak, acc = run(fn, en, de, mem)
+            print(f"{n:>7} {name:>12} {elapsed:>9.3f} {peak / 2**20 if mem else float('nan'):>9.1f} {acc:>9.3f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main([int(a) for a in args if a != "--mem"] or [100, 1000, 10000], "--mem" in args)
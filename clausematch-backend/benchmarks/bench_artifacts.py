@@ -0,0 +1,77 @@
+"""findings.json written and read back: the previous json.dump files vs the content-addressed store.
+
+Run from clausematch-backend/: ``python benchmarks/bench_artifacts.py [clauses...]``
+Each codec writes the same findings twice under two job IDs; the second write is deduplicated.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "services" / "api"), str(Path(__file__).resolve().parents[2])]
+
+ROOT = tempfile.mkdtemp(prefix="bench-artifacts-")
+os.environ["ARTIFACT_ROOT"] = ROOT
+
+from app.pipeline import rag_client, ranker, rules, storage  # noqa: E402
+from bench_facts import make_clauses  # noqa: E402
+
+
+def findings(n):
+    en, de = make_clauses(n)
+    out = []
+    for i, (a, b) in enumerate(zip(en, de)):
+        diffs = rules.compare_facts(rules.extract_facts(a, "en"), rules.extract_facts(b, "de"))
+        for f in rules.merge_findings(f"clause_{i}", diffs, [], rag_client.topk(a, lang="en", k=3)):
+            f.risk, f.confidence = ranker.score(f)
+            out.append(f.to_dict())
+    return out
+
+
+def disk_bytes(root):
+    return sum(p.stat().st_size for p in Path(root).rglob("*") if p.is_file())
+
+
+def legacy(data, root):
+    # Previous storage.put_json / get_json
+    for job in ("a", "b"):
+        full = os.path.join(root, job, "findings.json")
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    t = time.perf_counter()
+    with open(os.path.join(root, "a", "findings.json"), encoding="utf-8") as f:
+        json.load(f)
+    return time.perf_counter() - t
+
+
+def store(data, codec):
+    os.environ["ARTIFACT_COMPRESSION"] = codec
+    for job in ("a", "b"):
+        storage.put_json(f"{codec}-{job}/findings.json", data)
+    t = time.perf_counter()
+    storage.get_json(f"{codec}-a/findings.json")
+    return time.perf_counter() - t
+
+
+def main(sizes) -> None:
+    codecs = ["none", "gzip"] + (["zstd"] if storage.zstandard is not None else [])
+    print(f"{'clauses':>8} {'findings':>9} {'variant':>8} {'write ms':>9} {'read ms':>8} {'on disk':>10}")
+    for n in sizes:
+        data = findings(n)
+        runs = [("json", lambda root: legacy(data, root))]
+        runs += [(c, lambda root, c=c: store(data, c)) for c in codecs]
+        for name, fn in runs:
+            root = os.path.join(ROOT, f"{n}-{name}")
+            os.makedirs(root)
+            storage._backend = storage.LocalBackend(root)
+            t = time.perf_counter()
+            read_s = fn(root)
+            write_s = time.perf_counter() - t - read_s
+            print(f"{n:>8} {len(data):>9} {name:>8} {write_s * 1000:>9.1f} {read_s * 1000:>8.1f} {disk_bytes(root):>10,}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000])
@@ -0,0 +1,85 @@
+"""Throughput of the single-pass fact scanner against the previous three-regex extract_facts.
+
+Run from clausematch-backend/: ``python benchmarks/bench_facts.py [clauses...]``
+Also reports how often the EN and DE versions of a clause yield the same money amounts.
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "services" / "api"), str(Path(__file__).resolve().parents[2])]
+
+from app.pipeline import rules  # noqa: E402
+
+# Previous implementation (money parsing guarded: it raised on a bare "EUR ")
+money_re = re.compile(r"(?i)(€|eur|euro[s]?)\s*([\d\s.,]+)")
+date_re = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})")
+num_re = re.compile(r"\b\d[\d\s.,]*\b")
+
+
+def _to_minor(amount_str):
+    cleaned = amount_str.replace(" ", "").replace(",", "")
+    if "." in cleaned:
+        major, minor = cleaned.split(".", 1)
+        minor = (minor + "00")[:2]
+        return int(major or 0) * 100 + int(minor or 0)
+    return int(cleaned) * 100
+
+
+def legacy_extract_facts(text, lang):
+    facts = {"money": [], "dates": [], "numbers": []}
+    for m in money_re.finditer(text):
+        ccy, amt = m.group(1).upper(), m.group(2)
+        try:
+            minor = _to_minor(amt)
+        except ValueError:
+            continue
+        facts["money"].append({"currency": "EUR" if ccy.startswith("€") or ccy.startswith("EU") else ccy, "amount_minor": minor})
+    for d in date_re.finditer(text):
+        y, mo, da = d.groups()
+        facts["dates"].append(f"{int(y):04d}-{int(mo):02d}-{int(da):02d}")
+    for n in num_re.finditer(text):
+        facts["numbers"].append(n.group(0).replace(" ", "").replace(",", ""))
+    return facts
+
+
+def make_clauses(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    filler = ["the", "supplier", "shall", "deliver", "goods", "within", "days", "of", "notice", "under", "this", "agreement"]
+    en, de = [], []
+    for i in range(n):
+        amount = rnd.randint(1, 9_999_999) / 100
+        y, m, d = 2025, rnd.randint(1, 12), rnd.randint(1, 28)
+        pct, days = rnd.randint(1, 30), rnd.randint(5, 90)
+        words = " ".join(rnd.choice(filler) for _ in range(rnd.randint(10, 40)))
+        en.append(f"{i}. The supplier shall pay EUR {amount:,.2f} by {y}-{m:02d}-{d:02d} plus {pct}% within {days} days; {words}")
+        de_amount = f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+        de.append(f"{i}. Der Lieferant zahlt {de_amount} € bis {d:02d}.{m:02d}.{y} zzgl. {pct} % binnen {days} Tagen; {words}")
+    return en, de
+
+
+def run(fn, clauses, lang, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = [fn(c, lang) for c in clauses]
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(sizes) -> None:
+    print(f"{'clauses':>8} {'impl':>8} {'secs':>7} {'clauses/s':>10} {'money agree':>12}")
+    for n in sizes:
+        en, de = make_clauses(n)
+        for name, fn in (("legacy", legacy_extract_facts), ("scanner", rules.extract_facts)):
+            t_en, f_en = run(fn, en, "en")
+            t_de, f_de = run(fn, de, "de")
+            agree = sum(a["money"] == b["money"] and bool(a["money"]) for a, b in zip(f_en, f_de)) / n
+            secs = t_en + t_de
+            print(f"{n:>8} {name:>8} {secs:>7.2f} {2 * n / secs:>10.0f} {agree:>12.3f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,85 @@
+"""Memory held per finding: the previous dict findings vs slotted Finding records.
+
+Run from clausematch-backend/: ``python benchmarks/bench_findings.py [clauses...]``
+Facts, diffs and contexts are computed first; only what merging and ranking allocate is measured.
+"""
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "services" / "api"), str(Path(__file__).resolve().parents[2])]
+
+from app.pipeline import rag_client, ranker, rules  # noqa: E402
+from bench_facts import make_clauses  # noqa: E402
+
+
+# Previous implementation: one dict per finding, ranked by dict.update
+def legacy_merge_findings(key, diffs, sem, contexts):
+    if not diffs and not sem:
+        return {"clause_key": key, "status": "OK", "confidence": 0.9, "semantic_score": 0.9, "rationale": "no diffs", "rules_triggered": [], "contexts": contexts}
+    items = []
+    for d in diffs or []:
+        items.append({"clause_key": key, **d, "semantic_score": 0.0, "contexts": contexts, "rules_triggered": [d.get("field", "rule")], "confidence": 0.7})
+    for s in sem or []:
+        items.append({"clause_key": key, **s, "contexts": contexts, "rules_triggered": ["LLM"]})
+    return items
+
+
+def legacy_score(finding):
+    status = (finding.get("status") or "").upper()
+    entity_weight = 1.0 if finding.get("field") in {"money", "date", "id"} else 0.3
+    semantic_conf = float(finding.get("semantic_score", 0.5))
+    rule_agreement = 1.0 if status == "OK" else 0.0
+    score_val = (1.0 * (status == "MISMATCH")) + 0.6 * entity_weight + 0.3 * semantic_conf + 0.2 * rule_agreement
+    risk = "HIGH" if score_val > 1.2 else ("MEDIUM" if score_val > 0.7 else "LOW")
+    conf = max(0.0, min(1.0, 0.5 * semantic_conf + 0.5 * (1.0 if status == "OK" else 0.6)))
+    return {"risk": risk, "confidence": round(conf, 2)}
+
+
+def legacy(inputs):
+    findings = []
+    for key, diffs, sem, contexts in inputs:
+        merged = legacy_merge_findings(key, diffs, sem, contexts)
+        for f in merged if isinstance(merged, list) else [merged]:
+            f.update(legacy_score(f))
+            findings.append(f)
+    return findings
+
+
+def records(inputs):
+    findings = []
+    for key, diffs, sem, contexts in inputs:
+        for f in rules.merge_findings(key, diffs, sem, contexts):
+            f.risk, f.confidence = ranker.score(f)
+            findings.append(f)
+    return findings
+
+
+def measure(fn, inputs):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    out = fn(inputs)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return out, held
+
+
+def main(sizes) -> None:
+    print(f"{'clauses':>8} {'findings':>9} {'dict B/finding':>15} {'record B/finding':>17} {'saved':>6}")
+    for n in sizes:
+        en, de = make_clauses(n)
+        inputs = []
+        for i, (a, b) in enumerate(zip(en, de)):
+            diffs = rules.compare_facts(rules.extract_facts(a, "en"), rules.extract_facts(b, "de"))
+            # Every tenth clause also carries an LLM verdict
+            sem = [{"field": "entity", "status": "REVIEW", "rationale": "semantic check", "semantic_score": 0.6}] if i % 10 == 0 else []
+            inputs.append((f"clause_{i}", diffs, sem, rag_client.topk(a, lang="en", k=3)))
+        old, old_bytes = measure(legacy, inputs)
+        new, new_bytes = measure(records, inputs)
+        assert old == [f.to_dict() for f in new]
+        per_old, per_new = old_bytes / len(old), new_bytes / len(new)
+        print(f"{n:>8} {len(new):>9} {per_old:>15.0f} {per_new:>17.0f} {1 - per_new / per_old:>6.0%}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000])
@@ -0,0 +1,98 @@
+"""N-way consistency check: cost against the number of versions, and outlier recall.
+
+Run from clausematch-backend/: ``python benchmarks/bench_multi.py [--clauses 1000] [versions...]``
+
+Every version is the German side of one ``corpus.make_pair`` document (no injected edits), with
+its own seeded edits: a changed number in MISMATCH_RATE of the lines, and a few dropped lines.
+The pivot is version 0. Per version count the table shows the time to segment every document,
+to align the others to the pivot (N - 1 alignments), to merge the rows, vote and score
+similarities, and the total per version; a flat last column is linear scaling. "pairwise" is the
+estimate for aligning every pair instead. Recall is the share of changed (line, version) cells
+the vote names as outliers.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parent), str(Path(__file__).resolve().parents[2])]
+
+from clausematch_engine import multi  # noqa: E402
+from clausematch_engine.align import digit_signature  # noqa: E402
+from clausematch_engine.segment import segment_text  # noqa: E402
+from clausematch_engine.similarity import similarity_batch  # noqa: E402
+from corpus import make_pair  # noqa: E402
+
+VERSIONS = [3, 6, 10]
+MISMATCH_RATE = 0.02
+DROP_RATE = 0.005
+_num_re = re.compile(r"\d+")
+_clause_re = re.compile(r"(\d+)\) ")
+
+
+def make_versions(n: int, k: int):
+    base = make_pair(n, mismatch_rate=0.0, indel_rate=0.0).de.splitlines()
+    texts, changed = [], set()
+    for v in range(k):
+        rnd = random.Random(1000 + v)
+        lines = []
+        for i, line in enumerate(base):
+            if v and rnd.random() < DROP_RATE:
+                continue
+            if v and rnd.random() < MISMATCH_RATE and len(_num_re.findall(line)) > 1:
+                # Bump the last number; the leading clause number keeps the row anchored
+                m = list(_num_re.finditer(line))[-1]
+                line = f"{line[:m.start()]}{int(m.group()) + 1}{line[m.end():]}"
+                changed.add((i, v))
+            lines.append(line)
+        texts.append("\n".join(lines) + "\n")
+    return texts, changed
+
+
+def run(n: int, k: int) -> None:
+    texts, changed = make_versions(n, k)
+    t0 = time.perf_counter()
+    docs = [segment_text(t) for t in texts]
+    sigs = [[digit_signature(s) for s in d] for d in docs]
+    t1 = time.perf_counter()
+    beads = [multi.align_to_pivot(docs[0], d, sigs[0], s) for d, s in zip(docs[1:], sigs[1:])]
+    t2 = time.perf_counter()
+    rows = multi.rows(docs[0], list(zip(docs[1:], beads)))
+    votes = [multi.vote([multi.fact_key(t) for t in r]) for r in rows]
+    for v in range(1, k):
+        similarity_batch([r[0] for r in rows], [r[v] for r in rows])
+    t3 = time.perf_counter()
+
+    # Lines start with "<clause>)" and segmenting splits a line at its periods ("1.250,00 €"),
+    # so a row belongs to the last clause number the pivot started
+    found, line = set(), -1
+    for r, (_, outliers) in zip(rows, votes):
+        head = _clause_re.match(r[0])
+        if head:
+            line = int(head.group(1)) - 1
+        found.update((line, v) for v in outliers)
+    recall = len(changed & found) / len(changed) if changed else 1.0
+    flagged = sum(status != "OK" for status, _ in votes)
+    per_align = (t2 - t1) / (k - 1)
+    print(
+        f"{k:>8} {t1 - t0:>9.3f} {t2 - t1:>9.3f} {t3 - t2:>9.3f} {(t3 - t0) / k:>11.4f}"
+        f" {per_align * k * (k - 1) / 2:>9.3f} {len(rows):>7} {flagged:>7} {recall:>7.2f}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("versions", nargs="*", type=int, default=VERSIONS)
+    parser.add_argument("--clauses", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"{args.clauses} clauses per version")
+    print(f"{'versions':>8} {'segment':>9} {'align':>9} {'vote':>9} {'s/version':>11} {'pairwise':>9} {'rows':>7} {'flagged':>7} {'recall':>7}")
+    for k in sorted(args.versions):
+        run(args.clauses, k)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
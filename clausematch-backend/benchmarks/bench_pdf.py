@@ -0,0 +1,78 @@
+"""Page-parallel PDF extraction: wall time by worker count on generated multi-page PDFs.
+
+Run from clausematch-backend/: ``python benchmarks/bench_pdf.py [pages...]``
+Worker counts go 1, 2, 4, ... up to the machine's core count.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The API app, and the repository root for clausematch_engine
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "services" / "api"), str(Path(__file__).resolve().parents[2])]
+
+from pdfminer.high_level import extract_text  # noqa: E402
+
+from app.pipeline.ingestion import parser_pdf  # noqa: E402
+
+LINES_PER_PAGE = 45
+
+
+def make_pdf(path: Path, pages: int, seed: int = 7) -> None:
+    """Write a minimal text-only PDF (Helvetica, one content stream per page)."""
+    rnd = random.Random(seed)
+    words = ["supplier", "payment", "invoice", "notice", "party", "term", "shall", "agreement", "EUR", "2025-06-30"]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        lines = [f"{p + 1}.{k} " + " ".join(rnd.choice(words) for _ in range(rnd.randint(6, 12))) for k in range(LINES_PER_PAGE)]
+        body = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        content = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (len(objects),)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def main(sizes) -> None:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    print(f"cores={cores}")
+    print(f"{'pages':>6} {'method':>12} {'secs':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in sizes:
+            path = Path(tmp) / f"doc_{pages}.pdf"
+            make_pdf(path, pages)
+            t0 = time.perf_counter()
+            reference = extract_text(str(path))
+            base = time.perf_counter() - t0
+            print(f"{pages:>6} {'extract_text':>12} {base:>8.2f} {1.0:>8.2f}")
+            for w in counts:
+                t0 = time.perf_counter()
+                result = parser_pdf.parse_pdf_pages(path, workers=w)
+                dt = time.perf_counter() - t0
+                assert [n for n, _ in result] == list(range(1, pages + 1))
+                assert "".join(t for _, t in result) == reference, "page-parallel output differs"
+                print(f"{pages:>6} {f'workers={w}':>12} {dt:>8.2f} {base / dt:>8.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [20, 100, 400])
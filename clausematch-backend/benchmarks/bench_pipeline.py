@@ -0,0 +1,315 @@
+"""Per-stage and end-to-end timings, memory peaks and scaling of the clause pipeline.
+
+Run from clausematch-backend/:
+``python benchmarks/bench_pipeline.py [--mem] [--check | --update] [--threshold 1.3] [sizes...]``
+
+Inputs are ``corpus.make_pair`` documents (seeded, with injected mismatches and inserted or
+dropped sentences). Every stage runs on the previous stage's output: segment, align,
+extract_facts, compare_facts, triage and rank (merge + ``ranker.score``), then the backend's
+align and ``compare_pairs``, then the whole job through ``orchestrator_client.enqueue`` with the
+LLM replaced by a stub. Times are the best of a few runs; ``--mem`` adds a tracemalloc pass per
+stage for its peak. The last table is the scaling exponent per stage between consecutive sizes
+(1.0 = linear).
+
+Accuracy is scored too: each MISMATCH finding of the rules stage is attributed to the numbered
+clause it came from and compared with the corpus ``truth``, giving precision and recall per
+injected field (money, date, number).
+
+``--update`` records the results in ``baselines/pipeline.json``; ``--check`` compares against
+it and exits 1 when a stage is more than ``--threshold`` times slower (or, with ``--mem``, holds
+that much more memory), when precision or recall of a field drops more than ACCURACY_SLACK
+below the baseline, or when a pair of up to BUDGET_CLAUSES clauses misses the BUDGET_S target.
+Times are divided by a fixed pure-Python calibration loop first, so a baseline recorded on one
+machine roughly carries over to another; re-record it after an intended change.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+API = HERE.parent / "services" / "api"
+sys.path[:0] = [str(API), str(API.parent), str(HERE.parents[1])]
+# Artifacts of the end-to-end runs go to a scratch directory
+os.environ.setdefault("ARTIFACT_ROOT", tempfile.mkdtemp(prefix="bench-pipeline-"))
+
+from app.pipeline import align, cascade, rag_client, ranker, rules, segment, semantic  # noqa: E402
+from app.services import orchestrator_client  # noqa: E402
+from backend.clausematch import align as backend_align  # noqa: E402
+from backend.clausematch import compare as backend_compare  # noqa: E402
+from backend.clausematch import extract as backend_extract  # noqa: E402
+from backend.clausematch import segment as backend_segment  # noqa: E402
+from corpus import KINDS, make_pair  # noqa: E402
+
+BASELINE = HERE / "baselines" / "pipeline.json"
+SIZES = [100, 1000, 10_000, 50_000]
+# The specification's latency target for one document pair, checked up to this many clauses
+BUDGET_S = 2.0
+BUDGET_CLAUSES = 1000
+# Stages faster than this in the baseline are reported but not checked: timer noise dominates
+MIN_CHECK_S = 0.005
+MIN_CHECK_MIB = 1.0
+# Allowed drop in precision or recall against the baseline (both are 0..1)
+ACCURACY_SLACK = 0.02
+# Corpus clauses start with their number: "12) The Supplier shall pay ..."
+CLAUSE_NUMBER = re.compile(r"(\d+)\)")
+
+
+def stub_llm(items, concurrency=None, stats=None):
+    # Deterministic stand-in for watsonx: one REVIEW verdict per escalated pair, no I/O
+    return [[{"field": "entity", "status": "REVIEW", "rationale": "stub", "semantic_score": 0.6}] for _ in items]
+
+
+def calibrate() -> float:
+    best = math.inf
+    for _ in range(5):
+        t = time.perf_counter()
+        d: Dict[str, int] = {}
+        for i in range(200_000):
+            d[str(i % 5000)] = d.get(str(i % 5000), 0) + i
+        sorted(d.items(), key=lambda kv: kv[1])
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def stage_segment(ctx):
+    return segment.segment(ctx["pair"].en, "en"), segment.segment(ctx["pair"].de, "de")
+
+
+def stage_align(ctx):
+    return align.anchor_align(*ctx["segment"])
+
+
+def stage_extract_facts(ctx):
+    return [(rules.extract_facts(a, "en"), rules.extract_facts(b, "de")) for _, a, b in ctx["align"]]
+
+
+def stage_compare_facts(ctx):
+    return [rules.compare_facts(fa, fb) for fa, fb in ctx["extract_facts"]]
+
+
+def stage_triage(ctx):
+    cfg = cascade.CascadeConfig.from_env()
+    return [
+        cascade.triage(a, b, fa, fb, diffs, cfg)
+        for (_, a, b), (fa, fb), diffs in zip(ctx["align"], ctx["extract_facts"], ctx["compare_facts"])
+    ]
+
+
+def stage_rank(ctx):
+    out = []
+    for (key, a, _), diffs in zip(ctx["align"], ctx["compare_facts"]):
+        for f in rules.merge_findings(key, diffs, [], rag_client.topk(a, lang="en", k=3)):
+            f.risk, f.confidence = ranker.score(f)
+            out.append(f)
+    return out
+
+
+def stage_backend_align(ctx):
+    pair = ctx["pair"]
+    return backend_align.align_segments(backend_segment.segment_text(pair.en), backend_segment.segment_text(pair.de))
+
+
+def stage_backend_compare_pairs(ctx):
+    pairs = ctx["backend.align"]
+    return backend_compare.compare_pairs(pairs, backend_extract.extract_entities(pairs))
+
+
+def stage_enqueue(ctx):
+    ctx["runs"] = ctx.get("runs", 0) + 1
+    job_id = f"bench-{len(ctx['align'])}-{ctx['runs']}"
+    orchestrator_client.enqueue(job_id, ctx["pair"].en, ctx["pair"].de)
+    record = orchestrator_client.status(job_id)
+    if record.get("status") != "COMPLETED":
+        raise RuntimeError(f"end-to-end run failed: {record.get('error')}")
+    return record["summary"]
+
+
+STAGES: List[tuple] = [
+    ("segment", stage_segment),
+    ("align", stage_align),
+    ("extract_facts", stage_extract_facts),
+    ("compare_facts", stage_compare_facts),
+    ("triage", stage_triage),
+    ("rank", stage_rank),
+    ("backend.align", stage_backend_align),
+    ("backend.compare_pairs", stage_backend_compare_pairs),
+    ("enqueue", stage_enqueue),
+]
+
+
+def timed(fn: Callable[[Dict], Any], ctx: Dict, repeat: int):
+    best, out = math.inf, None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn(ctx)
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def peak_mib(fn: Callable[[Dict], Any], ctx: Dict) -> float:
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    fn(ctx)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def score(ctx: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    # A pair counts for the clause numbered at the start of either side; pairs without a
+    # number (inserted sentences) count for the clause before them
+    flagged: Dict[str, set] = {k: set() for k in KINDS}
+    clause = -1
+    for (_, a, b), diffs in zip(ctx["align"], ctx["compare_facts"]):
+        m = CLAUSE_NUMBER.match(a) or CLAUSE_NUMBER.match(b)
+        if m:
+            clause = int(m.group(1)) - 1
+        for d in diffs:
+            if d["status"] == "MISMATCH" and d["field"] in flagged:
+                flagged[d["field"]].add(clause)
+    out: Dict[str, Dict[str, Optional[float]]] = {}
+    for kind in KINDS:
+        truth = set(ctx["pair"].truth[kind])
+        hits = len(flagged[kind] & truth)
+        out[kind] = {
+            "injected": len(truth),
+            "flagged": len(flagged[kind]),
+            "precision": round(hits / len(flagged[kind]), 3) if flagged[kind] else None,
+            "recall": round(hits / len(truth), 3) if truth else None,
+        }
+    return out
+
+
+def run_size(n: int, mem: bool) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, Optional[float]]]]:
+    ctx: Dict[str, Any] = {"pair": make_pair(n)}
+    repeat = 3 if n <= 10_000 else 1
+    out: Dict[str, Dict[str, float]] = {}
+    for name, fn in STAGES:
+        seconds, ctx[name] = timed(fn, ctx, repeat)
+        out[name] = {"s": round(seconds, 6)}
+        if mem:
+            out[name]["peak_mib"] = round(peak_mib(fn, ctx), 3)
+    summary = ctx["enqueue"]
+    print(
+        f"# {n} clauses: {len(ctx['align'])} aligned pairs, {len(ctx['rank'])} findings, "
+        f"{summary.get('mismatch', 0)} MISMATCH; injected "
+        + ", ".join(f"{k} {len(v)}" for k, v in ctx["pair"].truth.items())
+    )
+    return out, score(ctx)
+
+
+def print_table(results: Dict[int, Dict[str, Dict[str, float]]], mem: bool) -> None:
+    sizes = sorted(results)
+    header = " ".join(f"{n:>10}" for n in sizes)
+    columns = [("seconds", "s", "10.4f")] + ([("peak MiB", "peak_mib", "10.1f")] if mem else [])
+    for title, field, fmt in columns:
+        print(f"{title:>22} {header}")
+        for name, _ in STAGES:
+            print(f"{name:>22} " + " ".join(f"{results[n][name][field]:{fmt}}" for n in sizes))
+        print()
+    if len(sizes) > 1:
+        print(f"{'scaling exponent':>22} " + " ".join(f"{f'{a}->{b}':>12}" for a, b in zip(sizes, sizes[1:])))
+        for name, _ in STAGES:
+            exps = []
+            for a, b in zip(sizes, sizes[1:]):
+                ta, tb = results[a][name]["s"], results[b][name]["s"]
+                exps.append(f"{math.log(tb / ta) / math.log(b / a):>12.2f}" if ta > 0 and tb > 0 else f"{'-':>12}")
+            print(f"{name:>22} " + " ".join(exps))
+
+
+def _ratio(x: Optional[float]) -> str:
+    return f"{x:.3f}" if x is not None else "-"
+
+
+def print_accuracy(accuracy: Dict[int, Dict[str, Dict[str, Optional[float]]]]) -> None:
+    print(f"{'accuracy':>22} {'injected':>10} {'flagged':>10} {'precision':>10} {'recall':>10}")
+    for n in sorted(accuracy):
+        for kind, a in accuracy[n].items():
+            print(
+                f"{f'{n} {kind}':>22} {a['injected']:>10} {a['flagged']:>10} "
+                f"{_ratio(a['precision']):>10} {_ratio(a['recall']):>10}"
+            )
+    print()
+
+
+def check(results, accuracy, calibration: float, threshold: float) -> List[str]:
+    failures = []
+    for n, stages in results.items():
+        if n <= BUDGET_CLAUSES and stages["enqueue"]["s"] > BUDGET_S:
+            failures.append(f"{n} clauses: end-to-end {stages['enqueue']['s']:.2f} s is over the {BUDGET_S} s budget")
+    if not BASELINE.exists():
+        print(f"no baseline at {BASELINE}; record one with --update")
+        return failures
+    base = json.loads(BASELINE.read_text())
+    scale = calibration / base["calibration_s"]
+    for n, stages in results.items():
+        for name, r in stages.items():
+            b = base["sizes"].get(str(n), {}).get(name)
+            if b is None:
+                continue
+            if b["s"] >= MIN_CHECK_S and r["s"] / (b["s"] * scale) > threshold:
+                failures.append(f"{n} clauses, {name}: {r['s']:.4f} s vs baseline {b['s'] * scale:.4f} s (scaled)")
+            if "peak_mib" in r and b.get("peak_mib", 0) >= MIN_CHECK_MIB and r["peak_mib"] / b["peak_mib"] > threshold:
+                failures.append(f"{n} clauses, {name}: peak {r['peak_mib']:.1f} MiB vs baseline {b['peak_mib']:.1f} MiB")
+    for n, fields in accuracy.items():
+        for kind, a in fields.items():
+            b = base.get("accuracy", {}).get(str(n), {}).get(kind)
+            if b is None:
+                continue
+            for metric in ("precision", "recall"):
+                if a[metric] is not None and b[metric] is not None and a[metric] < b[metric] - ACCURACY_SLACK:
+                    failures.append(f"{n} clauses, {kind} {metric}: {a[metric]:.3f} vs baseline {b[metric]:.3f}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--mem", action="store_true", help="also measure peak memory per stage (slower)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    mode.add_argument("--update", action="store_true", help="record the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=1.3, help="allowed slowdown factor (default 1.3)")
+    args = parser.parse_args()
+
+    semantic.llm_check_many = stub_llm
+    calibration = calibrate()
+    results, accuracy = {}, {}
+    for n in sorted(args.sizes):
+        results[n], accuracy[n] = run_size(n, args.mem)
+    print()
+    print_accuracy(accuracy)
+    print_table(results, args.mem)
+    print(f"calibration loop: {calibration * 1000:.1f} ms")
+
+    if args.update:
+        data = json.loads(BASELINE.read_text()) if BASELINE.exists() else {"sizes": {}}
+        data.setdefault("accuracy", {})
+        data["calibration_s"] = round(calibration, 6)
+        data["python"] = sys.version.split()[0]
+        for n, stages in results.items():
+            data["sizes"][str(n)] = stages
+            data["accuracy"][str(n)] = accuracy[n]
+        BASELINE.parent.mkdir(exist_ok=True)
+        BASELINE.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {BASELINE}")
+    elif args.check:
+        failures = check(results, accuracy, calibration, args.threshold)
+        for f in failures:
+            print(f"REGRESSION {f}")
+        if failures:
+            return 1
+        print(f"no regressions (threshold {args.threshold}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Ingest throughput, open time and top-k latency of the rag service's BM25 index.
+
+Run from clausematch-backend/:
+``python benchmarks/bench_rag.py [--passages 1000000] [--segment 100000] [--queries 1000] [--no-compact]``
+
+Passages are seeded synthetic clauses: 10-40 words drawn from a Zipf-distributed vocabulary of
+VOCAB words, so a few terms have postings over most of the index, as common legal words do.
+They are appended ``--segment`` at a time, like repeated ``/ingest`` calls. Then a fresh
+``Index`` opens the directory (the service's start-up) and answers the queries one at a time
+(p50/p95/max) and as one batch (one ``/topk`` call for a whole job). With compaction, the same
+is measured over the merged index, and its results are checked against the segmented ones.
+"""
+import argparse
+import itertools
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "services" / "rag"))
+
+import bm25  # noqa: E402
+
+VOCAB = 50_000
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_vocab(rnd: random.Random):
+    words = {"".join(rnd.choices(LETTERS, k=rnd.randint(3, 11))) for _ in range(VOCAB * 2)}
+    words = sorted(words - bm25.STOPWORDS)[:VOCAB]
+    rnd.shuffle(words)
+    cum = list(itertools.accumulate(1.0 / (r + 1) for r in range(len(words))))
+    return words, cum
+
+
+def passages(rnd: random.Random, words, cum, n: int, start: int):
+    for i in range(start, start + n):
+        text = " ".join(rnd.choices(words, cum_weights=cum, k=rnd.randint(10, 40)))
+        yield {"id": f"p{i}", "text": text, "kind": "clause", "source": "bench", "lang": "en" if i % 2 else "de"}
+
+
+def latencies(index: bm25.Index, queries, k: int):
+    times = []
+    for q in queries:
+        t = time.perf_counter()
+        index.search([q], k=k, lang="en")
+        times.append(time.perf_counter() - t)
+    t = time.perf_counter()
+    batch = index.search(queries, k=k, lang="en")
+    batch_s = time.perf_counter() - t
+    times.sort()
+    return {
+        "p50_ms": statistics.median(times) * 1000,
+        "p95_ms": times[int(len(times) * 0.95)] * 1000,
+        "max_ms": times[-1] * 1000,
+        "batch_s": batch_s,
+    }, batch
+
+
+def report(label: str, r) -> None:
+    print(
+        f"{label:>10}: p50 {r['p50_ms']:.2f} ms, p95 {r['p95_ms']:.2f} ms, max {r['max_ms']:.2f} ms; "
+        f"batch of {args.queries}: {r['batch_s']:.2f} s ({r['batch_s'] / args.queries * 1000:.2f} ms per query)"
+    )
+
+
+def main() -> int:
+    rnd = random.Random(7)
+    words, cum = make_vocab(rnd)
+    root = Path(tempfile.mkdtemp(prefix="bench-rag-"))
+    try:
+        index = bm25.Index(str(root), max_segments=args.passages // args.segment + 1)
+        t = time.perf_counter()
+        for start in range(0, args.passages, args.segment):
+            index.append(passages(rnd, words, cum, min(args.segment, args.passages - start), start))
+        ingest_s = time.perf_counter() - t
+        stats = index.stats()
+        print(
+            f"ingest: {stats['passages']} passages in {ingest_s:.1f} s ({stats['passages'] / ingest_s:,.0f}/s), "
+            f"{stats['segments']} segments, {stats['terms']:,} terms, {stats['postings']:,} postings, "
+            f"{stats['bytes'] / 2**20:.0f} MiB on disk"
+        )
+
+        t = time.perf_counter()
+        index = bm25.Index(str(root))
+        print(f"open: {(time.perf_counter() - t) * 1000:.1f} ms for {len(index.segments)} segments")
+
+        queries = [p["text"] for p in passages(random.Random(11), words, cum, args.queries, 0)]
+        segmented, before = latencies(index, queries, args.k)
+        report("segmented", segmented)
+        if not args.no_compact:
+            t = time.perf_counter()
+            index.compact()
+            print(f"compact: {time.perf_counter() - t:.1f} s")
+            compacted, after = latencies(index, queries, args.k)
+            report("compacted", compacted)
+            same = all([h["id"] for h in a] == [h["id"] for h in b] for a, b in zip(before, after))
+            print(f"compacted results identical: {same}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passages", type=int, default=1_000_000)
+    parser.add_argument("--segment", type=int, default=100_000, help="passages per append")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--no-compact", action="store_true")
+    args = parser.parse_args()
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Listing a user's newest reports: sorting a plain dict per call vs BoundedStore's owner index.
+
+Run from clausematch-backend/: ``python benchmarks/bench_store.py [reports...]``
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from clausematch_engine.store import BoundedStore  # noqa: E402
+
+USERS = 50
+LISTINGS = 200
+
+
+def make_reports(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    return [
+        (f"r{i}", {"userId": f"u{rnd.randrange(USERS)}", "createdAt": rnd.randint(0, 10**9), "summary": {"total": i}})
+        for i in range(n)
+    ]
+
+
+def main(sizes) -> None:
+    print(f"{'reports':>8} {'dict ms/list':>13} {'store ms/list':>14} {'store put us':>13}")
+    for n in sizes:
+        reports = make_reports(n)
+        plain = dict(reports)
+        store = BoundedStore(max_items=n, max_bytes=1 << 40)
+        t0 = time.perf_counter()
+        for key, value in reports:
+            store.put(key, value, owner=value["userId"], created_at=value["createdAt"])
+        put_us = (time.perf_counter() - t0) / n * 1e6
+
+        users = [f"u{i % USERS}" for i in range(LISTINGS)]
+        t0 = time.perf_counter()
+        for u in users:
+            mine = sorted((v for v in plain.values() if v["userId"] == u), key=lambda x: x["createdAt"], reverse=True)[:25]
+        t_dict = (time.perf_counter() - t0) / LISTINGS * 1000
+        t0 = time.perf_counter()
+        for u in users:
+            page, _ = store.page(u, 25)
+        t_store = (time.perf_counter() - t0) / LISTINGS * 1000
+        assert [v for _, v in page] == mine
+        print(f"{n:>8} {t_dict:>13.3f} {t_store:>14.3f} {put_us:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
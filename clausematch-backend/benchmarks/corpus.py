@@ -0,0 +1,133 @@
+"""Seeded synthetic EN/DE contract pairs for the benchmarks.
+
+``make_pair(n)`` writes ``n`` EN clauses, one per line, and their German translation, then
+injects money, date and number mismatches into the German side and inserts or drops German
+sentences. The same seed always gives the same texts and the same ``truth``.
+"""
+import random
+from typing import Dict, List, NamedTuple
+
+MONTHS_EN = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+MONTHS_DE = ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September", "Oktober", "November", "Dezember"]
+
+FILLER_EN = ["in accordance with this agreement", "unless agreed otherwise in writing", "subject to clause 12", "for the duration of the contract", ""]
+FILLER_DE = ["gemäß diesem Vertrag", "sofern nicht schriftlich anders vereinbart", "vorbehaltlich Ziffer 12", "für die Dauer des Vertrags", ""]
+
+INSERTED_DE = [
+    "Ergänzend gelten die Allgemeinen Geschäftsbedingungen des Lieferanten",
+    "Mündliche Nebenabreden bestehen nicht",
+    "Der Gerichtsstand ist München",
+]
+
+KINDS = ("money", "date", "number")
+
+
+class Pair(NamedTuple):
+    en: str
+    de: str
+    # injected edits: {"money"|"date"|"number": [clause index], "inserted": [...], "dropped": [...]}
+    truth: Dict[str, List[int]]
+
+
+def money_en(minor: int) -> str:
+    return f"EUR {minor // 100:,}.{minor % 100:02d}"
+
+
+def money_de(minor: int) -> str:
+    return f"{minor // 100:,}".replace(",", ".") + f",{minor % 100:02d} €"
+
+
+def date_en(y: int, m: int, d: int) -> str:
+    return f"{MONTHS_EN[m - 1]} {d}, {y}"
+
+
+def date_de(y: int, m: int, d: int) -> str:
+    return f"{d:02d}.{m:02d}.{y}"
+
+
+def count_en(n: int) -> str:
+    return f"{n:,}"
+
+
+def count_de(n: int) -> str:
+    return f"{n:,}".replace(",", ".")
+
+
+def _values(rnd: random.Random) -> Dict[str, int]:
+    return {
+        "minor": rnd.randint(100, 99_999_999),
+        "y": rnd.randint(2024, 2030), "m": rnd.randint(1, 12), "d": rnd.randint(1, 28),
+        "qty": rnd.randint(1, 250_000), "days": rnd.randint(5, 120), "pct": rnd.randint(1, 25),
+        "ref": rnd.randint(1000, 99999),
+    }
+
+
+# (kinds the template carries, EN, DE); both sides see the same values unless a mismatch is injected
+TEMPLATES = [
+    (("money", "date"),
+     lambda v: f"The Supplier shall pay {money_en(v['minor'])} no later than {date_en(v['y'], v['m'], v['d'])}",
+     lambda v: f"Der Lieferant zahlt {money_de(v['minor'])} spätestens am {date_de(v['y'], v['m'], v['d'])}"),
+    (("number",),
+     lambda v: f"The Buyer orders {count_en(v['qty'])} units under order PO-{v['ref']}",
+     lambda v: f"Der Käufer bestellt {count_de(v['qty'])} Einheiten unter Bestellung PO-{v['ref']}"),
+    (("number",),
+     lambda v: f"Either party may terminate with {v['days']} days notice",
+     lambda v: f"Jede Partei kann mit einer Frist von {v['days']} Tagen kündigen"),
+    (("money",),
+     lambda v: f"A late fee of {v['pct']}% and at most {money_en(v['minor'])} applies",
+     lambda v: f"Es gilt eine Verzugsgebühr von {v['pct']} % und höchstens {money_de(v['minor'])}"),
+    (("date",),
+     lambda v: f"This agreement takes effect on {date_en(v['y'], v['m'], v['d'])}",
+     lambda v: f"Dieser Vertrag tritt am {date_de(v['y'], v['m'], v['d'])} in Kraft"),
+    ((),
+     lambda v: "Each party shall keep the terms of this agreement confidential",
+     lambda v: "Jede Partei behandelt die Bedingungen dieses Vertrags vertraulich"),
+]
+
+
+def _mutate(kind: str, v: Dict[str, int], rnd: random.Random) -> Dict[str, int]:
+    w = dict(v)
+    if kind == "money":
+        w["minor"] += rnd.choice([-1, 1]) * rnd.choice([1, 100, 10_000])
+        w["minor"] = max(1, w["minor"])
+    elif kind == "date":
+        w["d"] = w["d"] % 28 + 1
+    else:
+        w["qty"] += rnd.randint(1, 9)
+        w["days"] += rnd.randint(1, 9)
+    return w
+
+
+def make_pair(n: int, seed: int = 7, mismatch_rate: float = 0.05, indel_rate: float = 0.01) -> Pair:
+    rnd = random.Random(seed)
+    truth: Dict[str, List[int]] = {k: [] for k in KINDS + ("inserted", "dropped")}
+    en_lines: List[str] = []
+    de_lines: List[str] = []
+    for i in range(n):
+        kinds, en_t, de_t = TEMPLATES[rnd.randrange(len(TEMPLATES))]
+        v = _values(rnd)
+        tail = rnd.randrange(len(FILLER_EN))
+        w = v
+        if kinds and rnd.random() < mismatch_rate:
+            kind = rnd.choice(kinds)
+            w = _mutate(kind, v, rnd)
+            truth[kind].append(i)
+        en_lines.append(f"{i + 1}) {en_t(v)} {FILLER_EN[tail]}".rstrip())
+        r = rnd.random()
+        if r < indel_rate / 2:
+            truth["dropped"].append(i)
+            continue
+        de_lines.append(f"{i + 1}) {de_t(w)} {FILLER_DE[tail]}".rstrip())
+        if r > 1 - indel_rate / 2:
+            truth["inserted"].append(i)
+            de_lines.append(rnd.choice(INSERTED_DE))
+    return Pair("\n".join(en_lines) + "\n", "\n".join(de_lines) + "\n", truth)
+
+
+if __name__ == "__main__":
+    import sys
+
+    pair = make_pair(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
+    print(pair.en)
+    print(pair.de)
+    print({k: len(v) for k, v in pair.truth.items()})
@@ -1,44 +1,171 @@
-from fastapi import FastAPI, UploadFile, File
-from fastapi.staticfiles import StaticFiles
+import shutil
+from typing import Optional
+from fastapi import Depends, FastAPI, UploadFile, File, Form, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pathlib import Path
-from uuid import uuid4
-from .services import orchestrator_client
-from .pipeline.ingestion import parse_document
+from uuid import UUID, uuid4
+from clausematch_engine import metrics, paging
+from orchestrator.worker import QueueFull
+from .services import artifacts, orchestrator_client
+from .services.events import EVENTS, TERMINAL, sse
+from .pipeline.verdict_cache import get_cache
+from .pipeline.doc_cache import get_doc_cache
+from .pipeline import revision
+from .pipeline.records import as_dict
 
 app = FastAPI(title="ClauseMatch++ API")
+UPLOAD_CHUNK_SIZE = 1 << 20
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
-@app.post("/v1/analyze")
-async def analyze(en: UploadFile = File(...), de: UploadFile = File(...)):
-    # Persist temp files to support multi-format parsing
+def operational(authorization: Optional[str] = Header(None)) -> None:
+    # Off with METRICS_ENABLED=0, behind METRICS_TOKEN when set
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404)
+    if not metrics.authorized(authorization):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+@app.get("/metrics", dependencies=[Depends(operational)])
+def prometheus_metrics():
+    # Prometheus text format: request, stage, job and LLM metrics; rendered only when scraped
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+def _spool_upload(upload: UploadFile, path: Path) -> None:
+    upload.file.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(upload.file, out, UPLOAD_CHUNK_SIZE)
+
+def _busy(retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "job queue full", "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+def _known_job(job_id: str) -> bool:
+    try:
+        UUID(job_id)
+    except ValueError:
+        return False
+    return revision.exists(job_id)
+
+@app.post("/v1/analyze", status_code=202)
+async def analyze(
+    en: UploadFile = File(...),
+    de: UploadFile = File(...),
+    previous_job_id: Optional[str] = Form(None),
+):
+    # previous_job_id: re-check a revision; unchanged pairs keep that job's findings
+    if previous_job_id is not None and not _known_job(previous_job_id):
+        raise HTTPException(status_code=404, detail="previous job not found")
+    # Reject before reading the upload when the backlog is already full
+    if not orchestrator_client.accepting():
+        return _busy(orchestrator_client.worker().retry_after())
+    # Persist temp files to support multi-format parsing; a worker process parses and analyzes them
     job_id = str(uuid4())
     tmp_dir = Path("/tmp")
     en_path = tmp_dir / f"{job_id}_en_{en.filename}"
     de_path = tmp_dir / f"{job_id}_de_{de.filename}"
-    en_bytes = await en.read()
-    de_bytes = await de.read()
-    en_path.write_bytes(en_bytes)
-    de_path.write_bytes(de_bytes)
-    # Parse to text
-    en_text = parse_document(en_path, "en")
-    de_text = parse_document(de_path, "de")
-    orchestrator_client.enqueue(job_id, en_text, de_text)
-    return {"job_id": job_id}
+    # Starlette already spools large uploads to disk; copy them over in chunks, off the loop
+    await run_in_threadpool(_spool_upload, en, en_path)
+    await run_in_threadpool(_spool_upload, de, de_path)
+    try:
+        orchestrator_client.submit(job_id, en_path, de_path, previous_job_id)
+    except QueueFull as exc:
+        en_path.unlink(missing_ok=True)
+        de_path.unlink(missing_ok=True)
+        return _busy(exc.retry_after)
+    return {"job_id": job_id, "status": "QUEUED"}
+
+@app.get("/v1/queue")
+def queue_stats():
+    return orchestrator_client.worker().stats()
+
+@app.get("/v1/cache/jobs")
+def job_store_stats():
+    return orchestrator_client.JOBS.stats()
 
 @app.get("/v1/jobs/{job_id}")
 def job_status(job_id: str):
-    return orchestrator_client.status(job_id)
+    record = orchestrator_client.status(job_id)
+    if "findings" in record:
+        record = {**record, "findings": [as_dict(f) for f in record["findings"]]}
+    return record
 
 @app.get("/v1/jobs/{job_id}/findings")
-def findings(job_id: str):
-    return orchestrator_client.findings(job_id)
+def findings(
+    job_id: str,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    risk: Optional[str] = None,
+    field: Optional[str] = None,
+):
+    # Filters take comma-separated values (status=MISMATCH,REVIEW); pass next_cursor for the
+    # following page. With Accept: application/x-ndjson, every match after the cursor is
+    # streamed one finding per line and limit is ignored.
+    filters = paging.parse_filters(status=status, risk=risk, field=field)
+    try:
+        start = paging.parse_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    entries = paging.positioned(orchestrator_client.findings(job_id), start)
+    if paging.wants_ndjson(request):
+        return StreamingResponse(paging.ndjson_lines(entries, filters), media_type=paging.NDJSON)
+    items, next_cursor = paging.take_page(entries, limit, filters)
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/v1/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request, last_event_id: Optional[int] = Query(None, ge=0)):
+    # Server-Sent Events: status changes, stages, progress counters and each ranked finding as
+    # it is produced. Reconnects resume after Last-Event-ID (header, or ?last_event_id=).
+    header = request.headers.get("last-event-id")
+    after = last_event_id or 0
+    if header is not None:
+        try:
+            after = max(0, int(header))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid Last-Event-ID")
+    if not EVENTS.known(job_id):
+        record = orchestrator_client.status(job_id)
+        if record.get("status") == "UNKNOWN":
+            raise HTTPException(status_code=404, detail="job not found")
+        # The log was dropped (or predates a restart): start a new one from the current state
+        snapshot = {k: v for k, v in record.items() if k not in {"findings", "artifacts"}}
+        EVENTS.publish(job_id, "status", snapshot, final=record.get("status") in TERMINAL)
+
+    async def stream():
+        yield b"retry: 3000\n\n"
+        async for event in EVENTS.follow(job_id, after):
+            yield sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/v1/cache/verdicts")
+def verdict_cache_stats():
+    return get_cache().stats()
+
+@app.get("/v1/cache/documents")
+def document_cache_stats():
+    cache = get_doc_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
 
 @app.get("/v1/jobs/{job_id}/report.pdf")
 def report(job_id: str):
     return orchestrator_client.pdf(job_id)
 
-# Serve artifacts directory for dev
-app.mount("/artifacts", StaticFiles(directory="app/artifacts"), name="artifacts")
+@app.api_route("/artifacts/{path:path}", methods=["GET", "HEAD"])
+def artifact(path: str, request: Request):
+    # Streamed from the artifact store; honours Range and serves compressed blobs as stored
+    # to clients that accept their encoding
+    return artifacts.serve(path, request)
@@ -1,8 +1,12 @@
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from clausematch_engine.align import align
 
-def anchor_align(en: Iterable[str], de: Iterable[str]) -> List[Tuple[str, str, str]]:
-    # index-wise pairing with a simple key
+from . import rules
+
+
+def index_align(en: Iterable[str], de: Iterable[str]) -> List[Tuple[str, str, str]]:
+    # index-wise pairing with a simple key (previous default, kept for comparison)
     en_list, de_list = list(en), list(de)
     m = max(len(en_list), len(de_list))
     out: List[Tuple[str, str, str]] = []
@@ -13,3 +17,23 @@ def anchor_align(en: Iterable[str], de: Iterable[str]) -> List[Tuple[str, str, s
     return out
 
 
+def fact_signature(facts: Dict) -> Tuple:
+    return tuple(sorted(facts["numbers"])) + tuple(sorted(facts["dates"]))
+
+
+def _signature(text: str, lang: str) -> Tuple:
+    return fact_signature(rules.extract_facts(text, lang=lang))
+
+
+def anchor_align(
+    en: Iterable[str],
+    de: Iterable[str],
+    en_facts: Optional[Sequence[Dict]] = None,
+    de_facts: Optional[Sequence[Dict]] = None,
+) -> List[Tuple[str, str, str]]:
+    # en_facts / de_facts: per-segment rules.extract_facts output, when already known (document cache)
+    en_list, de_list = list(en), list(de)
+    en_sigs = [fact_signature(f) for f in en_facts] if en_facts is not None else [_signature(t, "en") for t in en_list]
+    de_sigs = [fact_signature(f) for f in de_facts] if de_facts is not None else [_signature(t, "de") for t in de_list]
+    pairs = align(en_list, de_list, en_sigs, de_sigs)
+    return [(f"clause_{k}", a, b) for k, (a, b) in enumerate(pairs)]
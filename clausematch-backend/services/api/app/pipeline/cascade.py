@@ -0,0 +1,58 @@
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+from clausematch_engine.similarity import similarity
+
+
+TIERS = ("rules", "lexical", "llm")
+
+
+@dataclass
+class CascadeConfig:
+    enabled: bool = True
+    # Confidence assigned when a rule finds a hard MISMATCH on money/dates
+    rules_mismatch_conf: float = 0.95
+    # Confidence assigned when facts exist on both sides and all of them agree
+    rules_ok_conf: float = 0.9
+    # Pairs whose best cheap-tier confidence is below this are sent to the LLM
+    escalate_below: float = 0.85
+
+    @classmethod
+    def from_env(cls) -> "CascadeConfig":
+        return cls(
+            enabled=os.getenv("CASCADE_ENABLED", "1").lower() in {"1", "true", "yes"},
+            rules_mismatch_conf=float(os.getenv("CASCADE_RULES_MISMATCH_CONF", "0.95")),
+            rules_ok_conf=float(os.getenv("CASCADE_RULES_OK_CONF", "0.9")),
+            escalate_below=float(os.getenv("CASCADE_ESCALATE_BELOW", "0.85")),
+        )
+
+
+def _rules_confidence(fa: Dict[str, Any], fb: Dict[str, Any], diffs: List[Dict[str, Any]], cfg: CascadeConfig) -> float:
+    statuses = {d.get("status") for d in diffs}
+    if "MISMATCH" in statuses:
+        return cfg.rules_mismatch_conf
+    has_facts = any(fa[k] for k in fa) and any(fb[k] for k in fb)
+    if has_facts and statuses <= {"OK"} and Counter(fa["numbers"]) == Counter(fb["numbers"]):
+        return cfg.rules_ok_conf
+    return 0.0
+
+
+def triage(a_txt: str, b_txt: str, fa: Dict[str, Any], fb: Dict[str, Any], diffs: List[Dict[str, Any]], cfg: CascadeConfig) -> Tuple[str, float]:
+    """Return (tier, confidence) for one aligned pair; tier "llm" means escalate."""
+    if not cfg.enabled:
+        return "llm", 0.0
+    rule_conf = _rules_confidence(fa, fb, diffs, cfg)
+    lex_conf = similarity(a_txt, b_txt)
+    tier, conf = ("rules", rule_conf) if rule_conf >= lex_conf else ("lexical", lex_conf)
+    if conf < cfg.escalate_below:
+        return "llm", conf
+    return tier, conf
+
+
+def tier_report(decisions: List[Tuple[str, float]], cfg: CascadeConfig) -> Dict[str, Any]:
+    counts = {t: 0 for t in TIERS}
+    for tier, _ in decisions:
+        counts[tier] += 1
+    return {"counts": counts, "thresholds": asdict(cfg)}
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Bump whenever ingestion, segmentation or fact extraction output changes
+PARSER_VERSION = "4"
+HASH_CHUNK_SIZE = 1 << 20
+COUNTERS = ("hits", "misses", "puts", "evictions", "skipped")
+
+
+def file_key(path: Path, lang: str) -> str:
+    """SHA-256 of the file bytes, salted with the parser version, the suffix and the language.
+
+    The suffix picks the parser, so the same bytes uploaded as .txt and .csv are different documents.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    h.update(f"\x1f{PARSER_VERSION}\x1f{Path(path).suffix.lower()}\x1f{lang}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class DocCache:
+    """Parsed documents (segments and per-segment facts) stored in SQLite, zlib-compressed.
+
+    Job processes share the file, so hit/miss counters live in the database too. The
+    total stored size is trimmed to ``max_bytes`` by least-recent access; entries larger
+    than ``max_entry_bytes`` are not stored.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 30, max_entry_bytes: int = 64 << 20):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS documents_accessed ON documents (accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, n INTEGER NOT NULL)")
+        self._db.executemany("INSERT OR IGNORE INTO counters (name, n) VALUES (?, 0)", [(c,) for c in COUNTERS])
+
+    def _count(self, name: str, n: int = 1) -> None:
+        self._db.execute("UPDATE counters SET n = n + ? WHERE name = ?", (n, name))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM documents WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            self._db.execute("UPDATE documents SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._count("hits")
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, doc: Dict[str, Any]) -> None:
+        blob = zlib.compress(json.dumps(doc, ensure_ascii=False).encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            if len(blob) > self.max_entry_bytes:
+                self._count("skipped")
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._count("puts")
+            self._trim()
+
+    def _trim(self) -> None:
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._db.execute("SELECT key, size FROM documents ORDER BY accessed ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM documents WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._count("evictions", evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c: Dict[str, Any] = dict(self._db.execute("SELECT name, n FROM counters").fetchall())
+            c["items"], c["bytes"] = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents").fetchone()
+        c["max_bytes"] = self.max_bytes
+        lookups = c["hits"] + c["misses"]
+        c["hit_rate"] = round(c["hits"] / lookups, 4) if lookups else 0.0
+        return c
+
+
+_CACHE: Optional[DocCache] = None
+
+
+def get_doc_cache() -> Optional[DocCache]:
+    """Process-wide cache, or None when DOC_CACHE_PATH is set empty."""
+    global _CACHE
+    path = os.getenv("DOC_CACHE_PATH", "/tmp/clausematch/documents.sqlite")
+    if _CACHE is None and path:
+        _CACHE = DocCache(
+            path,
+            max_bytes=int(os.getenv("DOC_CACHE_MAX_BYTES", str(1 << 30))),
+            max_entry_bytes=int(os.getenv("DOC_CACHE_MAX_ENTRY_BYTES", str(64 << 20))),
+        )
+    return _CACHE
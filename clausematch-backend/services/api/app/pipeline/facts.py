@@ -0,0 +1,298 @@
+"""Single-pass fact scanner.
+
+Every fact kind contributes one alternative to a single compiled pattern, so a clause is
+scanned once and each character belongs to at most one fact. Alternatives are tried in
+registration order at each position (dates before plain numbers, and so on). Group names
+inside an alternative must be prefixed with the kind to keep them unique. Each kind also
+names the characters it can start with; their union is a lookahead that rejects most
+positions before any alternative is tried.
+
+Kinds written as a number followed by a marker (money with the currency after the amount,
+percentages, and plain numbers, whose marker is the end of the word) share the last
+alternative: the number is matched once into the ``amount`` group and each kind only adds
+its suffix, instead of every kind parsing the same digits again.
+"""
+import calendar
+import re
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Fact(NamedTuple):
+    kind: str
+    value: Any
+    start: int
+    end: int
+    text: str
+
+
+Converter = Callable[["re.Match[str]", str], Any]
+
+# Thousands groups may use . , ' or spaces ("1 234,56" is one amount, as it is written in German)
+NUM = r"(?:\d{1,3}(?:[.,' \u00a0\u202f]\d{3})+(?:[.,]\d+)?(?!\d)|\d+(?:[.,]\d+)?)"
+
+MONTHS = {
+    "january": 1, "jan": 1, "januar": 1, "jänner": 1,
+    "february": 2, "feb": 2, "februar": 2,
+    "march": 3, "mar": 3, "märz": 3, "maerz": 3, "mär": 3, "mrz": 3,
+    "april": 4, "apr": 4,
+    "may": 5, "mai": 5,
+    "june": 6, "jun": 6, "juni": 6,
+    "july": 7, "jul": 7, "juli": 7,
+    "august": 8, "aug": 8,
+    "september": 9, "sep": 9, "sept": 9,
+    "october": 10, "oct": 10, "oktober": 10, "okt": 10,
+    "november": 11, "nov": 11,
+    "december": 12, "dec": 12, "dezember": 12, "dez": 12,
+}
+
+
+def _trie(words) -> str:
+    # Alternation factored by shared prefixes: re tries branches one by one, so
+    # "J(?:an(?:uary|uar)?|...)" fails fast where "January|Januar|Jan|..." would not
+    tree: Dict[str, dict] = {}
+    for w in words:
+        node = tree
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def walk(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            body = f"(?:{body})?" if len(branches) == 1 else body[:-1] + ")?"
+        return body
+
+    return walk(tree)
+
+
+# Month names are matched capitalized, as they are written in both languages
+_MONTH = "(?:" + _trie(m.capitalize() for m in MONTHS) + r")(?![^\W\d_])"
+
+CURRENCIES = {
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "$": "USD", "us$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "£": "GBP", "gbp": "GBP",
+    "chf": "CHF",
+}
+_CURRENCY = "(?:€|£|(?i:us)?\\$|(?i:" + _trie(c for c in CURRENCIES if c.isalpha()) + r")(?![^\W\d_]))"
+# Codes and names are case-insensitive ("EUR", "eur", "Euro"), so both cases can start one
+_CURRENCY_FIRST = "".join(sorted({ch for c in CURRENCIES for ch in (c[0].lower(), c[0].upper())}))
+
+
+_GROUPING = {0x20: None, 0xA0: None, 0x202F: None, ord("'"): None}
+
+
+def plain_number(raw: str, lang: str) -> str:
+    """Locale-aware plain decimal: "1,234.56" (en) and "1.234,56" (de) both give "1234.56".
+
+    With a single separator followed by exactly three digits, ``lang`` decides:
+    "1.234" is 1234 in German and 1.234 in English.
+    """
+    if raw.isdigit():
+        return raw
+    s = raw.translate(_GROUPING)
+    dots, commas = s.count("."), s.count(",")
+    if dots and commas:
+        dec: Optional[str] = "." if s.rfind(".") > s.rfind(",") else ","
+    elif dots + commas == 1:
+        sep = "." if dots else ","
+        if len(s.rsplit(sep, 1)[1]) != 3:
+            dec = sep
+        else:
+            dec = sep if (sep == ",") == (lang == "de") else None
+    else:
+        dec = None
+    if dec != ".":
+        s = s.replace(".", "")
+    if dec != ",":
+        s = s.replace(",", "")
+    return s.replace(",", ".")
+
+
+def parse_number(raw: str, lang: str) -> Decimal:
+    return Decimal(plain_number(raw, lang))
+
+
+def canonical(plain: str) -> str:
+    # "0012.500" -> "12.5"; the form used for "numbers" and percentages
+    if "." in plain:
+        plain = plain.rstrip("0").rstrip(".")
+    plain = plain.lstrip("0")
+    return plain if plain and plain[0] != "." else "0" + plain
+
+
+def canonical_number(raw: str, lang: str) -> str:
+    # Most numbers in a clause are bare digits (counts, days, percentages); they skip the separator logic
+    if raw.isdigit():
+        return raw.lstrip("0") or "0"
+    return canonical(plain_number(raw, lang))
+
+
+def minor_units(plain: str) -> int:
+    # Cents are truncated past two decimals, as before
+    whole, _, frac = plain.partition(".")
+    return int(whole or 0) * 100 + int((frac + "00")[:2])
+
+
+_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _date(y: int, m: int, d: int) -> Optional[str]:
+    if y < 100:
+        y += 2000 if y < 70 else 1900
+    if not (1 <= m <= 12 and 1 <= d <= (28 if m == 2 else _DAYS[m])) and not (m == 2 and d == 29 and calendar.isleap(y)):
+        return None
+    return f"{y:04d}-{m:02d}-{d:02d}"
+
+
+def _convert_date(m: "re.Match[str]", lang: str) -> Optional[str]:
+    if m.group("date_iy"):
+        return _date(int(m.group("date_iy")), int(m.group("date_im")), int(m.group("date_id")))
+    if m.group("date_a"):
+        a, b, y = int(m.group("date_a")), int(m.group("date_b")), int(m.group("date_y"))
+        # English slash dates are month-first; everything else is day-first
+        if m.group("date_sep") == "/" and lang != "de":
+            return _date(y, a, b) or _date(y, b, a)
+        return _date(y, b, a) or _date(y, a, b)
+    if m.group("date_nd"):
+        return _date(int(m.group("date_ny")), MONTHS[m.group("date_nm").lower()], int(m.group("date_nd")))
+    return _date(int(m.group("date_my")), MONTHS[m.group("date_mm").lower()], int(m.group("date_md")))
+
+
+def _convert_money(m: "re.Match[str]", lang: str) -> Dict[str, Any]:
+    cur = m.group("money_c1") or m.group("money_c2")
+    amount = plain_number(m.group("money_a1") or m.group("amount"), lang)
+    return {"currency": CURRENCIES[cur.lower()], "amount_minor": minor_units(amount)}
+
+
+def _convert_percent(m: "re.Match[str]", lang: str) -> str:
+    return canonical_number(m.group("amount"), lang)
+
+
+def _convert_id(m: "re.Match[str]", lang: str) -> str:
+    return m.group("id")
+
+
+def _convert_dotted(m: "re.Match[str]", lang: str) -> None:
+    # Section and version numbers are not one value; scan() keeps their parts as numbers
+    return None
+
+
+def _convert_number(m: "re.Match[str]", lang: str) -> str:
+    return canonical_number(m.group("amount"), lang)
+
+
+# (kind, pattern, converter, characters a match can start with as a character-class body)
+_KINDS: List[Tuple[str, str, Converter, Optional[str]]] = [
+    (
+        "date",
+        r"(?<!\w)(?:"
+        r"(?P<date_iy>\d{4})[-/.](?P<date_im>\d{1,2})[-/.](?P<date_id>\d{1,2})"
+        r"|(?P<date_a>\d{1,2})(?P<date_sep>[./-])(?P<date_b>\d{1,2})(?P=date_sep)(?P<date_y>\d{4}|\d{2})"
+        rf"|(?P<date_nd>\d{{1,2}})\.?\s+(?P<date_nm>{_MONTH})\.?\s+(?P<date_ny>\d{{4}})"
+        rf"|(?P<date_mm>{_MONTH})\.?\s+(?P<date_md>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<date_my>\d{{4}})"
+        r")(?!\d)",
+        _convert_date,
+        # Month names are capitalized, as they are written in both languages
+        r"\dA-Z",
+    ),
+    # "3.2.1", but not thousands groups ("1.234.567") or dates, which are tried first
+    (
+        "dotted",
+        r"(?<!\w)(?!\d{1,3}(?:\.\d{3})+(?:,\d+)?(?![\d.]))\d+(?:\.\d+){2,}(?!\w)",
+        _convert_dotted,
+        r"\d",
+    ),
+    ("money", rf"(?<!\w)(?P<money_c1>{_CURRENCY})\s?(?P<money_a1>{NUM})", _convert_money, _CURRENCY_FIRST),
+    ("id", r"(?<!\w)(?=[A-Z0-9/-]*\d)[A-Z][A-Z0-9]*(?:[-/][A-Z0-9]+)+(?!\w)", _convert_id, "A-Z"),
+]
+# (kind, what follows the amount, converter), tried in this order after one NUM match
+_SUFFIXES: List[Tuple[str, str, Converter]] = [
+    ("money", rf"\s?(?P<money_c2>{_CURRENCY})", _convert_money),
+    ("percent", r"\s?(?:%|(?i:percent|per cent|prozent)(?![^\W\d_]))", _convert_percent),
+    ("number", r"(?!\w)", _convert_number),
+]
+_DIGITS = re.compile(r"\d+")
+_pattern: "re.Pattern[str]"
+# Group that closes a match (Match.lastgroup) -> (kind, converter)
+_converters: Dict[str, Tuple[str, Converter]] = {}
+
+
+def _compile() -> None:
+    global _pattern
+    _converters.clear()
+    parts = []
+    first = [r"\d"]  # the number-led alternative
+    for kind, pattern, convert, starts in _KINDS:
+        parts.append(f"(?P<{kind}>{pattern})")
+        _converters[kind] = (kind, convert)
+        first.append(starts)
+    suffixes = []
+    for kind, pattern, convert in _SUFFIXES:
+        suffixes.append(f"(?P<{kind}_after>{pattern})")
+        _converters[f"{kind}_after"] = (kind, convert)
+    parts.append(rf"(?<!\w)(?P<amount>{NUM})(?:" + "|".join(suffixes) + ")")
+    body = "(?:" + "|".join(parts) + ")"
+    # re cannot skip ahead on an alternation; the lookahead rejects most positions in one step.
+    # A kind that did not say how it starts could start anywhere, so then there is none.
+    if None not in first:
+        body = "(?=[" + "".join(first) + "])" + body
+    # Likewise a shared word-start check, tested once instead of per alternative
+    if all(pattern.startswith(r"(?<!\w)") for _, pattern, _, _ in _KINDS):
+        body = r"(?<!\w)" + body
+    _pattern = re.compile(body)
+
+
+def register(
+    kind: str, pattern: str, convert: Converter, before: Optional[str] = None, first: Optional[str] = None
+) -> None:
+    """Add a fact kind; inner groups of ``pattern`` must be prefixed ``<kind>_``.
+
+    The new kind is tried ahead of ``before`` at each position, and by default ahead of every
+    existing kind, so a more specific pattern (``PO-\\d+``) wins over a general one (``id``).
+    Money after its amount, percent and number share the last alternative, so naming one of
+    them places the new kind after all other kinds. ``first`` is the body of a character
+    class covering the characters a match can start with (``"A-Za-z"``); without it every
+    position is tried, which is correct but slower.
+    """
+    names = [k for k, *_ in _KINDS]
+    if kind in names or kind in {k for k, _, _ in _SUFFIXES}:
+        raise ValueError(f"fact kind already registered: {kind}")
+    if before is None:
+        pos = 0
+    elif before in names:
+        pos = names.index(before)
+    elif before in {k for k, _, _ in _SUFFIXES}:
+        pos = len(_KINDS)
+    else:
+        raise ValueError(f"unknown fact kind: {before}")
+    _KINDS.insert(pos, (kind, pattern, convert, first))
+    _compile()
+
+
+def scan(text: str, lang: str) -> List[Fact]:
+    """Typed facts in text order, with character offsets into ``text``."""
+    out: List[Fact] = []
+    for m in _pattern.finditer(text):
+        kind, convert = _converters[m.lastgroup]
+        try:
+            value = convert(m, lang)
+        except (KeyError, ValueError):
+            value = None
+        if value is not None:
+            start, end = m.span()
+            out.append(Fact(kind, value, start, end, m.group()))
+            continue
+        # Not a valid instance of its kind (31.02.2025, 3.2.1): keep the numbers inside it
+        base = m.start()
+        for n in _DIGITS.finditer(m.group()):
+            out.append(Fact("number", canonical_number(n.group(), lang), base + n.start(), base + n.end(), n.group()))
+    return out
+
+
+_compile()
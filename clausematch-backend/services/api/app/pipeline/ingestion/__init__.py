@@ -1,7 +1,11 @@
 from pathlib import Path
-from .parser_pdf import parse_pdf
+from typing import Any, Dict, Iterator
+from .. import rules
+from ..doc_cache import file_key, get_doc_cache
+from ..segment import iter_segments
+from .parser_pdf import parse_pdf, parse_pdf_pages
 from .parser_docx import parse_docx
-from .parser_xlsx import parse_xlsx
+from .parser_xlsx import iter_cell_segments, parse_xlsx
 from .parser_json import parse_json
 from .parser_pptx import parse_pptx
 
@@ -22,3 +26,49 @@ def parse_document(path: Path, lang: str = "en") -> str:
     return Path(path).read_text(encoding="utf-8", errors="ignore")
 
 
+
+
+TEXT_CHUNK_SIZE = 1 << 16
+
+
+def iter_document_text(path: Path, lang: str = "en") -> Iterator[str]:
+    """Yield a document's text in chunks; plain text is decoded incrementally from disk."""
+    if path.suffix.lower() == ".pdf":
+        for _, text in parse_pdf_pages(path):
+            yield text
+        return
+    if path.suffix.lower() in {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".json", ".ppt", ".pptx"}:
+        yield parse_document(path, lang)
+        return
+    with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+        while True:
+            chunk = f.read(TEXT_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_document_segments(path: Path, lang: str = "en") -> Iterator[str]:
+    """Yield a document's segments; spreadsheets stream one "Sheet!A1: value" segment per cell."""
+    if path.suffix.lower() in {".xls", ".xlsx"}:
+        return iter_cell_segments(path)
+    return iter_segments(iter_document_text(path, lang), lang)
+
+
+def load_document(path: Path, lang: str = "en") -> Dict[str, Any]:
+    """Parse, segment and extract per-segment facts, reusing the result for identical uploads.
+
+    Returns {"key", "segments", "facts"}; "cached" is True when it came from the cache. The
+    text itself is never held whole: it streams through segmentation and only segments are kept.
+    """
+    cache = get_doc_cache()
+    key = file_key(path, lang) if cache is not None else None
+    if cache is not None:
+        doc = cache.get(key)
+        if doc is not None:
+            return dict(doc, key=key, cached=True)
+    segments = list(iter_document_segments(path, lang))
+    doc = {"segments": segments, "facts": [rules.extract_facts(s, lang=lang) for s in segments]}
+    if cache is not None:
+        cache.put(key, doc)
+    return dict(doc, key=key, cached=False)
@@ -1,8 +1,87 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
 from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from pdfminer.converter import TextConverter
 from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 
 
-def parse_pdf(path: Path) -> str:
-    return extract_text(str(path))
+# Below this many pages the process start-up costs more than it saves
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+
+
+def default_workers() -> int:
+    """``PDF_WORKERS``, else every core, or a pool process's share of them.
+
+    Jobs are parsed inside the orchestrator's ``ORCH_WORKERS`` pool processes, which all parse
+    at once; each taking every core would start cores x workers processes.
+    """
+    if os.getenv("PDF_WORKERS"):
+        return int(os.environ["PDF_WORKERS"])
+    cores = os.cpu_count() or 1
+    if multiprocessing.parent_process() is None:
+        return cores
+    siblings = int(os.getenv("ORCH_WORKERS", str(max(1, cores - 1))))
+    return max(1, cores // siblings)
+
+
+def page_count(path: Path) -> int:
+    with open(path, "rb") as fp:
+        doc = PDFDocument(PDFParser(fp))
+        count = resolve1(doc.catalog["Pages"]).get("Count")
+        if isinstance(count, int):
+            return count
+        return sum(1 for _ in PDFPage.create_pages(doc))
 
 
+def _extract_range(path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    # One interpreter for the whole shard; the output buffer is drained after every page
+    out: List[Tuple[int, str]] = []
+    with open(path, "rb") as fp, StringIO() as buf:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, buf, laparams=LAParams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        pages = PDFPage.get_pages(fp, set(range(start, stop)), caching=True)
+        for pageno, page in zip(range(start, stop), pages):
+            interpreter.process_page(page)
+            out.append((pageno + 1, buf.getvalue()))
+            buf.seek(0)
+            buf.truncate()
+    return out
+
+
+def _shards(n_pages: int, workers: int) -> Sequence[Tuple[int, int]]:
+    # A few shards per worker evens out pages that are slower to lay out
+    size = max(1, -(-n_pages // (workers * 4)))
+    return [(s, min(n_pages, s + size)) for s in range(0, n_pages, size)]
+
+
+def parse_pdf_pages(path: Path, workers: Optional[int] = None) -> List[Tuple[int, str]]:
+    """Return [(page_number, text)] (1-based), extracting page ranges in parallel."""
+    workers = workers or default_workers()
+    n_pages = page_count(path)
+    if workers <= 1 or n_pages < PARALLEL_MIN_PAGES:
+        return _extract_range(str(path), 0, n_pages)
+    shards = _shards(n_pages, workers)
+    # spawn: the caller may run threads (the API, a job's stage graph), which fork does not copy safely
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=ctx) as pool:
+        # map() yields in submission order, so pages are reassembled in document order
+        results = pool.map(_extract_range, [str(path)] * len(shards), *zip(*shards))
+        return [page for shard in results for page in shard]
+
+
+def parse_pdf(path: Path) -> str:
+    workers = default_workers()
+    if workers <= 1:
+        return extract_text(str(path))
+    return "".join(text for _, text in parse_pdf_pages(path, workers))
@@ -1,17 +1,59 @@
+from datetime import date, datetime, time
 from pathlib import Path
+from typing import Any, Iterator, Tuple
 from openpyxl import load_workbook
 import json
 
 
-def parse_xlsx(path: Path) -> str:
-    wb = load_workbook(str(path), data_only=True)
-    data = {}
-    for sheet in wb.sheetnames:
-        ws = wb[sheet]
-        rows = []
-        for row in ws.iter_rows(values_only=True):
-            rows.append(["" if v is None else str(v) for v in row])
-        data[sheet] = rows
-    return json.dumps(data, indent=2)
+CellRecord = Tuple[str, str, Any]
+
+
+def iter_cells(path: Path) -> Iterator[CellRecord]:
+    """Yield (sheet, cell address, value) for every non-empty cell, row by row.
+
+    The workbook is opened read-only, so only the current row is held in memory.
+    """
+    wb = load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            for row in ws.iter_rows():
+                for cell in row:
+                    value = getattr(cell, "value", None)
+                    if value is None or value == "":
+                        continue
+                    yield ws.title, cell.coordinate, value
+    finally:
+        # read-only workbooks keep the zip open until closed
+        wb.close()
+
 
+def format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(value).upper()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return " ".join(str(value).split())
 
+
+def iter_cell_segments(path: Path) -> Iterator[str]:
+    # One segment per cell; bypasses the sentence splitter so "12.50" stays one number
+    for sheet, addr, value in iter_cells(path):
+        yield f"{sheet}!{addr}: {format_value(value)}"
+
+
+def parse_xlsx(path: Path) -> str:
+    wb = load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        data = {}
+        for ws in wb.worksheets:
+            rows = []
+            for row in ws.iter_rows(values_only=True):
+                rows.append(["" if v is None else str(v) for v in row])
+            data[ws.title] = rows
+        return json.dumps(data, indent=2)
+    finally:
+        wb.close()
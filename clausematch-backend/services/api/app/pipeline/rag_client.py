@@ -1,8 +1,47 @@
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional, Sequence
 
+import requests
 
-def topk(text: str, lang: str, k: int = 3) -> List[Dict]:
-    # Stubbed contexts
-    return []
+# Queries per request; the rag service accepts up to RAG_MAX_QUERIES (10000)
+BATCH = 5000
+_SESSION: Optional[requests.Session] = None
+
+
+def _session() -> requests.Session:
+    # One keep-alive session per process
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
 
 
+def topk_many(texts: Sequence[str], lang: str, k: int = 3) -> List[List[Dict]]:
+    # Reference contexts for every clause of a job in one call to the rag service, in order.
+    # Without RAG_URL, or if the service fails, clauses get no contexts; findings do not need them.
+    url = os.getenv("RAG_URL", "").rstrip("/")
+    empty: List[List[Dict]] = [[] for _ in texts]
+    if not url or not texts:
+        return empty
+    out: List[List[Dict]] = []
+    try:
+        for i in range(0, len(texts), BATCH):
+            chunk = list(texts[i:i + BATCH])
+            resp = _session().post(
+                f"{url}/topk",
+                json={"queries": chunk, "k": k, "lang": lang},
+                timeout=float(os.getenv("RAG_TIMEOUT_S", "10")),
+            )
+            if resp.status_code != 200:
+                return empty
+            results = resp.json().get("results")
+            if not isinstance(results, list) or len(results) != len(chunk):
+                return empty
+            out.extend(results)
+    except Exception:
+        return empty
+    return out
+
+
+def topk(text: str, lang: str, k: int = 3) -> List[Dict]:
+    return topk_many([text], lang, k)[0]
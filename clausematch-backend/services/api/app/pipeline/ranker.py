@@ -1,10 +1,13 @@
-from typing import Dict
+from typing import Tuple
 
+from .records import Finding
 
-def score(finding: Dict) -> Dict:
-    status = (finding.get("status") or "").upper()
-    entity_weight = 1.0 if finding.get("field") in {"money", "date", "id"} else 0.3
-    semantic_conf = float(finding.get("semantic_score", 0.5))
+
+def score(finding: Finding) -> Tuple[str, float]:
+    """(risk, confidence) for a finding."""
+    status = (finding.status or "").upper()
+    entity_weight = 1.0 if finding.field in {"money", "date", "id"} else 0.3
+    semantic_conf = float(finding.semantic_score if finding.semantic_score is not None else 0.5)
     rule_agreement = 1.0 if status == "OK" else 0.0
     score_val = (1.0 * (status == "MISMATCH")) + 0.6 * entity_weight + 0.3 * semantic_conf + 0.2 * rule_agreement
     if score_val > 1.2:
@@ -14,6 +17,6 @@ def score(finding: Dict) -> Dict:
     else:
         risk = "LOW"
     conf = max(0.0, min(1.0, 0.5 * semantic_conf + 0.5 * (1.0 if status == "OK" else 0.6)))
-    return {"risk": risk, "confidence": round(conf, 2)}
+    return risk, round(conf, 2)
 
 
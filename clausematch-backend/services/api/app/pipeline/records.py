@@ -0,0 +1,102 @@
+"""Typed, slotted pipeline records; dicts only at the API and storage boundary.
+
+A ``Finding`` holds no per-instance ``__dict__``. Findings of one clause share a single
+``contexts`` tuple, and ``rules_triggered`` tuples are interned, so a 10k-clause job does not
+carry thousands of equal small lists. Pickling, equality and ``replace`` come from
+``clausematch_engine.records.Record``, shared with ``backend/``'s pair records.
+"""
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from clausematch_engine.records import Record, as_dict, json_default  # noqa: F401
+
+
+_RULES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def rules_tuple(rules: Iterable[str]) -> Tuple[str, ...]:
+    t = tuple(rules)
+    return _RULES.setdefault(t, t)
+
+
+class Finding(Record):
+    __slots__ = (
+        "clause_key",
+        "status",
+        "field",
+        "rationale",
+        "confidence",
+        "semantic_score",
+        "rules_triggered",
+        "contexts",
+        "risk",
+        "carried_over",
+    )
+
+    def __init__(
+        self,
+        clause_key: str,
+        status: str,
+        field: Optional[str] = None,
+        rationale: str = "",
+        confidence: Optional[float] = None,
+        semantic_score: Optional[float] = None,
+        rules_triggered: Tuple[str, ...] = (),
+        contexts: Tuple[Dict[str, Any], ...] = (),
+        risk: Optional[str] = None,
+        carried_over: bool = False,
+    ):
+        self.clause_key = clause_key
+        self.status = status
+        # LLM issue types arrive as fresh strings per finding
+        self.field = sys.intern(field) if field else field
+        self.rationale = rationale
+        self.confidence = confidence
+        self.semantic_score = semantic_score
+        self.rules_triggered = rules_tuple(rules_triggered)
+        self.contexts = contexts
+        self.risk = risk
+        self.carried_over = carried_over
+
+    def __setstate__(self, state) -> None:
+        # Pickled between the job process and the API; re-intern on arrival
+        super().__setstate__(state)
+        self.rules_triggered = rules_tuple(self.rules_triggered)
+
+    def __repr__(self) -> str:
+        return f"Finding({self.clause_key!r}, {self.status!r}, field={self.field!r}, risk={self.risk!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The JSON form; unset optional keys are left out, as in the original dict findings."""
+        out: Dict[str, Any] = {"clause_key": self.clause_key}
+        if self.field is not None:
+            out["field"] = self.field
+        out["status"] = self.status
+        out["rationale"] = self.rationale
+        if self.confidence is not None:
+            out["confidence"] = self.confidence
+        if self.semantic_score is not None:
+            out["semantic_score"] = self.semantic_score
+        out["rules_triggered"] = list(self.rules_triggered)
+        out["contexts"] = list(self.contexts)
+        if self.risk is not None:
+            out["risk"] = self.risk
+        if self.carried_over:
+            out["carried_over"] = True
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], contexts: Optional[Tuple[Dict[str, Any], ...]] = None) -> "Finding":
+        return cls(
+            clause_key=d.get("clause_key", ""),
+            status=d.get("status") or "",
+            field=d.get("field"),
+            rationale=d.get("rationale") or "",
+            confidence=d.get("confidence"),
+            semantic_score=d.get("semantic_score"),
+            rules_triggered=d.get("rules_triggered") or (),
+            contexts=contexts if contexts is not None else tuple(d.get("contexts") or ()),
+            risk=d.get("risk"),
+            carried_over=bool(d.get("carried_over")),
+        )
+
@@ -0,0 +1,37 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from clausematch_engine.revision import pair_digest
+
+from . import storage
+from .records import Finding
+
+
+def save_pairs(job_id: str, pairs: Sequence[Tuple[str, str, str]]) -> List[str]:
+    """Store one digest per aligned pair (in clause order) next to the job's findings."""
+    digests = [pair_digest(a, b) for _, a, b in pairs]
+    storage.put_json(f"{job_id}/pairs.json", {"keys": [k for k, _, _ in pairs], "digests": digests})
+    return digests
+
+
+def exists(job_id: str) -> bool:
+    return storage.get_json(f"{job_id}/pairs.json") is not None
+
+
+def previous_findings(job_id: Optional[str]) -> Dict[str, List[Finding]]:
+    """Map pair digest -> findings of a completed job; empty when there is none."""
+    if not job_id:
+        return {}
+    stored = storage.get_json(f"{job_id}/pairs.json")
+    findings = storage.get_json(f"{job_id}/findings.json")
+    if stored is None or findings is None:
+        return {}
+    by_key: Dict[str, List[Finding]] = defaultdict(list)
+    for f in findings:
+        by_key[f.get("clause_key")].append(Finding.from_dict(f))
+    return {d: by_key.get(k, []) for k, d in zip(stored["keys"], stored["digests"])}
+
+
+def carry_over(key: str, findings: List[Finding]) -> List[Finding]:
+    # The pair may have moved; re-key the copies to its new clause position
+    return [f.replace(clause_key=key, carried_over=True) for f in findings]
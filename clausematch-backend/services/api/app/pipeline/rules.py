@@ -1,33 +1,34 @@
-import json
-import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence
 
-
-money_re = re.compile(r"(?i)(€|eur|euro[s]?)\s*([\d\s.,]+)")
-date_re = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})")
-num_re = re.compile(r"\b\d[\d\s.,]*\b")
-
-
-def _to_minor(amount_str: str) -> int:
-    cleaned = amount_str.replace(" ", "").replace(",", "")
-    if "." in cleaned:
-        major, minor = cleaned.split(".", 1)
-        minor = (minor + "00")[:2]
-        return int(major or 0) * 100 + int(minor or 0)
-    return int(cleaned) * 100
+from .facts import scan
+from .records import Finding
 
 
 def extract_facts(text: str, lang: str) -> Dict[str, Any]:
-    facts: Dict[str, Any] = {"money": [], "dates": [], "numbers": []}
-    for m in money_re.finditer(text):
-        ccy, amt = m.group(1).upper(), m.group(2)
-        facts["money"].append({"currency": "EUR" if ccy.startswith("€") or ccy.startswith("EU") else ccy, "amount_minor": _to_minor(amt)})
-    for d in date_re.finditer(text):
-        y, mo, da = d.groups()
-        facts["dates"].append(f"{int(y):04d}-{int(mo):02d}-{int(da):02d}")
-    for n in num_re.finditer(text):
-        val = n.group(0).replace(" ", "").replace(",", "")
-        facts["numbers"].append(val)
+    """Group the scanner's facts by kind.
+
+    "numbers" holds every numeric value in canonical form ("1.234,56" in German and
+    "1,234.56" in English are both "1234.56"), money amounts and percentages included,
+    but not the parts of dates or IDs.
+    """
+    facts: Dict[str, Any] = {"money": [], "dates": [], "numbers": [], "percentages": [], "ids": []}
+    for f in scan(text, lang):
+        if f.kind == "money":
+            facts["money"].append(f.value)
+            whole, cents = divmod(f.value["amount_minor"], 100)
+            facts["numbers"].append(f"{whole}.{cents:02d}".rstrip("0") if cents else str(whole))
+        elif f.kind == "date":
+            facts["dates"].append(f.value)
+        elif f.kind == "percent":
+            facts["percentages"].append(f.value)
+            facts["numbers"].append(f.value)
+        elif f.kind == "id":
+            facts["ids"].append(f.value)
+        elif f.kind == "number":
+            facts["numbers"].append(f.value)
+        else:
+            # kinds added with facts.register()
+            facts.setdefault(f.kind, []).append(f.value)
     return facts
 
 
@@ -49,25 +50,40 @@ def compare_facts(a: Dict[str, Any], b: Dict[str, Any]) -> List[Dict[str, Any]]:
             findings.append({"field": "date", "status": "MISMATCH", "rationale": "dates differ"})
         else:
             findings.append({"field": "date", "status": "OK", "rationale": "equal"})
+    # percentages and IDs (compare sets); older cached facts may lack these keys
+    for field, kind in (("percentage", "percentages"), ("id", "ids")):
+        fa, fb = a.get(kind, []), b.get(kind, [])
+        if fa or fb:
+            if set(fa) != set(fb):
+                findings.append({"field": field, "status": "MISMATCH", "rationale": f"{kind} differ"})
+            else:
+                findings.append({"field": field, "status": "OK", "rationale": "equal"})
     return findings
 
 
-def merge_findings(key: str, diffs: List[Dict[str, Any]], sem: List[Dict[str, Any]], contexts: List[Dict[str, Any]]):
+def merge_findings(key: str, diffs: List[Dict[str, Any]], sem: List[Dict[str, Any]], contexts: Sequence[Dict[str, Any]]) -> List[Finding]:
+    # The clause's findings share one contexts tuple
+    ctx = tuple(contexts)
     if not diffs and not sem:
-        return {"clause_key": key, "status": "OK", "confidence": 0.9, "semantic_score": 0.9, "rationale": "no diffs", "rules_triggered": [], "contexts": contexts}
-    # combine
+        return [Finding(key, "OK", rationale="no diffs", confidence=0.9, semantic_score=0.9, contexts=ctx)]
     items = []
     for d in diffs or []:
-        items.append({"clause_key": key, **d, "semantic_score": 0.0, "contexts": contexts, "rules_triggered": [d.get("field", "rule")], "confidence": 0.7})
+        items.append(Finding(
+            key, d["status"], field=d.get("field"), rationale=d.get("rationale", ""), confidence=0.7,
+            semantic_score=0.0, rules_triggered=(d.get("field", "rule"),), contexts=ctx,
+        ))
     for s in sem or []:
-        items.append({"clause_key": key, **s, "contexts": contexts, "rules_triggered": ["LLM"]})
+        items.append(Finding(
+            key, s.get("status", "REVIEW"), field=s.get("field"), rationale=s.get("rationale", ""),
+            semantic_score=s.get("semantic_score"), rules_triggered=("LLM",), contexts=ctx,
+        ))
     return items
 
 
-def summarize(findings: List[Dict[str, Any]]) -> Dict[str, int]:
+def summarize(findings: List[Finding]) -> Dict[str, int]:
     summary = {"ok": 0, "review": 0, "mismatch": 0}
     for f in findings:
-        st = (f.get("status") or "").upper()
+        st = (f.status or "").upper()
         if st == "OK":
             summary["ok"] += 1
         elif st == "MISMATCH":
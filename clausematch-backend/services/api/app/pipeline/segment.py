@@ -1,20 +1,12 @@
-from typing import List
+from typing import Iterable, Iterator, List
 
+from clausematch_engine import segment as _engine
 
-def segment(text: str, lang: str) -> List[str]:
-    if not text:
-        return []
-    lines: List[str] = []
-    for raw in text.splitlines():
-        raw = raw.strip()
-        if not raw:
-            continue
-        # naive sentence-ish split
-        parts = raw.replace("?", ".").replace("!", ".").split(".")
-        for p in parts:
-            p = p.strip()
-            if p:
-                lines.append(p)
-    return lines
+
+def iter_segments(chunks: Iterable[str], lang: str) -> Iterator[str]:
+    """Yield segments from a stream of text chunks, buffering only the current line."""
+    return _engine.iter_segments(chunks)
 
 
+def segment(text: str, lang: str) -> List[str]:
+    return _engine.segment_text(text)
@@ -1,14 +1,121 @@
-from typing import Iterable, List, Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Dict, Any
+import asyncio
 import json
 import os
 import time
+import zlib
 
+import httpx
+import numpy as np
 import requests
+from scipy import sparse
+
+from .verdict_cache import get_cache, make_key
+
+
+NGRAM = 3
+HASH_DIM = 1 << 18
+BLOCK_ROWS = 512
+TOP_K = 5
+LOCALITY_WEIGHT = 0.3
+MIN_SCORE = 0.1
+# n-grams present in more than this share of all clauses are dropped: they carry no
+# alignment signal and make the block products dense
+MAX_DF = 0.5
+
+
+def _ngram_counts(texts: Sequence[str]) -> sparse.csr_matrix:
+    # Hashed character n-grams, padded at word boundaries
+    indptr, indices, data = [0], [], []
+    for t in texts:
+        counts: Dict[int, int] = {}
+        for word in t.lower().split():
+            w = f" {word} "
+            for k in range(max(1, len(w) - NGRAM + 1)):
+                h = zlib.crc32(w[k:k + NGRAM].encode("utf-8")) & (HASH_DIM - 1)
+                counts[h] = counts.get(h, 0) + 1
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), HASH_DIM),
+    )
+
+
+def _weight(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    # Sublinear tf * idf, rows L2-normalized
+    m = counts.copy()
+    m.data = (1.0 + np.log(m.data)) * idf[m.indices]
+    m.eliminate_zeros()
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags((1.0 / norms).astype(np.float32)).dot(m).tocsr()
+
+
+def _candidates(a: sparse.csr_matrix, b: sparse.csr_matrix, top_k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Row blocks of A against all of B, keeping only the top-k per row: memory is O(BLOCK_ROWS * m)
+    n, m = a.shape[0], b.shape[0]
+    bt = b.T.tocsc()
+    k = min(top_k, m)
+    cols_j = np.arange(m, dtype=np.float32) / max(1, m - 1)
+    rows, cols, scores = [], [], []
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(n, start + BLOCK_ROWS)
+        block = (a[start:stop] @ bt).toarray()
+        pos_i = (np.arange(start, stop, dtype=np.float32) / max(1, n - 1))[:, None]
+        block -= LOCALITY_WEIGHT * np.abs(pos_i - cols_j[None, :])
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        rows.append(np.repeat(np.arange(start, stop), k))
+        cols.append(top.ravel())
+        scores.append(np.take_along_axis(block, top, axis=1).ravel())
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
 
 
 def embed_align(en: Iterable[str], de: Iterable[str]) -> List[Tuple[str, str, str]]:
-    # Fallback: empty alignment
-    return []
+    """Cross-lingual alignment from hashed character n-gram vectors (CPU only).
+
+    Similarity is computed block by block with a sparse product, penalized by the
+    distance from the diagonal, pruned to the top-k targets per source clause and
+    assigned greedily one-to-one. Unmatched clauses are kept as one-sided pairs.
+    """
+    en_list, de_list = list(en), list(de)
+    n, m = len(en_list), len(de_list)
+    match_of_en: Dict[int, int] = {}
+    if n and m:
+        # Shared idf over both sides so boilerplate n-grams count for little
+        a_raw, b_raw = _ngram_counts(en_list), _ngram_counts(de_list)
+        df = np.bincount(a_raw.indices, minlength=HASH_DIM) + np.bincount(b_raw.indices, minlength=HASH_DIM)
+        idf = (np.log((n + m + 1) / (df + 1)) + 1.0).astype(np.float32)
+        idf[df > MAX_DF * (n + m)] = 0.0
+        a, b = _weight(a_raw, idf), _weight(b_raw, idf)
+        rows, cols, scores = _candidates(a, b, TOP_K)
+        used_de = set()
+        for idx in np.argsort(-scores, kind="stable"):
+            if scores[idx] < MIN_SCORE:
+                break
+            i, j = int(rows[idx]), int(cols[idx])
+            if i in match_of_en or j in used_de:
+                continue
+            match_of_en[i] = j
+            used_de.add(j)
+
+    # Emit in source order; an unmatched target follows the source matched just before it
+    after: Dict[int, List[int]] = {}
+    de_to_en = {j: i for i, j in match_of_en.items()}
+    last_i = -1
+    for j in range(m):
+        if j in de_to_en:
+            last_i = de_to_en[j]
+        else:
+            after.setdefault(last_i, []).append(j)
+    rows_out: List[Tuple[str, str]] = [("", de_list[j]) for j in after.get(-1, [])]
+    for i in range(n):
+        j = match_of_en.get(i)
+        rows_out.append((en_list[i], de_list[j] if j is not None else ""))
+        rows_out.extend(("", de_list[jj]) for jj in after.get(i, []))
+    return [(f"clause_{k}", a_txt, b_txt) for k, (a_txt, b_txt) in enumerate(rows_out)]
 
 
 _TOKEN_CACHE: Dict[str, Any] = {"value": None, "exp": 0}
@@ -22,7 +129,7 @@ def _get_iam_token() -> str:
     if _TOKEN_CACHE["value"] and _TOKEN_CACHE["exp"] > now + 30:
         return _TOKEN_CACHE["value"]
     resp = requests.post(
-        "https://iam.cloud.ibm.com/identity/token",
+        os.getenv("WML_IAM_URL", "https://iam.cloud.ibm.com/identity/token"),
         data={
             "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
             "apikey": api_key,
@@ -38,15 +145,23 @@ def _get_iam_token() -> str:
     return token
 
 
-def llm_check(a_txt: str, b_txt: str, fa, fb) -> List[dict]:
-    # If no credentials, skip
-    project_id = os.getenv("WML_PROJECT_ID")
-    model_id = os.getenv("WML_MODEL_ID", "ibm/granite-3-2-8b-instruct")
-    base_url = os.getenv("WML_API_URL", "https://us-south.ml.cloud.ibm.com")
-    token = _get_iam_token()
-    if not (project_id and token):
-        return []
+# Bump whenever the prompt text or response mapping changes so cached verdicts are not reused
+PROMPT_VERSION = "v1"
+
+
+def _cache_key(a_txt: str, b_txt: str, cfg: Dict[str, str]) -> str:
+    return make_key(cfg["model_id"], PROMPT_VERSION, a_txt, b_txt)
+
 
+def _wml_config() -> Dict[str, str]:
+    return {
+        "project_id": os.getenv("WML_PROJECT_ID", ""),
+        "model_id": os.getenv("WML_MODEL_ID", "ibm/granite-3-2-8b-instruct"),
+        "base_url": os.getenv("WML_API_URL", "https://us-south.ml.cloud.ibm.com"),
+    }
+
+
+def _build_body(a_txt: str, b_txt: str, cfg: Dict[str, str]) -> Dict[str, Any]:
     prompt = (
         "You are an AI consistency auditor. Compare multiple multilingual or multi-format documents for factual consistency.\n"
         "Detect mismatches in numbers, dates, monetary amounts, or entities. If most versions agree and one differs, mark it as suspect.\n"
@@ -55,8 +170,7 @@ def llm_check(a_txt: str, b_txt: str, fa, fb) -> List[dict]:
         "No extra text. JSON only.\n\n"
         f"Input: EN: {a_txt}\nDE: {b_txt}\n\nOutput:"
     )
-
-    body = {
+    return {
         "input": prompt,
         "parameters": {
             "decoding_method": "greedy",
@@ -64,41 +178,154 @@ def llm_check(a_txt: str, b_txt: str, fa, fb) -> List[dict]:
             "min_new_tokens": 0,
             "repetition_penalty": 1,
         },
-        "model_id": model_id,
-        "project_id": project_id,
+        "model_id": cfg["model_id"],
+        "project_id": cfg["project_id"],
+    }
+
+
+def _headers(token: str) -> Dict[str, str]:
+    return {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}",
     }
 
+
+def _generation_url(cfg: Dict[str, str]) -> str:
+    return f"{cfg['base_url']}/ml/v1/text/generation?version=2023-05-29"
+
+
+def _map_response(out: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Expect results[0].generated_text -> JSON string
+    text = out.get("results", [{}])[0].get("generated_text", "{}")
+    parsed = json.loads(text)
+    issues = parsed.get("issues", []) or []
+    status = (parsed.get("status") or "").upper()
+    conf = float(parsed.get("confidence", 0.0) or 0.0)
+    mapped: List[Dict[str, Any]] = []
+    for it in issues:
+        field = (it.get("type") or "entity").lower()
+        mapped.append({
+            "field": field if field in {"date", "money", "monetary", "number", "id", "entity"} else "entity",
+            "status": "MISMATCH" if status == "MISMATCH" else ("REVIEW" if status == "REVIEW" else "OK"),
+            "rationale": it.get("comment") or "semantic check",
+            "semantic_score": conf,
+        })
+    return mapped
+
+
+_SESSION: Optional[requests.Session] = None
+
+
+def _session() -> requests.Session:
+    # One keep-alive session per process instead of a fresh connection per clause
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
+
+
+def llm_check(a_txt: str, b_txt: str, fa, fb) -> List[dict]:
+    # If no credentials, skip
+    cfg = _wml_config()
+    token = _get_iam_token()
+    if not (cfg["project_id"] and token):
+        return []
+    cache = get_cache()
+    key = _cache_key(a_txt, b_txt, cfg)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        resp = requests.post(
-            f"{base_url}/ml/v1/text/generation?version=2023-05-29",
-            headers={
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {token}",
-            },
-            json=body,
+        resp = _session().post(
+            _generation_url(cfg),
+            headers=_headers(token),
+            json=_build_body(a_txt, b_txt, cfg),
             timeout=60,
         )
         if resp.status_code != 200:
             return []
-        out = resp.json()
-        # Expect results[0].generated_text -> JSON string
-        text = out.get("results", [{}])[0].get("generated_text", "{}")
-        parsed = json.loads(text)
-        issues = parsed.get("issues", []) or []
-        status = (parsed.get("status") or "").upper()
-        conf = float(parsed.get("confidence", 0.0) or 0.0)
-        mapped: List[Dict[str, Any]] = []
-        for it in issues:
-            field = (it.get("type") or "entity").lower()
-            mapped.append({
-                "field": field if field in {"date", "money", "monetary", "number", "id", "entity"} else "entity",
-                "status": "MISMATCH" if status == "MISMATCH" else ("REVIEW" if status == "REVIEW" else "OK"),
-                "rationale": it.get("comment") or "semantic check",
-                "semantic_score": conf,
-            })
+        mapped = _map_response(resp.json())
+        cache.put(key, mapped)
         return mapped
     except Exception:
         return []
 
 
+def _concurrency() -> int:
+    return max(1, int(os.getenv("WML_CONCURRENCY", "8")))
+
+
+async def llm_check_batch(
+    items: Sequence[Tuple[str, str, Any, Any]], concurrency: Optional[int] = None, stats: Optional[Dict[str, int]] = None
+) -> List[List[dict]]:
+    """Run llm_check for every (a_txt, b_txt, fa, fb) item concurrently.
+
+    Results are returned in the same order as ``items``; a failed call yields ``[]``
+    for its slot, exactly like the scalar ``llm_check``. Cached verdicts are served
+    without a request. ``stats``, when given, counts verdicts by outcome: ``cached``, ``ok``,
+    ``error`` (one per request) and ``skipped`` (no credentials).
+    """
+    stats = {} if stats is None else stats
+    results: List[List[dict]] = [[] for _ in items]
+    cfg = _wml_config()
+    token = _get_iam_token() if items else ""
+    if not (cfg["project_id"] and token):
+        if items:
+            stats["skipped"] = stats.get("skipped", 0) + len(items)
+        return results
+
+    cache = get_cache()
+    keys = [_cache_key(it[0], it[1], cfg) for it in items]
+    # Identical pairs within a job (repeated boilerplate) are sent once
+    pending: Dict[str, List[int]] = {}
+    for i, key in enumerate(keys):
+        if key in pending:
+            pending[key].append(i)
+            continue
+        cached = cache.get(key)
+        if cached is None:
+            pending[key] = [i]
+        else:
+            results[i] = cached
+            stats["cached"] = stats.get("cached", 0) + 1
+    if not pending:
+        return results
+
+    limit = concurrency or _concurrency()
+    sem = asyncio.Semaphore(limit)
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+    url, headers = _generation_url(cfg), _headers(token)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def one(i: int, a_txt: str, b_txt: str) -> None:
+            async with sem:
+                outcome = "error"
+                try:
+                    resp = await client.post(url, headers=headers, json=_build_body(a_txt, b_txt, cfg))
+                    if resp.status_code == 200:
+                        mapped = _map_response(resp.json())
+                        cache.put(keys[i], mapped)
+                        for j in pending[keys[i]]:
+                            results[j] = mapped
+                        outcome = "ok"
+                except Exception:
+                    pass
+                stats[outcome] = stats.get(outcome, 0) + 1
+
+        await asyncio.gather(*(one(idx[0], items[idx[0]][0], items[idx[0]][1]) for idx in pending.values()))
+    return results
+
+
+def llm_check_many(
+    items: Sequence[Tuple[str, str, Any, Any]], concurrency: Optional[int] = None, stats: Optional[Dict[str, int]] = None
+) -> List[List[dict]]:
+    # Sync entry point for the orchestrator; safe to call from inside a running event loop
+    coro = llm_check_batch(items, concurrency, stats)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
@@ -1,19 +1,208 @@
-import json
+import gzip
+import hashlib
+import mimetypes
 import os
-from typing import Any
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterator, NamedTuple, Optional
 
+import orjson
 
-ARTIFACT_ROOT = os.path.join(os.path.dirname(__file__), "..", "artifacts")
-ARTIFACT_ROOT = os.path.abspath(ARTIFACT_ROOT)
-os.makedirs(ARTIFACT_ROOT, exist_ok=True)
+try:
+    import zstandard
+except ImportError:  # optional; ARTIFACT_COMPRESSION=zstd needs it
+    zstandard = None
 
 
-def put_json(path: str, data: Any) -> str:
-    full = os.path.join(ARTIFACT_ROOT, path)
+ARTIFACT_ROOT = os.path.abspath(os.getenv("ARTIFACT_ROOT") or os.path.join(os.path.dirname(__file__), "..", "artifacts"))
+READ_CHUNK_BYTES = 64 << 10
+
+# Codec names double as HTTP Content-Encoding values
+CODECS = ("none", "gzip", "zstd")
+# Top-level directories of the content-addressed layout; never served as legacy files
+LAYOUT_DIRS = frozenset({"blobs", "refs"})
+
+
+class Artifact(NamedTuple):
+    path: str
+    digest: str  # sha256 of the decoded content
+    codec: str
+    size: int  # decoded bytes
+    stored_size: int
+    content_type: str
+
+    @property
+    def blob(self) -> str:
+        return self.digest if self.codec == "none" else f"{self.digest}.{self.codec}"
+
+
+class ArtifactBackend:
+    """Where blobs and refs live. Blobs are immutable and named by content; refs map an
+    artifact path (``<job_id>/findings.json``) to a blob and are replaced atomically.
+    """
+
+    def write_blob(self, name: str, data: bytes) -> bool:
+        """Store ``data`` unless a blob of that name exists; True if it was written."""
+        raise NotImplementedError
+
+    def open_blob(self, name: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def write_ref(self, path: str, ref: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def read_ref(self, path: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def open_legacy(self, path: str) -> Optional[BinaryIO]:
+        """Plain file written before refs existed, if any; never a blob or ref file itself."""
+        return None
+
+
+def _atomic_write(full: str, data: bytes) -> None:
     os.makedirs(os.path.dirname(full), exist_ok=True)
-    with open(full, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    return full
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(full), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, full)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class LocalBackend(ArtifactBackend):
+    """``<root>/blobs/<ab>/<digest>[.codec]`` and ``<root>/refs/<path>``; every write is a
+    temp file in the target directory followed by ``os.replace``, so readers never see a torn file.
+    """
+
+    def __init__(self, root: str = ARTIFACT_ROOT):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _inside(self, *parts: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, *parts))
+        if os.path.commonpath([full, self.root]) != self.root:
+            raise ValueError(f"path escapes artifact root: {parts[-1]}")
+        return full
+
+    def _blob(self, name: str) -> str:
+        return os.path.join(self.root, "blobs", name[:2], name)
+
+    def write_blob(self, name: str, data: bytes) -> bool:
+        full = self._blob(name)
+        if os.path.exists(full):
+            return False
+        _atomic_write(full, data)
+        return True
+
+    def open_blob(self, name: str) -> BinaryIO:
+        return open(self._blob(name), "rb")
+
+    def write_ref(self, path: str, ref: Dict[str, Any]) -> None:
+        _atomic_write(self._inside("refs", path), orjson.dumps(ref))
+
+    def read_ref(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._inside("refs", path), "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    def open_legacy(self, path: str) -> Optional[BinaryIO]:
+        full = self._inside(path)
+        # Blobs and refs are only reachable through an artifact path's ref
+        if os.path.relpath(full, self.root).split(os.sep)[0] in LAYOUT_DIRS:
+            return None
+        return open(full, "rb") if os.path.isfile(full) else None
+
+
+BACKENDS: Dict[str, Callable[[], ArtifactBackend]] = {"local": LocalBackend}
+
+
+def register_backend(name: str, factory: Callable[[], ArtifactBackend]) -> None:
+    """Make ``ARTIFACT_BACKEND=<name>`` select ``factory()``."""
+    BACKENDS[name] = factory
+
+
+_backend: Optional[ArtifactBackend] = None
+
+
+def backend() -> ArtifactBackend:
+    global _backend
+    if _backend is None:
+        name = os.getenv("ARTIFACT_BACKEND", "local")
+        if name not in BACKENDS:
+            raise ValueError(f"unknown ARTIFACT_BACKEND: {name}")
+        _backend = BACKENDS[name]()
+    return _backend
+
+
+def _codec() -> str:
+    codec = os.getenv("ARTIFACT_COMPRESSION", "gzip").lower()
+    if codec not in CODECS:
+        raise ValueError(f"unknown ARTIFACT_COMPRESSION: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("ARTIFACT_COMPRESSION=zstd needs the zstandard package")
+    return codec
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    level = os.getenv("ARTIFACT_COMPRESSION_LEVEL")
+    if codec == "gzip":
+        return gzip.compress(data, int(level or 3), mtime=0)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=int(level or 3)).compress(data)
+    return data
+
+
+class _GzipReader(gzip.GzipFile):
+    # GzipFile leaves a passed-in file open; this one owns it
+    def close(self) -> None:
+        raw = self.fileobj
+        try:
+            super().close()
+        finally:
+            if raw is not None:
+                raw.close()
+
+
+def _decoder(raw: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return _GzipReader(fileobj=raw, mode="rb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("reading a zstd artifact needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return raw
+
+
+def put_bytes(path: str, data: bytes, content_type: Optional[str] = None) -> Artifact:
+    """Store ``data`` under ``path``. Identical content is kept once, however many paths refer to it."""
+    codec = _codec()
+    # Small payloads are not worth a codec header and a decode on read
+    if len(data) < int(os.getenv("ARTIFACT_COMPRESS_MIN_BYTES", "1024")):
+        codec = "none"
+    digest = hashlib.sha256(data).hexdigest()
+    stored = _compress(data, codec)
+    art = Artifact(
+        path, digest, codec, len(data), len(stored),
+        content_type or mimetypes.guess_type(path)[0] or "application/octet-stream",
+    )
+    store = backend()
+    store.write_blob(art.blob, stored)
+    store.write_ref(path, art._asdict())
+    return art
+
+
+def put_json(path: str, data: Any) -> Artifact:
+    return put_bytes(path, orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS), "application/json")
+
+
+def put_text(path: str, text: str, content_type: Optional[str] = None) -> Artifact:
+    return put_bytes(path, text.encode("utf-8"), content_type)
 
 
 def url_for(path: str) -> str:
@@ -21,3 +210,55 @@ def url_for(path: str) -> str:
     return f"/artifacts/{path}"
 
 
+def stat(path: str) -> Optional[Artifact]:
+    ref = backend().read_ref(path)
+    return Artifact(**ref) if ref is not None else None
+
+
+def open_raw(art: Artifact) -> BinaryIO:
+    """The stored (possibly compressed) bytes of ``art``."""
+    return backend().open_blob(art.blob)
+
+
+def open_decoded(art: Artifact) -> BinaryIO:
+    return _decoder(open_raw(art), art.codec)
+
+
+def read_range(f: BinaryIO, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+    """Chunks of ``f`` from ``start``; decoded streams cannot seek, so leading bytes are read and dropped."""
+    with f:
+        if start:
+            if f.seekable():
+                f.seek(start)
+            else:
+                skip = start
+                while skip:
+                    got = len(f.read(min(skip, READ_CHUNK_BYTES)))
+                    if not got:
+                        return
+                    skip -= got
+        left = length
+        while left is None or left > 0:
+            chunk = f.read(READ_CHUNK_BYTES if left is None else min(left, READ_CHUNK_BYTES))
+            if not chunk:
+                return
+            if left is not None:
+                left -= len(chunk)
+            yield chunk
+
+
+def get_bytes(path: str) -> Optional[bytes]:
+    art = stat(path)
+    if art is not None:
+        with open_decoded(art) as f:
+            return f.read()
+    legacy = backend().open_legacy(path)
+    if legacy is None:
+        return None
+    with legacy:
+        return legacy.read()
+
+
+def get_json(path: str, default: Any = None) -> Any:
+    data = get_bytes(path)
+    return default if data is None else orjson.loads(data)
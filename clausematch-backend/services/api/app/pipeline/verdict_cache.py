@@ -0,0 +1,20 @@
+import os
+from typing import Optional
+
+# make_key is re-exported for semantic.py
+from clausematch_engine.verdict_cache import VerdictCache, make_key  # noqa: F401
+
+
+_CACHE: Optional[VerdictCache] = None
+
+
+def get_cache() -> VerdictCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = VerdictCache(
+            os.getenv("VERDICT_CACHE_PATH", "/tmp/clausematch/verdicts.sqlite") or None,
+            max_items=int(os.getenv("VERDICT_CACHE_MAX_ITEMS", "10000")),
+            max_disk_items=int(os.getenv("VERDICT_CACHE_MAX_DISK_ITEMS", "200000")),
+            ttl_s=float(os.getenv("VERDICT_CACHE_TTL_S", str(7 * 86400))),
+        )
+    return _CACHE
@@ -0,0 +1,115 @@
+import mimetypes
+import os
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from ..pipeline import storage
+
+
+class Unsatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) of a single ``bytes=`` range; None serves the whole body.
+
+    Multiple ranges and malformed headers are ignored, as RFC 9110 allows; raises
+    Unsatisfiable when the range lies past the end.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise Unsatisfiable(header)
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except Unsatisfiable:
+        raise
+    except ValueError:
+        return None
+    if start >= size:
+        raise Unsatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _accepts(request: Request, coding: str) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() != coding:
+            continue
+        q = params.strip()
+        if not q.startswith("q="):
+            return True
+        try:
+            return float(q[2:] or 0) > 0
+        except ValueError:
+            # A malformed q-value is ignored, as if there were none
+            return True
+    return False
+
+
+def serve(path: str, request: Request) -> Response:
+    """An artifact as a streamed response. Range requests are answered with 206.
+
+    Compressed artifacts go out as stored, with ``Content-Encoding``, to clients that accept
+    the codec (ranges then address the encoded bytes); other clients get the decoded body.
+    """
+    try:
+        art = storage.stat(path)
+        legacy = storage.backend().open_legacy(path) if art is None else None
+    except ValueError:
+        art = legacy = None
+    headers: Dict[str, str] = {"Accept-Ranges": "bytes"}
+    if art is not None:
+        media_type = art.content_type
+        etag = art.digest
+        if art.codec == "none":
+            opener: Callable[[], BinaryIO] = lambda: storage.open_raw(art)
+            size = art.size
+        elif _accepts(request, art.codec):
+            opener, size = (lambda: storage.open_raw(art)), art.stored_size
+            headers["Content-Encoding"] = art.codec
+            etag = f"{art.digest}-{art.codec}"
+        else:
+            opener, size = (lambda: storage.open_decoded(art)), art.size
+        if art.codec != "none":
+            headers["Vary"] = "Accept-Encoding"
+        headers["ETag"] = f'"{etag}"'
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+    elif legacy is not None:
+        # Written before content addressing: a plain file under the artifact root
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        size = os.fstat(legacy.fileno()).st_size
+        opener = lambda: legacy
+    else:
+        return Response(status_code=404)
+
+    try:
+        span = parse_range(request.headers.get("range"), size)
+    except Unsatisfiable:
+        if legacy is not None:
+            legacy.close()
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+    start, end = span if span is not None else (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status = 200
+    if span is not None:
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if request.method == "HEAD":
+        if legacy is not None:
+            legacy.close()
+        return Response(status_code=status, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        storage.read_range(opener(), start, end - start + 1), status_code=status, headers=headers, media_type=media_type
+    )
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from ..pipeline.records import json_default
+
+
+TERMINAL = {"COMPLETED", "FAILED"}
+
+# (id, event, JSON data)
+Event = Tuple[int, str, str]
+
+
+class _Stream:
+    __slots__ = ("events", "closed", "waiters")
+
+    def __init__(self):
+        self.events: List[Event] = []
+        self.closed = False
+        self.waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+
+class JobEvents:
+    """Per-job event log with push delivery to async subscribers.
+
+    ``publish`` may be called from any thread; it appends the event and wakes waiting
+    subscribers through their loop, so an idle subscriber costs nothing until the next event.
+    Event IDs count up from 1 per job, so a client can resume after the last ID it saw.
+    Logs of the ``max_jobs`` most recently started jobs are kept.
+    """
+
+    def __init__(self, max_jobs: int = 64, keepalive_s: float = 15.0):
+        self.max_jobs = max_jobs
+        self.keepalive_s = keepalive_s
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, _Stream]" = OrderedDict()
+
+    def _stream(self, job_id: str) -> _Stream:
+        stream = self._jobs.get(job_id)
+        if stream is None:
+            stream = self._jobs[job_id] = _Stream()
+            while len(self._jobs) > self.max_jobs:
+                _, old = self._jobs.popitem(last=False)
+                old.closed = True
+                self._wake(old)
+        return stream
+
+    @staticmethod
+    def _wake(stream: _Stream) -> None:
+        for loop, ready in stream.waiters:
+            loop.call_soon_threadsafe(ready.set)
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any], final: bool = False) -> None:
+        payload = json.dumps(data, ensure_ascii=False, default=json_default)
+        with self._lock:
+            stream = self._stream(job_id)
+            if stream.closed:
+                return
+            stream.events.append((len(stream.events) + 1, event, payload))
+            stream.closed = final
+            self._wake(stream)
+
+    def known(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    async def follow(self, job_id: str, after: int = 0) -> AsyncIterator[Optional[Event]]:
+        """Events with ID > ``after``, then new ones as they arrive, until the job's final event.
+
+        Yields None after ``keepalive_s`` without events.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            ready = asyncio.Event()
+            waiter = (loop, ready)
+            with self._lock:
+                stream = self._jobs.get(job_id)
+                if stream is None:
+                    return
+                batch = stream.events[after:]
+                closed = stream.closed
+                if not batch and not closed:
+                    stream.waiters.add(waiter)
+            if batch:
+                for ev in batch:
+                    yield ev
+                after = batch[-1][0]
+                continue
+            if closed:
+                return
+            try:
+                await asyncio.wait_for(ready.wait(), self.keepalive_s)
+            except asyncio.TimeoutError:
+                yield None
+            finally:
+                with self._lock:
+                    stream.waiters.discard(waiter)
+
+
+EVENTS = JobEvents(
+    max_jobs=int(os.getenv("JOB_EVENTS_MAX_JOBS", "64")),
+    keepalive_s=float(os.getenv("JOB_EVENTS_KEEPALIVE_S", "15")),
+)
+
+
+def sse(event: Optional[Event]) -> bytes:
+    if event is None:
+        return b": keepalive\n\n"
+    event_id, name, data = event
+    return f"id: {event_id}\nevent: {name}\ndata: {data}\n\n".encode("utf-8")
@@ -1,46 +1,237 @@
-from ..pipeline import segment, align, rules, semantic, rag_client, ranker, storage, renderer_client, governance
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
 
-JOBS = {}
+from clausematch_engine import metrics
+from clausematch_engine.graph import Graph, Stage, parse_executors
+from clausematch_engine.store import BoundedStore
+from orchestrator.worker import JobWorker, report_progress
 
-def enqueue(job_id, en_text, de_text):
-    JOBS[job_id] = {"status": "RUNNING"}
+from ..pipeline import segment, align, rules, cascade, semantic, rag_client, ranker, revision, storage, renderer_client, governance
+from ..pipeline.ingestion import load_document
+from ..pipeline.records import json_default
+from .events import EVENTS, TERMINAL
+
+# Job records, including findings; bounded by JOB_STORE_MAX_ITEMS / _MAX_BYTES / _TTL_S,
+# with evicted jobs spilled to JOB_STORE_SPILL_PATH when set
+JOBS = BoundedStore.from_env("JOB_STORE", json_default=json_default)
+_WORKER = None
+_WORKER_LOCK = threading.Lock()
+
+def _queue_state():
+    # Read at scrape time; the pool is not started just to report on it
+    stats = _WORKER.stats() if _WORKER is not None else {"queued": 0, "running": 0}
+    return {("queued",): stats["queued"], ("running",): stats["running"]}
+
+JOBS_TOTAL = metrics.REGISTRY.add(metrics.Counter("clausematch_jobs_total", "Finished jobs by status.", ("status",)))
+JOB_SECONDS = metrics.REGISTRY.add(metrics.Histogram("clausematch_job_duration_seconds", "Time from start to finish per job."))
+JOBS_IN_FLIGHT = metrics.REGISTRY.add(metrics.Gauge("clausematch_jobs_in_flight", "Jobs queued or running on the pool.", ("state",), fn=_queue_state))
+LLM_CALLS = metrics.REGISTRY.add(metrics.Counter("clausematch_llm_calls_total", "LLM verdicts by outcome (ok, error, cached, skipped).", ("outcome",)))
+
+def _no_progress(event, data):
+    pass
+
+# Stage functions take the inputs and results named in PIPELINE, in that order
+def _segment(en_text, de_text, segmented, emit):
+    emit("stage", {"stage": "align"})
+    if segmented:
+        return list(en_text), list(de_text)
+    # Both aligners list() their inputs anyway; materializing here times segmentation apart
+    en_clauses = list(segment.iter_segments([en_text] if isinstance(en_text, str) else en_text, lang="en"))
+    de_clauses = list(segment.iter_segments([de_text] if isinstance(de_text, str) else de_text, lang="de"))
+    return en_clauses, de_clauses
+
+def _align(clauses, segment_facts):
+    if os.getenv("ALIGN_STRATEGY", "dp") == "embed":
+        return semantic.embed_align(*clauses)
+    pairs = align.anchor_align(*clauses, *(segment_facts or (None, None)))
+    # Nothing anchored: fall back to matching by content, as before the streaming pipeline
+    return pairs or semantic.embed_align(*clauses)
+
+def _revision(pairs, job_id, previous_job_id):
+    # {position: findings} for pairs whose text is unchanged since the previous revision
+    digests = revision.save_pairs(job_id, pairs)
+    previous = revision.previous_findings(previous_job_id)
+    return {i: previous[d] for i, d in enumerate(digests) if d in previous}
+
+def _pending(pairs, carried, emit):
+    # (position, key, en, de) for every pair still to check
+    todo = [(i, *pair) for i, pair in enumerate(pairs) if i not in carried]
+    emit("stage", {"stage": "rules", "clauses": len(pairs), "carried_over": len(carried)})
+    return todo
+
+def _rules(item, cfg):
+    _, _, a_txt, b_txt = item
+    fa = rules.extract_facts(a_txt, lang="en")
+    fb = rules.extract_facts(b_txt, lang="de")
+    diffs = rules.compare_facts(fa, fb)
+    return fa, fb, diffs, cascade.triage(a_txt, b_txt, fa, fb, diffs, cfg)
+
+def _rag(todo):
+    # Every pending clause in one batched lookup
+    return rag_client.topk_many([a_txt for _, _, a_txt, _ in todo], lang="en", k=3)
+
+def _llm(todo, checked, llm_stats, emit):
+    # Only uncertain pairs reach the LLM; fan them out at once, results in clause order
+    escalate = [n for n, (_, _, _, (tier, _)) in enumerate(checked) if tier == "llm"]
+    emit("stage", {"stage": "llm", "clauses": len(escalate)})
+    sems = [[] for _ in todo]
+    verdicts = semantic.llm_check_many(
+        [(todo[n][2], todo[n][3], checked[n][0], checked[n][1]) for n in escalate], stats=llm_stats
+    )
+    for n, sem in zip(escalate, verdicts):
+        sems[n] = sem
+    return sems
+
+def _rank(pairs, carried, todo, checked, sems, contexts, emit):
+    emit("stage", {"stage": "rank"})
+    total = len(pairs)
+    by_position = {i: revision.carry_over(pairs[i][0], found) for i, found in carried.items()}
+    for i in sorted(by_position):
+        for f in by_position[i]:
+            emit("finding", {"position": i, "finding": f})
+    done = len(by_position)
+    emit("progress", {"done": done, "total": total})
+    for (i, key, _, _), (_, _, diffs, _), sem, ctx in zip(todo, checked, sems, contexts):
+        merged = rules.merge_findings(key, diffs, sem, ctx)
+        for f in merged:
+            f.risk, f.confidence = ranker.score(f)
+        by_position[i] = merged
+        for f in merged:
+            emit("finding", {"position": i, "finding": f})
+        done += 1
+        emit("progress", {"done": done, "total": total})
+    return [f for i in range(total) for f in by_position[i]]
+
+def _summary(findings, checked, carried, todo, cfg, previous_job_id, emit):
+    summary = rules.summarize(findings)
+    summary["cascade"] = cascade.tier_report([decision for _, _, _, decision in checked], cfg)
+    if previous_job_id:
+        summary["revision"] = {"previous_job_id": previous_job_id, "carried_over": len(carried), "recomputed": len(todo)}
+    emit("stage", {"stage": "report"})
+    return summary
+
+def _store(job_id, findings, summary):
+    storage.put_json(f"{job_id}/findings.json", [f.to_dict() for f in findings])
+    storage.put_json(f"{job_id}/summary.json", summary)
+
+# Rules and RAG lookups both map over the pending clauses and run side by side; the report
+# writes (store, render, governance) run side by side after ranking. PIPELINE_EXECUTORS
+# overrides a stage's executor, e.g. "rules=process" to spread fact extraction over cores.
+PIPELINE = Graph(
+    [
+        Stage("segment", _segment, ("en", "de", "segmented", "emit")),
+        Stage("align", _align, ("segment", "segment_facts")),
+        Stage("revision", _revision, ("align", "job_id", "previous_job_id")),
+        Stage("pending", _pending, ("align", "revision", "emit")),
+        Stage("rules", _rules, ("pending", "cascade"), per_item=True),
+        Stage("rag", _rag, ("pending",), executor="thread"),
+        Stage("llm", _llm, ("pending", "rules", "llm_stats", "emit")),
+        Stage("rank", _rank, ("align", "revision", "pending", "rules", "llm", "rag", "emit")),
+        Stage("summary", _summary, ("rank", "rules", "revision", "pending", "cascade", "previous_job_id", "emit")),
+        Stage("store", _store, ("job_id", "rank", "summary"), executor="thread"),
+        Stage("render", renderer_client.render_pdf, ("job_id", "rank", "summary"), executor="thread"),
+        Stage("governance", governance.log_run, ("job_id", "summary", "rank"), executor="thread"),
+    ],
+    inputs=("job_id", "en", "de", "segmented", "segment_facts", "previous_job_id", "cascade", "llm_stats", "emit"),
+    executors=parse_executors(os.getenv("PIPELINE_EXECUTORS", "")),
+)
+
+def run_pipeline(job_id, en_text, de_text, segmented=False, segment_facts=None, previous_job_id=None, progress=None, spans=None):
+    # en_text / de_text: a string, or an iterable of text chunks streamed from disk;
+    # with segmented=True, iterables of ready-made segments (e.g. spreadsheet cells).
+    # segment_facts: optional (en_facts, de_facts), one extract_facts dict per segment.
+    # previous_job_id: an earlier revision; pairs whose text is unchanged keep its findings
+    # progress(event, data): called with "stage", "progress" and ranked "finding" events as they happen
+    # spans: a metrics.Spans to add stage timings to; they are returned as "timings"
+    spans = spans or metrics.Spans()
+    llm_stats = {}
     try:
-        en_clauses = segment.segment(en_text, lang="en")
-        de_clauses = segment.segment(de_text, lang="de")
-        pairs = align.anchor_align(en_clauses, de_clauses)
-        if not pairs:
-            pairs = semantic.embed_align(en_clauses, de_clauses)
-
-        findings = []
-        for key, a_txt, b_txt in pairs:
-            fa = rules.extract_facts(a_txt, lang="en")
-            fb = rules.extract_facts(b_txt, lang="de")
-            diffs = rules.compare_facts(fa, fb)
-            sem = semantic.llm_check(a_txt, b_txt, fa, fb)
-            contexts = rag_client.topk(a_txt, lang="en", k=3)
-            merged = rules.merge_findings(key, diffs, sem, contexts)
-            if isinstance(merged, list):
-                for f in merged:
-                    f.update(ranker.score(f))
-                findings.extend(merged)
-            else:
-                merged.update(ranker.score(merged))
-                findings.append(merged)
-
-        summary = rules.summarize(findings)
-        storage.put_json(f"{job_id}/findings.json", findings)
-        storage.put_json(f"{job_id}/summary.json", summary)
-        pdf_url = renderer_client.render_pdf(job_id, findings, summary)
-        governance.log_run(job_id, summary, findings)
-
-        JOBS[job_id] = {
+        out = PIPELINE.run(
+            {
+                "job_id": job_id, "en": en_text, "de": de_text, "segmented": segmented, "segment_facts": segment_facts,
+                "previous_job_id": previous_job_id, "cascade": cascade.CascadeConfig.from_env(),
+                "llm_stats": llm_stats, "emit": progress or _no_progress,
+            },
+            span=spans.stage,
+        )
+        return {
             "status": "COMPLETED",
-            "summary": summary,
-            "findings": findings,
-            "artifacts": {"pdf": pdf_url},
+            "summary": out["summary"],
+            "findings": out["rank"],
+            "artifacts": {"pdf": out["render"]},
+            "timings": spans.as_dict(),
+            "llm": llm_stats,
         }
     except Exception as exc:
-        JOBS[job_id] = {"status": "FAILED", "error": str(exc)}
+        return {"status": "FAILED", "error": str(exc), "failed_stage": spans.failed, "timings": spans.as_dict(), "llm": llm_stats}
+
+def enqueue(job_id, en_text, de_text, previous_job_id=None):
+    # Inline execution in the calling thread
+    _update(job_id, {"status": "RUNNING", "started_at": time.time()})
+    progress = partial(EVENTS.publish, job_id)
+    _update(job_id, run_pipeline(job_id, en_text, de_text, previous_job_id=previous_job_id, progress=progress))
+
+def run_job(job_id, en_path, de_path, previous_job_id=None):
+    # Executed in a worker process: parsing is CPU-bound, so it runs there too
+    progress = partial(report_progress, job_id)
+    spans = metrics.Spans()
+    try:
+        progress("stage", {"stage": "parse"})
+        # Parsed documents are cached by content hash, so a re-uploaded master skips parsing
+        try:
+            with spans.stage("parse"):
+                en_doc = load_document(Path(en_path), "en")
+                de_doc = load_document(Path(de_path), "de")
+        except Exception as exc:
+            return {"status": "FAILED", "error": str(exc), "failed_stage": spans.failed, "timings": spans.as_dict()}
+        return run_pipeline(
+            job_id, en_doc["segments"], de_doc["segments"], segmented=True,
+            segment_facts=(en_doc["facts"], de_doc["facts"]),
+            previous_job_id=previous_job_id, progress=progress, spans=spans,
+        )
+    finally:
+        for p in (en_path, de_path):
+            Path(p).unlink(missing_ok=True)
+
+def _observe(record):
+    # Stage timings travel back from the pool process with the result and are recorded here,
+    # where /metrics is served
+    metrics.observe(record.get("timings") or {}, record.get("failed_stage"))
+    for outcome, n in (record.get("llm") or {}).items():
+        LLM_CALLS.inc(n, outcome=outcome)
+    JOBS_TOTAL.inc(status=record["status"])
+    if "started_at" in record:
+        JOB_SECONDS.observe(record["finished_at"] - record["started_at"])
+
+def _update(job_id, record):
+    prev = JOBS.get(job_id, {})
+    merged = {k: v for k, v in prev.items() if k.endswith("_at")}
+    merged.update(record)
+    if record.get("status") in {"COMPLETED", "FAILED"}:
+        merged["finished_at"] = time.time()
+        _observe(merged)
+    JOBS.put(job_id, merged)
+    # Subscribers get every state change; a final one carries the summary, not the findings
+    status = merged.get("status")
+    event = {k: v for k, v in merged.items() if k not in {"findings", "artifacts"}}
+    EVENTS.publish(job_id, "status", event, final=status in TERMINAL)
+
+def worker():
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is None:
+            _WORKER = JobWorker(run_job, _update, on_progress=EVENTS.publish)
+        return _WORKER
+
+def submit(job_id, en_path, de_path, previous_job_id=None):
+    """Queue a job on the process pool; raises QueueFull when the backlog is at capacity."""
+    worker().submit(job_id, str(en_path), str(de_path), previous_job_id)
+
+def accepting():
+    return worker().stats()["queued"] < worker().max_queue
 
 def status(job_id):
     return JOBS.get(job_id, {"status": "UNKNOWN"})
@@ -1,5 +1,227 @@
-# Placeholder orchestrator worker; pipeline to be implemented
-if __name__ == "__main__":
-    import time
-    while True:
-        time.sleep(60)
+"""Job worker: a bounded local queue drained onto a process pool.
+
+Used in-process by the API (``orchestrator_client``).
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+
+# Set in pool processes when the worker forwards progress events
+_PROGRESS: Optional["multiprocessing.queues.Queue"] = None
+
+
+def _init_progress(q) -> None:
+    global _PROGRESS
+    _PROGRESS = q
+
+
+def report_progress(job_id: str, event: str, data: Dict[str, Any]) -> None:
+    """From inside a job: hand ``(event, data)`` to the parent's ``on_progress``; no-op otherwise."""
+    if _PROGRESS is not None:
+        _PROGRESS.put((job_id, event, data))
+
+
+def _tracked(fn: Callable[..., Dict[str, Any]], job_id: str, *args: Any) -> Dict[str, Any]:
+    try:
+        return fn(job_id, *args)
+    finally:
+        # End marker: everything this job reported is ahead of it in the queue
+        if _PROGRESS is not None:
+            _PROGRESS.put((job_id, None, None))
+
+
+# How often the progress pump looks for overdue jobs and a new queue
+PUMP_POLL_S = 0.5
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobWorker:
+    """Run ``fn(job_id, *args)`` for submitted jobs on ``workers`` processes.
+
+    At most ``max_queue`` jobs wait beyond the ones running; further submits raise
+    QueueFull. ``on_update(job_id, record)`` is called on every state change
+    (QUEUED, RUNNING, then the dict returned by ``fn`` or a FAILED record).
+
+    With ``on_progress``, events a job sends through ``report_progress`` are delivered to
+    ``on_progress(job_id, event, data)`` on one pump thread, in order, and all of them
+    before the job's final ``on_update``, which the pump then sends too. A failed job is
+    finished at once, without waiting for its events.
+
+    If a pool process dies, the jobs it took down fail and the next job gets a fresh pool.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Dict[str, Any]],
+        on_update: Callable[[str, Dict[str, Any]], None],
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        on_progress: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+    ):
+        self.fn = fn
+        self.on_update = on_update
+        self.on_progress = on_progress
+        self.workers = workers or int(os.getenv("ORCH_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+        self.max_queue = max_queue or int(os.getenv("ORCH_MAX_QUEUE", "16"))
+        self._queue: "queue.Queue[Tuple[str, tuple]]" = queue.Queue(maxsize=self.max_queue)
+        self._slots = threading.Semaphore(self.workers)
+        # spawn: the API process runs threads, which fork does not copy safely
+        self._ctx = multiprocessing.get_context("spawn")
+        self._progress: Optional["multiprocessing.queues.Queue"] = None
+        # Jobs whose events are still being pumped, those whose end marker came before the
+        # result, and results waiting for their marker: job_id -> (started, record, deadline)
+        self._tracking: Set[str] = set()
+        self._ended: Set[str] = set()
+        self._waiting: Dict[str, Tuple[float, Dict[str, Any], float]] = {}
+        self._flush_timeout = float(os.getenv("ORCH_PROGRESS_FLUSH_S", "5"))
+        self._pool = self._new_pool()
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._durations = [60.0]
+        self._running = 0
+        self._thread = threading.Thread(target=self._dispatch, name="job-dispatch", daemon=True)
+        self._thread.start()
+        if on_progress:
+            threading.Thread(target=self._pump, name="job-progress", daemon=True).start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        if self.on_progress:
+            # A process killed mid-put can leave the queue's shared write lock held, which
+            # would silence every later job; each pool gets its own queue
+            self._progress = self._ctx.Queue()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._ctx,
+            initializer=_init_progress if self._progress is not None else None,
+            initargs=(self._progress,) if self._progress is not None else (),
+        )
+
+    def retry_after(self) -> int:
+        with self._lock:
+            avg = sum(self._durations) / len(self._durations)
+        waves = (self._queue.qsize() + self._running) / self.workers
+        return max(1, int(avg * waves))
+
+    def submit(self, job_id: str, *args: Any) -> None:
+        # QUEUED is published before the job is visible to the dispatcher, so it can never
+        # overwrite RUNNING. Only the dispatcher takes from the queue, so a slot seen free
+        # under the lock is still free at put_nowait.
+        with self._submit_lock:
+            full = self._queue.full()
+            if not full:
+                self.on_update(job_id, {"status": "QUEUED", "queued_at": time.time()})
+                self._queue.put_nowait((job_id, args))
+        if full:
+            raise QueueFull(self.retry_after())
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "running": self._running, "queued": self._queue.qsize(), "max_queue": self.max_queue}
+
+    def _dispatch(self) -> None:
+        while True:
+            job_id, args = self._queue.get()
+            # Only take a job off the queue once a process is free, so qsize() is the backlog
+            self._slots.acquire()
+            with self._lock:
+                self._running += 1
+            started = time.time()
+            self.on_update(job_id, {"status": "RUNNING", "started_at": started})
+            if self._progress is not None:
+                with self._lock:
+                    self._tracking.add(job_id)
+            try:
+                fut = self._submit(job_id, args)
+            except BrokenProcessPool:
+                # A process died since the last job; its jobs already failed, this one gets a new pool
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+                try:
+                    fut = self._submit(job_id, args)
+                except Exception as exc:
+                    fut = Future()
+                    fut.set_exception(exc)
+            except Exception as exc:
+                fut = Future()
+                fut.set_exception(exc)
+            fut.add_done_callback(lambda f, j=job_id, t=started: self._done(j, t, f))
+
+    def _submit(self, job_id: str, args: tuple) -> Future:
+        if self._progress is None:
+            return self._pool.submit(self.fn, job_id, *args)
+        return self._pool.submit(_tracked, self.fn, job_id, *args)
+
+    def _pump(self) -> None:
+        while True:
+            try:
+                # Short waits, so the pump moves to a rebuilt pool's queue and sweeps overdue jobs
+                job_id, event, data = self._progress.get(timeout=PUMP_POLL_S)
+            except queue.Empty:
+                self._finish_overdue()
+                continue
+            if event is None:
+                # Every event of the job has been delivered; finish it if its result is in
+                with self._lock:
+                    waiting = self._waiting.pop(job_id, None)
+                    if waiting is None and job_id in self._tracking:
+                        self._ended.add(job_id)
+                    else:
+                        self._tracking.discard(job_id)
+                if waiting is not None:
+                    self._finish(job_id, waiting[0], waiting[1])
+            else:
+                try:
+                    self.on_progress(job_id, event, data)
+                except Exception:
+                    pass
+            self._finish_overdue()
+
+    def _finish_overdue(self) -> None:
+        # The end marker is normally milliseconds behind the result; don't hold a job forever for it
+        now = time.monotonic()
+        with self._lock:
+            overdue = [(j, w) for j, w in self._waiting.items() if w[2] <= now]
+            for job_id, _ in overdue:
+                del self._waiting[job_id]
+                self._tracking.discard(job_id)
+        for job_id, (started, record, _) in overdue:
+            self._finish(job_id, started, record)
+
+    def _done(self, job_id: str, started: float, fut: Future) -> None:
+        # Runs on the executor's management thread, so it must not block: a result still
+        # waiting for its events is handed to the pump, which finishes the job after them
+        try:
+            record = fut.result()
+            failed = False
+        except Exception as exc:
+            record = {"status": "FAILED", "error": str(exc)}
+            failed = True
+        if self._progress is not None:
+            with self._lock:
+                if not failed and job_id not in self._ended:
+                    self._waiting[job_id] = (started, record, time.monotonic() + self._flush_timeout)
+                    return
+                self._ended.discard(job_id)
+                self._tracking.discard(job_id)
+        self._finish(job_id, started, record)
+
+    def _finish(self, job_id: str, started: float, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._running -= 1
+            self._durations = (self._durations + [time.time() - started])[-20:]
+        self._slots.release()
+        self.on_update(job_id, record)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
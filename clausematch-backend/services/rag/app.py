@@ -1,7 +1,114 @@
-from fastapi import FastAPI
+"""Reference clauses and glossary entries for findings, from a local BM25 index (``bm25.py``).
+
+- POST ``/ingest``: JSON ``{"passages": [{"text", "id", "kind", "source", "lang"}]}``, only
+  ``text`` required; appended as one segment.
+- POST ``/ingest/file``: a .txt of reference clauses (one per non-empty line) or a .csv/.tsv
+  glossary (term, definition[, lang] per row).
+- POST ``/topk``: JSON ``{"queries": [...], "k": 3, "lang": "en"}``, every clause of a job in one
+  call; ``{"results": [[passage + score, ...], ...]}`` in query order.
+- POST ``/compact`` merges the segments; GET ``/stats``.
+
+The index lives in ``RAG_INDEX_DIR``; run several workers over the same directory and they
+share its pages.
+"""
+import csv
+import hashlib
+import io
+import os
+from itertools import chain
+from pathlib import PurePath
+from typing import Any, Dict, Iterator, List
+
+from fastapi import Body, FastAPI, File, Form, HTTPException, UploadFile
+
+import bm25
 
 app = FastAPI(title="RAG Service")
+INDEX = bm25.Index(os.getenv("RAG_INDEX_DIR", "rag_index"), max_segments=int(os.getenv("RAG_MAX_SEGMENTS", "16")))
+MAX_K = 50
+MAX_QUERIES = int(os.getenv("RAG_MAX_QUERIES", "10000"))
+KINDS = ("clause", "glossary")
+
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+def _passage(raw: Dict[str, Any], kind: str = "clause", source: str = "") -> Dict[str, str]:
+    text = str(raw.get("text") or "").strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="every passage needs a non-empty text")
+    kind = str(raw.get("kind") or kind)
+    if kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(KINDS)}")
+    source = str(raw.get("source") or source)
+    # Without an id, the content names the passage, so re-ingesting a file gives the same ids
+    pid = str(raw.get("id") or "") or hashlib.sha1(f"{source}\x1f{text}".encode("utf-8")).hexdigest()[:16]
+    return {"id": pid, "text": text, "kind": kind, "source": source, "lang": str(raw.get("lang") or "")}
+
+
+@app.post("/ingest")
+def ingest(payload: Dict[str, Any] = Body(...)):
+    passages = payload.get("passages")
+    if not isinstance(passages, list) or not passages:
+        raise HTTPException(status_code=400, detail="passages must be a non-empty list")
+    if not all(isinstance(p, dict) for p in passages):
+        raise HTTPException(status_code=400, detail="every passage must be an object")
+    out = INDEX.append(_passage(p) for p in passages)
+    return {**out, "passages": INDEX.n_docs}
+
+
+def _file_passages(upload: UploadFile, kind: str, lang: str) -> Iterator[Dict[str, str]]:
+    name = upload.filename or "upload"
+    suffix = PurePath(name).suffix.lower()
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors="replace", newline="")
+    if suffix in (".csv", ".tsv"):
+        for row in csv.reader(text, delimiter="\t" if suffix == ".tsv" else ","):
+            if len(row) >= 2 and row[0].strip() and row[1].strip():
+                row_lang = row[2].strip() if len(row) > 2 else lang
+                yield _passage({"text": f"{row[0].strip()}: {row[1].strip()}", "lang": row_lang}, kind or "glossary", name)
+    elif suffix in (".txt", ""):
+        for line in text:
+            if line.strip():
+                yield _passage({"text": line, "lang": lang}, kind or "clause", name)
+    else:
+        raise HTTPException(status_code=400, detail="expected a .txt, .csv or .tsv file")
+
+
+@app.post("/ingest/file")
+def ingest_file(file: UploadFile = File(...), kind: str = Form(""), lang: str = Form("")):
+    # kind defaults to glossary for .csv/.tsv and clause for .txt; lang applies to rows without one
+    passages = _file_passages(file, kind, lang)
+    first = next(passages, None)
+    if first is None:
+        raise HTTPException(status_code=400, detail="no passages in file")
+    out = INDEX.append(chain([first], passages))
+    return {**out, "passages": INDEX.n_docs}
+
+
+@app.post("/topk")
+def topk(payload: Dict[str, Any] = Body(...)):
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        raise HTTPException(status_code=400, detail="queries must be a list of strings")
+    if len(queries) > MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_QUERIES} queries per call")
+    try:
+        k = int(payload.get("k", 3))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="k must be an integer")
+    if not 1 <= k <= MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_K}")
+    results: List[List[Dict[str, Any]]] = INDEX.search(queries, k=k, lang=str(payload.get("lang") or ""))
+    return {"results": results}
+
+
+@app.post("/compact")
+def compact():
+    return INDEX.compact()
+
+
+@app.get("/stats")
+def stats():
+    return INDEX.stats()
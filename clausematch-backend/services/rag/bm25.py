@@ -0,0 +1,435 @@
+"""On-disk BM25 index over reference clauses and glossary entries.
+
+The index is a directory of immutable segments plus ``manifest.json`` naming the live ones.
+``append`` writes a new segment and swaps the manifest atomically; past ``max_segments``
+they are merged into one (``compact``). A segment is a set of .npy arrays opened with
+``mmap_mode="r"``: opening the index reads headers only, and every worker process shares the
+same page cache. Other processes pick up appends on their next search.
+
+Segment files:
+
+- ``terms.npy``: sorted uint64 term hashes; ``ptr.npy``: int64 start of each term's postings,
+  plus the end;
+- ``docs.npy``: uint32 passage numbers and ``tfs.npy``: uint16 term counts, grouped by term;
+  ``maxtf.npy`` / ``minlen.npy``: each term's largest count and shortest passage, which bound
+  its score for query-time pruning;
+- ``lens.npy``: uint32 tokens per passage; ``langs.npy``: uint8 index into ``meta.json`` langs;
+- ``passages.bin`` / ``offsets.npy``: the passages as JSON, read only for hits.
+
+Terms are stored as 64-bit BLAKE2b hashes, so a query needs no vocabulary, only
+``searchsorted``. Scores use the statistics of the whole index (N, average length, document
+frequency summed over segments), so they do not depend on how passages fell into segments.
+"""
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import threading
+import uuid
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+K1 = 1.2
+B = 0.75
+MANIFEST = "manifest.json"
+# Letters only: amounts and dates differ per clause and say nothing about which reference applies
+_word_re = re.compile(r"[^\W\d_]{2,}")
+STOPWORDS = frozenset(
+    """
+    an and any are as at be been by for from has have if in is it its may must no not of on or
+    shall such that the their this to under was were which will with without
+    am auf aus bei das dem den der des die ein eine einem einen einer eines für im ist mit nach
+    nicht oder sich sind über und unter vom von wird werden zu zum zur
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _word_re.findall(text.casefold()) if t not in STOPWORDS]
+
+
+@lru_cache(maxsize=1 << 16)
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _load(path: Path) -> np.ndarray:
+    # A plain ndarray over the mapping: slicing np.memmap objects costs tens of microseconds each.
+    # np.memmap cannot map a zero-length array; those are read normally.
+    try:
+        return np.asarray(np.load(path, mmap_mode="r"))
+    except ValueError:
+        return np.load(path)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def _write_postings(path: Path, hashes: np.ndarray, docs: np.ndarray, tfs: np.ndarray, lens: np.ndarray) -> None:
+    # hashes/docs/tfs: one entry per (term, passage); grouped here by term, passages ascending
+    terms, inv = np.unique(hashes, return_inverse=True)
+    order = np.lexsort((docs, inv))
+    ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(inv, minlength=len(terms)), out=ptr[1:])
+    docs = docs[order].astype(np.uint32)
+    tfs = np.minimum(tfs[order], 0xFFFF).astype(np.uint16)
+    np.save(path / "terms.npy", terms.astype(np.uint64))
+    np.save(path / "ptr.npy", ptr)
+    np.save(path / "docs.npy", docs)
+    np.save(path / "tfs.npy", tfs)
+    # Per term, the largest count and the shortest passage: a bound on the term's score in any passage
+    starts = ptr[:-1]
+    np.save(path / "maxtf.npy", np.maximum.reduceat(tfs, starts) if len(terms) else tfs)
+    np.save(path / "minlen.npy", np.minimum.reduceat(lens[docs], starts).astype(np.uint32) if len(terms) else docs)
+
+
+def write_segment(path: Path, passages: Iterable[Dict[str, Any]]) -> int:
+    """Write ``passages`` (dicts with at least ``text``) as a segment at ``path``; returns the count."""
+    path.mkdir(parents=True)
+    vocab: Dict[str, int] = {}
+    term_ids, docs, tfs, lens = array("I"), array("I"), array("I"), array("I")
+    langs: Dict[str, int] = {"": 0}
+    lang_ids = array("B")
+    offsets = array("q", [0])
+    with open(path / "passages.bin", "wb") as out:
+        for n, passage in enumerate(passages):
+            tokens = tokenize(passage["text"])
+            lens.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                docs.append(n)
+                tfs.append(count)
+            lang_ids.append(langs.setdefault(passage.get("lang") or "", len(langs)))
+            blob = json.dumps(passage, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            out.write(blob)
+            offsets.append(offsets[-1] + len(blob))
+    hashes = np.fromiter((term_hash(t) for t in vocab), dtype=np.uint64, count=len(vocab))
+    lens_arr = np.frombuffer(lens, dtype=np.uint32)
+    _write_postings(
+        path, hashes[np.frombuffer(term_ids, dtype=np.uint32)],
+        np.frombuffer(docs, dtype=np.uint32), np.frombuffer(tfs, dtype=np.uint32), lens_arr,
+    )
+    np.save(path / "lens.npy", lens_arr)
+    np.save(path / "langs.npy", np.frombuffer(lang_ids, dtype=np.uint8))
+    np.save(path / "offsets.npy", np.frombuffer(offsets, dtype=np.int64))
+    count = len(lens)
+    _write_json(path / "meta.json", {"passages": count, "tokens": int(sum(lens)), "langs": list(langs)})
+    return count
+
+
+class Segment:
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.name
+        meta = json.loads((path / "meta.json").read_text())
+        self.n_docs: int = meta["passages"]
+        self.n_tokens: int = meta["tokens"]
+        self.lang_names: List[str] = meta["langs"]
+        self.terms = _load(path / "terms.npy")
+        self.ptr = _load(path / "ptr.npy")
+        self.docs = _load(path / "docs.npy")
+        self.tfs = _load(path / "tfs.npy")
+        self.maxtf = _load(path / "maxtf.npy")
+        self.minlen = _load(path / "minlen.npy")
+        self.lens = _load(path / "lens.npy")
+        self.langs = _load(path / "langs.npy")
+        self.offsets = _load(path / "offsets.npy")
+        with open(path / "passages.bin", "rb") as f:
+            self._bin = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._norms: Optional[Tuple[float, np.ndarray]] = None
+        self._starts: Dict[str, np.ndarray] = {}
+
+    def lookup(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(term positions, found mask) for query term hashes."""
+        idx = np.searchsorted(self.terms, hashes)
+        found = idx < len(self.terms)
+        found[found] = self.terms[idx[found]] == hashes[found]
+        return idx, found
+
+    def df(self, idx: np.ndarray, found: np.ndarray) -> np.ndarray:
+        safe = np.where(found, idx, 0)
+        return np.where(found, self.ptr[safe + 1] - self.ptr[safe], 0) if len(self.terms) else np.zeros(len(idx), np.int64)
+
+    def postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        a, b = self.ptr[term], self.ptr[term + 1]
+        return self.docs[a:b], self.tfs[a:b]
+
+    def passage(self, n: int) -> Dict[str, Any]:
+        return json.loads(self._bin[int(self.offsets[n]):int(self.offsets[n + 1])])
+
+    def norms(self, avgdl: float) -> np.ndarray:
+        """K1 * (1 - B + B * length / avgdl) per passage, for the index's current average length."""
+        cached = self._norms
+        if cached is None or cached[0] != avgdl:
+            cached = self._norms = (avgdl, (K1 * (1 - B + B * self.lens / avgdl)).astype(np.float32))
+        return cached[1]
+
+    def accumulator(self, lang: str) -> np.ndarray:
+        """Zeroed scores for a query; with ``lang``, -inf for passages in another language.
+
+        Passages without a language (bilingual glossaries) match every query language.
+        """
+        if not lang:
+            return np.zeros(self.n_docs, dtype=np.float32)
+        start = self._starts.get(lang)
+        if start is None:
+            codes = [i for i, name in enumerate(self.lang_names) if name in ("", lang)]
+            start = self._starts[lang] = np.where(np.isin(self.langs, codes), 0.0, -np.inf).astype(np.float32)
+        return start.copy()
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.path.iterdir())
+
+
+class Index:
+    """The segments under ``root``; safe to share between threads and between processes."""
+
+    def __init__(self, root: str, max_segments: int = 16):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self.segments: List[Segment] = []
+        self._version: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @contextmanager
+    def _writer(self) -> Iterator[Dict[str, Any]]:
+        # One writer across processes; yields the manifest to modify, which is written on exit
+        with open(self.root / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                manifest = self._manifest()
+                yield manifest
+                _write_json(self.root / MANIFEST, manifest)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.refresh()
+
+    def _manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / MANIFEST).read_text())
+        except FileNotFoundError:
+            return {"segments": [], "next": 1}
+
+    def refresh(self) -> None:
+        """Reopen the segment list if another writer (or process) changed the manifest."""
+        with self._lock:
+            for _ in range(3):
+                try:
+                    st = (self.root / MANIFEST).stat()
+                    version = (st.st_mtime_ns, st.st_ino)
+                except FileNotFoundError:
+                    version = None
+                if version == self._version:
+                    return
+                open_segments = {s.name: s for s in self.segments}
+                try:
+                    self.segments = [
+                        open_segments.get(name) or Segment(self.root / name) for name in self._manifest()["segments"]
+                    ]
+                except FileNotFoundError:
+                    # Compacted away between reading the manifest and opening it; read it again
+                    continue
+                self._version = version
+                return
+
+    def append(self, passages: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Index ``passages`` as a new segment; returns its name and passage count."""
+        tmp = self.root / f"tmp-{uuid.uuid4().hex}"
+        try:
+            added = write_segment(tmp, passages)
+            with self._writer() as manifest:
+                name = f"seg-{manifest['next']:06d}"
+                os.replace(tmp, self.root / name)
+                manifest["segments"].append(name)
+                manifest["next"] += 1
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        if len(self.segments) > self.max_segments:
+            self.compact()
+        return {"segment": name, "added": added}
+
+    def compact(self) -> Dict[str, Any]:
+        """Merge every segment into one, in order; returns the new segment's name and size."""
+        self.refresh()
+        segments = list(self.segments)
+        if len(segments) < 2:
+            return {"segment": segments[0].name if segments else None, "passages": self.n_docs}
+        tmp = self.root / f"tmp-{uuid.uuid4().hex}"
+        try:
+            _merge(tmp, segments)
+            with self._writer() as manifest:
+                merged = {s.name for s in segments}
+                name = f"seg-{manifest['next']:06d}"
+                os.replace(tmp, self.root / name)
+                # Keep segments appended while merging, after the merged one
+                manifest["segments"] = [name] + [s for s in manifest["segments"] if s not in merged]
+                manifest["next"] += 1
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        # Processes still mapping the old files keep reading them until they refresh
+        for s in segments:
+            shutil.rmtree(s.path, ignore_errors=True)
+        return {"segment": name, "passages": sum(s.n_docs for s in segments)}
+
+    @property
+    def n_docs(self) -> int:
+        return sum(s.n_docs for s in self.segments)
+
+    def search(self, queries: Sequence[str], k: int = 3, lang: str = "") -> List[List[Dict[str, Any]]]:
+        """Top ``k`` passages per query, best first, each with its BM25 ``score``.
+
+        ``lang`` keeps passages in that language or without one. Repeated queries are scored once.
+        """
+        self.refresh()
+        segments = self.segments
+        n = sum(s.n_docs for s in segments)
+        if not n:
+            return [[] for _ in queries]
+        avgdl = max(sum(s.n_tokens for s in segments) / n, 1.0)
+        seen: Dict[str, List[Dict[str, Any]]] = {}
+        out = []
+        for q in queries:
+            if q not in seen:
+                seen[q] = self._search_one(q, segments, n, avgdl, k, lang)
+            out.append(seen[q])
+        return out
+
+    def _search_one(
+        self, query: str, segments: List[Segment], n: int, avgdl: float, k: int, lang: str
+    ) -> List[Dict[str, Any]]:
+        counts = Counter(tokenize(query))
+        if not counts:
+            return []
+        hashes = np.fromiter((term_hash(t) for t in counts), dtype=np.uint64, count=len(counts))
+        lookups = [s.lookup(hashes) for s in segments]
+        df = sum(s.df(idx, found) for s, (idx, found) in zip(segments, lookups))
+        weights = np.log1p((n - df + 0.5) / (df + 0.5)) * np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        # (score, segment, passage) of each segment's best k
+        candidates: List[Tuple[float, int, int]] = []
+        for si, (seg, (idx, found)) in enumerate(zip(segments, lookups)):
+            if found.any():
+                ids, scores = _top_k(seg, idx, found, weights, avgdl, k, lang)
+                candidates.extend(zip(scores.tolist(), [si] * ids.size, ids.tolist()))
+        candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+        return [{**segments[si].passage(d), "score": round(score, 4)} for score, si, d in candidates[:k]]
+
+    def stats(self) -> Dict[str, Any]:
+        self.refresh()
+        segments = self.segments
+        return {
+            "segments": len(segments),
+            "passages": sum(s.n_docs for s in segments),
+            "terms": sum(len(s.terms) for s in segments),
+            "postings": sum(len(s.docs) for s in segments),
+            "bytes": sum(s.size_bytes() for s in segments),
+        }
+
+
+def _impact(tfs: np.ndarray, norm: np.ndarray, weight: float) -> np.ndarray:
+    # BM25 term score; norm is K1 * (1 - B + B * length / avgdl) of the passage. float32, like the
+    # accumulators: scoring reads them at random, so half the bytes is what makes it faster
+    tf = tfs.astype(np.float32)
+    return np.float32(weight * (K1 + 1)) * tf / (tf + norm)
+
+
+def _top_k(
+    seg: Segment, idx: np.ndarray, found: np.ndarray, weights: np.ndarray, avgdl: float, k: int, lang: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The segment's best ``k`` (passages, scores), exact, with MaxScore pruning.
+
+    Terms are taken rarest first (highest weight) into a dense accumulator. A term adds at most
+    its score at its largest count in its shortest passage, so once the bound of the terms left
+    is below a k-th score already reached, no passage unseen so far can make the top k: the
+    common terms, whose postings span much of the segment, then only score the candidates,
+    found by binary search in their passage-sorted postings. Ties go to the lower passage number.
+    """
+    terms = np.flatnonzero(found)
+    terms = terms[np.argsort(-weights[terms], kind="stable")]
+    # left[j]: the most the terms from j on can add to one passage, with room for float32 rounding
+    maxtf = seg.maxtf[idx[terms]].astype(np.float64)
+    bounds = weights[terms] * (K1 + 1) * maxtf / (maxtf + K1 * (1 - B + B * seg.minlen[idx[terms]] / avgdl))
+    left = np.append(np.cumsum(bounds[::-1])[::-1], 0.0) * (1 + 1e-5)
+    norm = seg.norms(avgdl)
+    # Passages in other languages start at -inf, so they never rise into the best k
+    acc = seg.accumulator(lang)
+    # The best k passages so far and the k-th score; a passage's score only changes when a term touches it
+    best = np.zeros(0, dtype=np.int64)
+    theta = 0.0
+    j = 0
+    while j < len(terms):
+        t = terms[j]
+        docs, tfs = seg.postings(idx[t])
+        # A term lists each passage once, so fancy-index assignment is exact
+        updated = acc[docs] + _impact(tfs, norm[docs], weights[t])
+        acc[docs] = updated
+        j += 1
+        # Only passages now above the k-th score can enter the best k; postings are sorted and unique
+        rising = docs[updated > theta]
+        if rising.size and best.size:
+            pos = np.minimum(np.searchsorted(rising, best), rising.size - 1)
+            best = best[rising[pos] != best]
+        pool = np.concatenate([best, rising])
+        if pool.size >= k:
+            best = pool[np.argpartition(-acc[pool], k - 1)[:k]]
+            theta = float(acc[best].min())
+        else:
+            best = pool
+        if theta > left[j]:
+            break
+    floor = theta - left[j]
+    ids = np.flatnonzero(acc >= floor if floor > 0 else acc > 0)
+    scores = acc[ids]
+    for j in range(j, len(terms)):
+        if scores.size > k:
+            # Candidates that cannot reach the k-th score even with every term left are dropped
+            keep = scores + left[j] >= np.partition(scores, -k)[-k]
+            ids, scores = ids[keep], scores[keep]
+        t = terms[j]
+        docs, tfs = seg.postings(idx[t])
+        pos = np.minimum(np.searchsorted(docs, ids), len(docs) - 1)
+        hit = docs[pos] == ids
+        scores[hit] += _impact(tfs[pos[hit]], norm[ids[hit]], weights[t])
+    top = np.lexsort((ids, -scores))[:k]
+    return ids[top], scores[top]
+
+
+def _merge(path: Path, segments: Sequence[Segment]) -> None:
+    # Postings are rebuilt from (hash, passage, count) triples with passages renumbered in order
+    path.mkdir(parents=True)
+    langs: Dict[str, int] = {"": 0}
+    hashes, docs, tfs, lens, lang_ids, offsets = [], [], [], [], [], [np.zeros(1, dtype=np.int64)]
+    base, byte_base, tokens = 0, 0, 0
+    with open(path / "passages.bin", "wb") as out:
+        for s in segments:
+            hashes.append(np.repeat(np.asarray(s.terms), np.diff(s.ptr)))
+            docs.append(np.asarray(s.docs, dtype=np.uint32) + np.uint32(base))
+            tfs.append(np.asarray(s.tfs))
+            lens.append(np.asarray(s.lens))
+            remap = np.array([langs.setdefault(name, len(langs)) for name in s.lang_names], dtype=np.uint8)
+            lang_ids.append(remap[np.asarray(s.langs)])
+            offsets.append(np.asarray(s.offsets[1:]) + byte_base)
+            with open(s.path / "passages.bin", "rb") as f:
+                shutil.copyfileobj(f, out, 1 << 20)
+            base += s.n_docs
+            byte_base += int(s.offsets[-1])
+            tokens += s.n_tokens
+    all_lens = np.concatenate(lens).astype(np.uint32)
+    _write_postings(path, np.concatenate(hashes), np.concatenate(docs), np.concatenate(tfs), all_lens)
+    np.save(path / "lens.npy", all_lens)
+    np.save(path / "langs.npy", np.concatenate(lang_ids).astype(np.uint8))
+    np.save(path / "offsets.npy", np.concatenate(offsets).astype(np.int64))
+    _write_json(path / "meta.json", {"passages": base, "tokens": tokens, "langs": list(langs)})
@@ -0,0 +1,63 @@
+"""Offline stand-in for the watsonx.ai text generation API.
+
+Point the API at it with ``WML_API_URL=http://localhost:8500`` and
+``WML_IAM_URL=http://localhost:8500/identity/token`` (any ``WML_API_KEY`` /
+``WML_PROJECT_ID`` value works). Verdicts are derived from the digits found on
+each side of the prompt, so they are deterministic and order can be checked.
+"""
+import asyncio
+import json
+import os
+import re
+
+from fastapi import FastAPI, Form, Request
+
+app = FastAPI(title="watsonx Stub")
+
+LATENCY_S = float(os.getenv("WML_STUB_LATENCY_MS", "200")) / 1000.0
+_input_re = re.compile(r"Input: EN: (.*)\nDE: (.*)\n\nOutput:", re.S)
+_digits_re = re.compile(r"\d+")
+STATS = {"requests": 0, "in_flight": 0, "peak_in_flight": 0}
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+def stats():
+    return STATS
+
+
+@app.post("/identity/token")
+def token(grant_type: str = Form(""), apikey: str = Form("")):
+    return {"access_token": "stub-token", "expires_in": 3600}
+
+
+def _verdict(prompt: str) -> dict:
+    m = _input_re.search(prompt)
+    if not m:
+        return {"status": "REVIEW", "confidence": 0.0, "issues": []}
+    a, b = sorted(_digits_re.findall(m.group(1))), sorted(_digits_re.findall(m.group(2)))
+    if a == b:
+        return {"status": "MATCH", "confidence": 0.9, "issues": []}
+    return {
+        "status": "MISMATCH",
+        "confidence": 0.8,
+        "issues": [{"type": "number", "comment": f"EN {a} vs DE {b}"}],
+    }
+
+
+@app.post("/ml/v1/text/generation")
+async def generation(request: Request):
+    body = await request.json()
+    STATS["requests"] += 1
+    STATS["in_flight"] += 1
+    STATS["peak_in_flight"] = max(STATS["peak_in_flight"], STATS["in_flight"])
+    try:
+        await asyncio.sleep(LATENCY_S)
+        text = json.dumps(_verdict(body.get("input", "")))
+        return {"model_id": body.get("model_id"), "results": [{"generated_text": text, "stop_reason": "eos_token"}]}
+    finally:
+        STATS["in_flight"] -= 1
@@ -0,0 +1,190 @@
+"""Pipelines as a graph of stages, each run on its own executor.
+
+A ``Stage`` names a function and the inputs or stages whose results it takes as positional
+arguments. ``Graph.run`` starts every stage as soon as its dependencies are done, so stages that
+do not depend on each other run at the same time. Executors:
+
+- ``inline``: in the calling thread; cheap steps and anything that emits events in order;
+- ``thread``: the shared thread pool (``ENGINE_THREADS``); lookups and writes that wait on I/O;
+- ``process``: the shared spawned process pool (``ENGINE_PROCESSES``); CPU-bound work. The
+  function and its arguments must pickle, so use module-level functions or ``partial``.
+
+A ``per_item`` stage maps its function over the items of its first dependency, with the other
+dependencies passed to every call, and returns the results in item order. On a pool the items
+go out in chunks; two per-item stages over the same items (say, rules per clause on one
+executor and lookups per clause on another) interleave instead of running one after the other.
+"""
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from itertools import chain
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+EXECUTORS = ("inline", "thread", "process")
+THREADS = int(os.getenv("ENGINE_THREADS", "8"))
+PROCESSES = int(os.getenv("ENGINE_PROCESSES", "0")) or (os.cpu_count() or 1)
+# Pool tasks per worker for a per-item stage when the stage does not fix a chunk size
+CHUNKS_PER_WORKER = 4
+
+_POOLS: Dict[str, Executor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def executor(kind: str) -> Executor:
+    """The shared pool for ``thread`` or ``process`` stages, started on first use."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(kind)
+        if pool is None:
+            if kind == "thread":
+                pool = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix="engine")
+            elif kind == "process":
+                pool = ProcessPoolExecutor(max_workers=PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+                # In a pool process (a job worker), multiprocessing joins the children at exit
+                # before the executor's own exit hook would stop them; shut the pool down first, while
+                # its queues (closed by finalizers of priority 10) can still deliver the stop signal
+                multiprocessing.util.Finalize(pool, pool.shutdown, exitpriority=100)
+            else:
+                raise ValueError(f"no pool for executor {kind!r}")
+            _POOLS[kind] = pool
+        return pool
+
+
+def parse_executors(spec: str) -> Dict[str, str]:
+    """``"rules=process,rag=thread"`` -> {"rules": "process", "rag": "thread"}."""
+    out: Dict[str, str] = {}
+    for part in spec.split(","):
+        name, _, kind = part.strip().partition("=")
+        if name:
+            out[name.strip()] = kind.strip()
+    return out
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    executor: str = "inline"
+    per_item: bool = False
+    # Items per pool task for a per-item stage; 0 spreads them over CHUNKS_PER_WORKER tasks per worker
+    chunk: int = 0
+
+
+def _map_chunk(fn: Callable[..., Any], items: Sequence[Any], rest: Sequence[Any]) -> List[Any]:
+    return [fn(item, *rest) for item in items]
+
+
+class Graph:
+    """Stages over named ``inputs``; ``executors`` overrides a stage's executor by name.
+
+    Raises ValueError for duplicate names, unknown dependencies, unknown executors and cycles.
+    """
+
+    def __init__(self, stages: Iterable[Stage], inputs: Sequence[str] = (), executors: Optional[Dict[str, str]] = None):
+        self.inputs = tuple(inputs)
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages or stage.name in self.inputs:
+                raise ValueError(f"duplicate stage {stage.name!r}")
+            kind = (executors or {}).get(stage.name, stage.executor)
+            if kind not in EXECUTORS:
+                raise ValueError(f"stage {stage.name!r}: unknown executor {kind!r}")
+            if stage.per_item and not stage.deps:
+                raise ValueError(f"stage {stage.name!r}: a per-item stage needs a dependency to map over")
+            self.stages[stage.name] = replace(stage, executor=kind)
+        self.order = self._toposort()
+
+    def _toposort(self) -> List[str]:
+        known = set(self.inputs) | set(self.stages)
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in known:
+                    raise ValueError(f"stage {stage.name!r}: unknown dependency {dep!r}")
+        done = set(self.inputs)
+        order: List[str] = []
+        while len(order) < len(self.stages):
+            ready = [n for n, s in self.stages.items() if n not in done and all(d in done for d in s.deps)]
+            if not ready:
+                raise ValueError("stage dependencies form a cycle: " + ", ".join(n for n in self.stages if n not in done))
+            order.extend(ready)
+            done.update(ready)
+        return order
+
+    def _submit(self, stage: Stage, args: List[Any]) -> List[Future]:
+        pool = executor(stage.executor)
+        if not stage.per_item:
+            return [pool.submit(stage.fn, *args)]
+        items, rest = list(args[0]), args[1:]
+        workers = THREADS if stage.executor == "thread" else PROCESSES
+        size = stage.chunk or max(1, -(-len(items) // (workers * CHUNKS_PER_WORKER)))
+        return [pool.submit(_map_chunk, stage.fn, items[i:i + size], rest) for i in range(0, len(items), size)]
+
+    def run(
+        self, inputs: Dict[str, Any], span: Optional[Callable[[str], ContextManager[Any]]] = None
+    ) -> Dict[str, Any]:
+        """Run every stage; returns the inputs and each stage's result by name.
+
+        ``span(name)`` returns a context manager held open from a stage's start to its end
+        (``metrics.Spans().stage``, ``metrics.timed``). The first stage to raise cancels the
+        stages not yet started and its exception propagates; its span sees the exception.
+        """
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError("missing inputs: " + ", ".join(missing))
+        values = dict(inputs)
+        pending = list(self.order)
+        # stage name -> (open span, futures); per-item stages have one future per chunk
+        active: Dict[str, Tuple[ContextManager[Any], List[Future]]] = {}
+        try:
+            while pending or active:
+                ready = [n for n in pending if all(d in values for d in self.stages[n].deps)]
+                # Pool stages go out first, so they overlap with the inline ones started after them
+                ready.sort(key=lambda n: self.stages[n].executor == "inline")
+                for name in ready:
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    cm = span(name) if span is not None else nullcontext()
+                    cm.__enter__()
+                    args = [values[d] for d in stage.deps]
+                    if stage.executor == "inline":
+                        try:
+                            values[name] = _map_chunk(stage.fn, args[0], args[1:]) if stage.per_item else stage.fn(*args)
+                        except BaseException:
+                            cm.__exit__(*sys.exc_info())
+                            raise
+                        cm.__exit__(None, None, None)
+                    else:
+                        active[name] = (cm, self._submit(stage, args))
+                self._collect(active, values, block=not any(
+                    all(d in values for d in self.stages[n].deps) for n in pending
+                ))
+        except BaseException:
+            for cm, futures in active.values():
+                for f in futures:
+                    f.cancel()
+                cm.__exit__(None, None, None)
+            raise
+        return values
+
+    def _collect(self, active: Dict[str, Tuple[ContextManager[Any], List[Future]]], values: Dict[str, Any], block: bool) -> None:
+        # Store the results of finished pool stages; with block, wait until at least one finishes
+        if block and active:
+            wait([f for _, futures in active.values() for f in futures], return_when=FIRST_COMPLETED)
+        for name, (cm, futures) in list(active.items()):
+            failed = next((f for f in futures if f.done() and not f.cancelled() and f.exception() is not None), None)
+            if failed is not None:
+                del active[name]
+                exc = failed.exception()
+                cm.__exit__(type(exc), exc, exc.__traceback__)
+                raise exc
+            if all(f.done() for f in futures):
+                del active[name]
+                results = [f.result() for f in futures]
+                values[name] = list(chain.from_iterable(results)) if self.stages[name].per_item else results[0]
+                cm.__exit__(None, None, None)
@@ -0,0 +1,98 @@
+"""N-way consistency: every version aligned to one pivot, then a majority vote per clause.
+
+Aligning each version to the pivot takes N - 1 alignments instead of N(N - 1)/2 pairwise ones.
+``rows`` merges those alignments into clause rows with one text per version (pivot first);
+``vote`` compares the facts of a row's texts and names the versions that disagree with the
+majority.
+"""
+import re
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .align import Bead, digit_signature, find_anchors, gale_church
+
+_num_re = re.compile(r"\d+")
+
+
+def align_to_pivot(
+    pivot: Sequence[str],
+    version: Sequence[str],
+    pivot_sigs: Optional[Sequence[Tuple]] = None,
+    version_sigs: Optional[Sequence[Tuple]] = None,
+) -> List[Bead]:
+    """Beads of (pivot indices, version indices), as ``align.align`` computes them."""
+    pivot_sigs = [digit_signature(t) for t in pivot] if pivot_sigs is None else pivot_sigs
+    version_sigs = [digit_signature(t) for t in version] if version_sigs is None else version_sigs
+    return gale_church(
+        [len(t) for t in pivot], [len(t) for t in version], find_anchors(pivot_sigs, version_sigs),
+        en_sigs=pivot_sigs, de_sigs=version_sigs,
+    )
+
+
+def rows(pivot: Sequence[str], versions: Sequence[Tuple[Sequence[str], Sequence[Bead]]]) -> List[List[str]]:
+    """Clause rows over the pivot: [pivot text, text of each version], space-joined.
+
+    ``versions`` are (segments, beads against the pivot). Pivot segments that any version
+    merges into one bead share a row. Segments a version inserts (0-1 beads) go into a row of
+    their own after the row they follow, one per position, shared by all versions inserting
+    there; the pivot's text in it is empty.
+    """
+    n = len(pivot)
+    # joined[i]: pivot segment i continues the row of segment i - 1
+    joined = [False] * n
+    for _, beads in versions:
+        for ii, _ in beads:
+            for i in ii[1:]:
+                joined[i] = True
+    row_of: List[int] = []
+    r = -1
+    for i in range(n):
+        if not joined[i]:
+            r += 1
+        row_of.append(r)
+    width = len(versions) + 1
+    texts: List[List[List[str]]] = [[[] for _ in range(width)] for _ in range(r + 1)]
+    for i, seg in enumerate(pivot):
+        texts[row_of[i]][0].append(seg)
+    # row index -> {version: inserted segments after that row}; -1 is before the first row
+    inserted: Dict[int, Dict[int, List[str]]] = {}
+    for v, (segs, beads) in enumerate(versions, 1):
+        last = -1
+        for ii, jj in beads:
+            if ii:
+                last = row_of[ii[0]]
+                texts[last][v].extend(segs[j] for j in jj)
+            elif jj:
+                inserted.setdefault(last, {}).setdefault(v, []).extend(segs[j] for j in jj)
+    out: List[List[str]] = []
+    for k in range(-1, len(texts)):
+        if k >= 0:
+            out.append([" ".join(t) for t in texts[k]])
+        if k in inserted:
+            row = [""] * width
+            for v, segs in inserted[k].items():
+                row[v] = " ".join(segs)
+            out.append(row)
+    return out
+
+
+def fact_key(text: str) -> Tuple:
+    # Whether the version has the clause at all, and its numbers as values ("06" == "6");
+    # thousands and decimal separators split the same digit runs in every locale
+    return bool(text.strip()), tuple(sorted(int(d) for d in _num_re.findall(text)))
+
+
+def vote(keys: Sequence[Hashable]) -> Tuple[str, List[int]]:
+    """(status, outliers) for one row's per-version keys.
+
+    OK when all agree; MISMATCH when more than half agree, with the others as outliers; REVIEW
+    when no key has a majority (e.g. two versions that differ), with no outliers named.
+    """
+    if not keys:
+        return "OK", []
+    top, count = Counter(keys).most_common(1)[0]
+    if count == len(keys):
+        return "OK", []
+    if count * 2 > len(keys):
+        return "MISMATCH", [i for i, k in enumerate(keys) if k != top]
+    return "REVIEW", []
@@ -0,0 +1,99 @@
+"""Cursor pagination, filtering and NDJSON streaming for report pairs and job findings.
+
+A cursor is ``"<chunk>:<offset>"``, the position of the last item returned, so a page of a
+Firestore report is read from its pair chunk documents without loading the others. Lists held in
+memory are a single chunk 0, and a bare ``"<offset>"`` is read as chunk 0.
+
+Items are dicts or records (``clausematch_engine.records.Record``); filters read dict keys or
+record attributes, and pages and NDJSON lines carry the dict form.
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .records import Record, as_dict
+
+
+NDJSON = "application/x-ndjson"
+# NDJSON lines are flushed in chunks of about this size
+NDJSON_CHUNK_BYTES = 64 << 10
+
+Position = Tuple[int, int]
+
+
+def value(item: Any, name: str) -> Any:
+    found = getattr(item, name, None) if isinstance(item, Record) else item.get(name)
+    if found is None and name == "status" and not isinstance(item, Record):
+        # Report pairs carry isMismatch; N-way rows and findings carry their own status
+        return "MISMATCH" if item.get("isMismatch") else "OK"
+    return found
+
+
+def parse_filters(**values: Optional[str]) -> Dict[str, Set[str]]:
+    """Comma-separated query values to upper-cased sets; unset filters are left out."""
+    return {
+        name: {v.strip().upper() for v in raw.split(",") if v.strip()}
+        for name, raw in values.items()
+        if raw
+    }
+
+
+def matches(item: Any, filters: Dict[str, Set[str]]) -> bool:
+    return all(str(value(item, name) or "").upper() in wanted for name, wanted in filters.items())
+
+
+def parse_cursor(cursor: Optional[str]) -> Position:
+    """Position to resume from; raises ValueError for a malformed cursor."""
+    if cursor is None:
+        return 0, 0
+    chunk, sep, offset = cursor.partition(":")
+    k, i = (int(chunk), int(offset)) if sep else (0, int(chunk))
+    if k < 0 or i < 0:
+        raise ValueError(cursor)
+    return k, i + 1
+
+
+def positioned(items: List[Any], start: Position) -> Iterator[Tuple[str, Any]]:
+    if start[0] > 0:
+        return
+    for i in range(start[1], len(items)):
+        yield f"0:{i}", items[i]
+
+
+def take_page(
+    entries: Iterable[Tuple[str, Any]], limit: int, filters: Dict[str, Set[str]]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """First ``limit`` matching items as dicts and the cursor after them, or None when nothing follows.
+
+    Stops at the first match past the page, so only the page is ever materialized.
+    """
+    page: List[Dict[str, Any]] = []
+    last = None
+    for pos, item in entries:
+        if not matches(item, filters):
+            continue
+        if len(page) == limit:
+            return page, last
+        page.append(as_dict(item))
+        last = pos
+    return page, None
+
+
+def ndjson_lines(entries: Iterable[Tuple[str, Any]], filters: Dict[str, Set[str]]) -> Iterator[bytes]:
+    buf: List[str] = []
+    size = 0
+    for _, item in entries:
+        if not matches(item, filters):
+            continue
+        line = json.dumps(as_dict(item), ensure_ascii=False) + "\n"
+        buf.append(line)
+        size += len(line)
+        if size >= NDJSON_CHUNK_BYTES:
+            yield "".join(buf).encode("utf-8")
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def wants_ndjson(request: Any) -> bool:
+    # A Starlette/FastAPI request; only its headers are read
+    return NDJSON in request.headers.get("accept", "")
@@ -0,0 +1,54 @@
+"""Slotted records: pipeline values without a per-instance ``__dict__``, turned into dicts only
+at the API and storage boundary.
+
+A subclass lists its fields in ``__slots__``, takes them as constructor arguments of the same
+names, and defines its JSON shape in ``to_dict`` / ``from_dict``. ``Record`` supplies pickling
+(job results cross process pools), equality, ``repr`` and ``replace``.
+"""
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+class Record:
+    __slots__: Tuple[str, ...] = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.__getstate__() == other.__getstate__()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def replace(self: R, **changes: Any) -> R:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state.update(changes)
+        return type(self)(**state)
+
+    def to_dict(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def from_dict(cls: Type[R], d: Dict[str, Any]) -> R:
+        raise NotImplementedError
+
+
+def as_dict(item: Any) -> Any:
+    """JSON form of a record; dicts (e.g. read back from storage) pass through."""
+    return item.to_dict() if isinstance(item, Record) else item
+
+
+def json_default(obj: Any) -> Any:
+    # ``default=`` for json.dumps over values that may hold records
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    return str(obj)
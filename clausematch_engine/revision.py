@@ -0,0 +1,11 @@
+"""Pair digests for revisions: an aligned pair whose texts are unchanged since the previous
+report keeps its findings. Both apps key pairs the same way, so whitespace and Unicode form
+changes (a re-exported PDF, NFKC variants) do not count as edits in either.
+"""
+import hashlib
+
+from .verdict_cache import normalize
+
+
+def pair_digest(a: str, b: str) -> str:
+    return hashlib.sha1(f"{normalize(a)}\x1f{normalize(b)}".encode("utf-8")).hexdigest()
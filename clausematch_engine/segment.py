@@ -0,0 +1,86 @@
+import codecs
+import re
+from typing import AsyncIterator, Iterable, Iterator, List
+
+# A sentence ends at . ? or ! followed by whitespace or the end of the line, so decimals,
+# dotted dates and section numbers ("1,234.56", "24.11.2030", "3.2.1") stay whole. A period
+# right after a one- or two-digit number is an ordinal or list marker ("30. Juni 2025",
+# "1. The Supplier") and does not end one either. The pattern starts with the punctuation
+# itself, so re can skip to the candidates instead of trying every position.
+SENTENCE_END = re.compile(r"[.?!](?<![^\w.,]\d\.)(?<!^\d\.)(?<![^\w.,]\d\d\.)(?<!^\d\d\.)[.?!]*(?=\s|$)")
+
+
+def line_segments(line: str) -> Iterator[str]:
+    for p in SENTENCE_END.split(line):
+        p = p.strip()
+        if p:
+            yield p
+
+
+# Everything str.splitlines() breaks on
+LINE_BREAKS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+class LineBuffer:
+    # Splits a stream of text chunks into complete lines, holding back a trailing partial line.
+    # Only the new chunk is scanned, and the partial line is kept in pieces until it ends, so
+    # long text without line breaks (extracted PDFs) stays linear.
+    def __init__(self) -> None:
+        self.tail: List[str] = []
+
+    def feed(self, chunk: str) -> List[str]:
+        if not chunk:
+            return []
+        lines = chunk.splitlines(keepends=True)
+        rest = lines.pop() if lines[-1][-1] not in LINE_BREAKS else None
+        if lines and self.tail:
+            # The partial line has no breaks in it, so it ends with the chunk's first line
+            lines[0] = "".join(self.tail) + lines[0]
+            self.tail = []
+        if rest is not None:
+            self.tail.append(rest)
+        return lines
+
+    def flush(self) -> List[str]:
+        rest, self.tail = "".join(self.tail), []
+        return [rest] if rest else []
+
+
+def iter_segments(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield segments from a stream of text chunks, buffering only the current line."""
+    lines = LineBuffer()
+    for chunk in chunks:
+        for line in lines.feed(chunk):
+            yield from line_segments(line)
+    for line in lines.flush():
+        yield from line_segments(line)
+
+
+def segment_text(text: str) -> List[str]:
+    if not text:
+        return []
+    return list(iter_segments([text]))
+
+
+async def decode_stream(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> AsyncIterator[str]:
+    # Incremental decode, so multi-byte characters split across chunks survive
+    decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def segment_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Yield segments from an uploaded byte stream without holding the raw bytes or full text."""
+    lines = LineBuffer()
+    async for text in decode_stream(chunks):
+        for line in lines.feed(text):
+            for seg in line_segments(line):
+                yield seg
+    for line in lines.flush():
+        for seg in line_segments(line):
+            yield seg
@@ -0,0 +1,103 @@
+from itertools import chain, count
+from typing import Dict, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+def similarity(a: str, b: str) -> float:
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    # Cheap proxy: ratio of min/avg length penalizes big mismatches
+    min_len = min(len(a), len(b))
+    avg_len = (len(a) + len(b)) / 2.0
+    base = min_len / avg_len
+    # Token overlap proxy
+    sa, sb = set(a.lower().split()), set(b.lower().split())
+    overlap = len(sa & sb) / max(1, len(sa | sb))
+    return max(0.0, min(1.0, 0.5 * base + 0.5 * overlap))
+
+
+_SEP = "\x00"
+
+
+def _token_ids(texts: Sequence[str], vocab: Dict[str, int], fresh: Iterator[int]):
+    """Lowercase and split a whole side in one pass; return (token IDs, tokens per text).
+
+    IDs come from ``vocab`` (shared between sides); new tokens take the next value of ``fresh``.
+    A repeated token still draws a value, so IDs are unique but not dense.
+    """
+    joined = f" {_SEP} ".join(texts)
+    if joined.count(_SEP) == len(texts) - 1:
+        # One C-level lower()/split(); the separator token marks where each text ends
+        toks = joined.lower().split()
+        counts = None
+    else:
+        splits = [t.lower().split() for t in texts]
+        toks = list(chain.from_iterable(splits))
+        counts = np.fromiter(map(len, splits), dtype=np.int64, count=len(texts))
+    ids = np.fromiter(map(vocab.setdefault, toks, fresh), np.int64, len(toks))
+    if counts is None:
+        sep = vocab[_SEP] if len(texts) > 1 else -1
+        is_sep = ids == sep
+        bounds = np.concatenate(([-1], np.flatnonzero(is_sep), [len(ids)]))
+        counts = np.diff(bounds) - 1
+        ids = ids[~is_sep]
+    return ids, counts
+
+
+def _sorted_unique(codes: np.ndarray) -> np.ndarray:
+    codes.sort()
+    if codes.size:
+        codes = codes[np.concatenate(([True], codes[1:] != codes[:-1]))]
+    return codes
+
+
+def similarity_batch(sources: Sequence[str], targets: Sequence[str]) -> np.ndarray:
+    """Vectorized similarity over aligned (sources[i], targets[i]); same values.
+
+    Both sides are tokenized once into a shared vocabulary of integer IDs. Each
+    token becomes a (row, id) code; after de-duplicating per side, a code present
+    on both sides is a shared token, which gives the Jaccard terms for all rows.
+    """
+    n = len(sources)
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+    vocab: Dict[str, int] = {}
+    fresh = count()
+    ids_a, cnt_a = _token_ids(sources, vocab, fresh)
+    ids_b, cnt_b = _token_ids(targets, vocab, fresh)
+    width = int(max(ids_a.max(initial=0), ids_b.max(initial=0))) + 1
+    rows = np.arange(n, dtype=np.int64)
+    codes_a = _sorted_unique(np.repeat(rows, cnt_a) * width + ids_a)
+    codes_b = _sorted_unique(np.repeat(rows, cnt_b) * width + ids_b)
+    size_a = np.bincount(codes_a // width, minlength=n)
+    size_b = np.bincount(codes_b // width, minlength=n)
+    both = np.concatenate([codes_a, codes_b])
+    both.sort()
+    inter = np.bincount(both[1:][both[1:] == both[:-1]] // width, minlength=n)
+    overlap = inter / np.maximum(1, size_a + size_b - inter)
+
+    len_a = np.fromiter(map(len, sources), dtype=np.float64, count=n)
+    len_b = np.fromiter(map(len, targets), dtype=np.float64, count=n)
+    avg_len = (len_a + len_b) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base = np.minimum(len_a, len_b) / avg_len
+    sim = np.clip(0.5 * base + 0.5 * overlap, 0.0, 1.0)
+    sim[(len_a == 0) | (len_b == 0)] = 0.0
+    sim[(len_a == 0) & (len_b == 0)] = 1.0
+    return sim
+
+
+def summarize(similarities: Iterable[float], mismatches: Iterable[bool]) -> Dict:
+    # Report totals over compared pairs: count, flagged mismatches, mean similarity
+    sims = list(similarities)
+    total = len(sims)
+    if total == 0:
+        return {"total": 0, "mismatches": 0, "avgSimilarity": 0.0}
+    return {
+        "total": total,
+        "mismatches": sum(1 for m in mismatches if m),
+        "avgSimilarity": round(sum(sims) / total, 3),
+    }
@@ -0,0 +1,13 @@
+"""Clause comparison primitives shared by the API services and the serverless app.
+
+``segment`` splits text into clauses, ``align`` pairs them (Gale-Church banded around
+anchors), ``similarity`` scores aligned pairs, ``multi`` checks N versions against a pivot by majority
+vote and ``graph`` runs pipeline stages on inline, thread or process executors. ``store`` is the
+bounded LRU the apps keep jobs and reports in, ``metrics`` their Prometheus registry,
+``records`` the slotted base for their pipeline records and ``paging`` their cursor pages and
+NDJSON streams, ``verdict_cache`` their LLM verdict cache and ``revision`` the pair digests a
+revised report reuses findings by. Pure Python plus numpy.
+"""
+from .graph import Graph, Stage
+
+__all__ = ["Graph", "Stage"]
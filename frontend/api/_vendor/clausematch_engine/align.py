@@ -0,0 +1,182 @@
+import bisect
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Gale & Church (1993) bead priors and length-ratio variance
+BEAD_PRIORS = {(1, 1): 0.89, (1, 0): 0.0099 / 2, (0, 1): 0.0099 / 2, (2, 1): 0.089 / 2, (1, 2): 0.089 / 2}
+BEAD_PENALTY = {bead: -math.log(p) for bead, p in BEAD_PRIORS.items()}
+VARIANCE = 6.8
+ANCHOR_BONUS = 3.0
+BAND = 20
+
+Bead = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+_num_re = re.compile(r"\d+")
+
+
+def digit_signature(text: str) -> Tuple:
+    # Numbers, dates and amounts survive translation; digit runs are a cheap stand-in
+    return tuple(sorted(_num_re.findall(text)))
+
+
+def find_anchors(en_sigs: Sequence[Tuple], de_sigs: Sequence[Tuple]) -> List[Tuple[int, int]]:
+    """Monotonic chain of (i, j) where a non-empty fact signature is unique on both sides."""
+    def unique(sigs: Sequence[Tuple]) -> Dict[Tuple, int]:
+        seen: Dict[Tuple, int] = {}
+        for i, s in enumerate(sigs):
+            if s:
+                seen[s] = -1 if s in seen else i
+        return {s: i for s, i in seen.items() if i >= 0}
+
+    de_idx = unique(de_sigs)
+    cands = sorted((i, de_idx[s]) for s, i in unique(en_sigs).items() if s in de_idx)
+    # Longest increasing subsequence on j drops anchors that cross each other
+    tails: List[int] = []
+    tail_at: List[int] = []
+    prev = [-1] * len(cands)
+    for k, (_, j) in enumerate(cands):
+        pos = bisect.bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_at.append(k)
+        else:
+            tails[pos] = j
+            tail_at[pos] = k
+        prev[k] = tail_at[pos - 1] if pos else -1
+    chain: List[Tuple[int, int]] = []
+    k = tail_at[-1] if tail_at else -1
+    while k >= 0:
+        chain.append(cands[k])
+        k = prev[k]
+    return chain[::-1]
+
+
+def _band(n: int, m: int, anchors: List[Tuple[int, int]], width: int) -> List[Tuple[int, int]]:
+    # Rows are source prefixes 0..n; the expected column is interpolated between anchors
+    points = [(0, 0)] + [(i + 1, j + 1) for i, j in anchors] + [(n, m)]
+    ranges: List[Tuple[int, int]] = []
+    seg = 0
+    for i in range(n + 1):
+        while seg < len(points) - 2 and points[seg + 1][0] <= i:
+            seg += 1
+        (i0, j0), (i1, j1) = points[seg], points[seg + 1]
+        # Dense anchors pin the path, so the band only needs to span the gap between them
+        slack = min(width, max(2, (i1 - i0) + (j1 - j0))) + abs((j1 - j0) - (i1 - i0))
+        if i1 == i0:
+            lo, hi = j0 - slack, j1 + slack
+        else:
+            e = j0 + (i - i0) * (j1 - j0) / (i1 - i0)
+            lo, hi = int(e) - slack, int(math.ceil(e)) + slack
+        lo, hi = max(0, lo), min(m, hi)
+        if ranges:
+            # Keep consecutive rows overlapping so a path always exists
+            lo = min(lo, ranges[-1][1])
+            hi = max(hi, ranges[-1][0])
+        ranges.append((lo, hi))
+    ranges[0] = (0, ranges[0][1])
+    ranges[-1] = (ranges[-1][0], m)
+    return ranges
+
+
+@lru_cache(maxsize=1 << 16)
+def _match_cost(l1: int, l2: int, ratio: float) -> float:
+    mean = (l1 + l2 / ratio) / 2.0
+    if mean <= 0:
+        return 0.0
+    delta = (l2 - l1 * ratio) / math.sqrt(mean * VARIANCE)
+    p = math.erfc(abs(delta) / math.sqrt(2.0))
+    return -math.log(max(p, 1e-12))
+
+
+def gale_church(
+    en_lens: Sequence[int],
+    de_lens: Sequence[int],
+    anchors: Optional[List[Tuple[int, int]]] = None,
+    width: int = BAND,
+    en_sigs: Optional[Sequence[Tuple]] = None,
+    de_sigs: Optional[Sequence[Tuple]] = None,
+) -> List[Bead]:
+    """Length-based DP alignment restricted to a band around the anchor path.
+
+    Returns beads as (source indices, target indices) covering both sides in order.
+    Cost is O((n + m) * width); the band is doubled until the end cell is reachable.
+    """
+    n, m = len(en_lens), len(de_lens)
+    ratio = (sum(de_lens) / sum(en_lens)) if sum(en_lens) and sum(de_lens) else 1.0
+    anchors = anchors or []
+    use_sigs = en_sigs is not None and de_sigs is not None
+    moves = [(code, di, dj, BEAD_PENALTY[(di, dj)]) for code, (di, dj) in enumerate(BEAD_PENALTY)]
+    inf = float("inf")
+    while True:
+        ranges = _band(n, m, anchors, width)
+        cost: List[List[float]] = []
+        back: List[bytearray] = []
+        for i in range(n + 1):
+            lo, hi = ranges[i]
+            row = [inf] * (hi - lo + 1)
+            brow = bytearray(hi - lo + 1)
+            for j in range(lo, hi + 1):
+                if i == 0 and j == 0:
+                    row[0] = 0.0
+                    continue
+                best, arg = inf, 0
+                for code, di, dj, penalty in moves:
+                    pi, pj = i - di, j - dj
+                    if pi < 0 or pj < 0:
+                        continue
+                    if di == 0:
+                        if pj < lo:
+                            continue
+                        prev = row[pj - lo]
+                    else:
+                        plo, phi = ranges[pi]
+                        if pj < plo or pj > phi:
+                            continue
+                        prev = cost[pi][pj - plo]
+                    if prev == inf:
+                        continue
+                    l1 = en_lens[pi] + (en_lens[pi + 1] if di == 2 else 0) if di else 0
+                    l2 = de_lens[pj] + (de_lens[pj + 1] if dj == 2 else 0) if dj else 0
+                    c = prev + penalty + _match_cost(l1, l2, ratio)
+                    if use_sigs and di == 1 and dj == 1 and en_sigs[pi] and en_sigs[pi] == de_sigs[pj]:
+                        c -= ANCHOR_BONUS
+                    if c < best:
+                        best, arg = c, code
+                row[j - lo] = best
+                brow[j - lo] = arg
+            cost.append(row)
+            back.append(brow)
+        if cost[n][m - ranges[n][0]] < inf or width >= max(n, m):
+            break
+        width *= 2
+
+    beads_by_code = list(BEAD_PENALTY)
+    out: List[Bead] = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        di, dj = beads_by_code[back[i][j - ranges[i][0]]]
+        out.append((tuple(range(i - di, i)), tuple(range(j - dj, j))))
+        i, j = i - di, j - dj
+    return out[::-1]
+
+
+def align(
+    src: Sequence[str],
+    tgt: Sequence[str],
+    src_sigs: Optional[Sequence[Tuple]] = None,
+    tgt_sigs: Optional[Sequence[Tuple]] = None,
+) -> List[Tuple[str, str]]:
+    """Align two segment lists into (source, target) texts; merged beads are space-joined.
+
+    ``src_sigs`` / ``tgt_sigs`` are one fact signature per segment (``digit_signature`` by
+    default); unique signatures found on both sides anchor the band and favour 1:1 beads.
+    """
+    src_sigs = [digit_signature(t) for t in src] if src_sigs is None else src_sigs
+    tgt_sigs = [digit_signature(t) for t in tgt] if tgt_sigs is None else tgt_sigs
+    beads = gale_church(
+        [len(t) for t in src], [len(t) for t in tgt], find_anchors(src_sigs, tgt_sigs), en_sigs=src_sigs, de_sigs=tgt_sigs
+    )
+    return [(" ".join(src[i] for i in ii), " ".join(tgt[j] for j in jj)) for ii, jj in beads]
@@ -0,0 +1,247 @@
+"""Prometheus text-format metrics without a client library.
+
+Recording is a dict lookup and an add under a per-metric lock; nothing is formatted until
+``/metrics`` is scraped. Labels are given as keyword arguments in ``labelnames`` order.
+
+``ENABLED`` (``METRICS_ENABLED``) turns the middleware and the operational endpoints (``/metrics``,
+``/auth/stats``) on or off; with ``METRICS_TOKEN`` set, those endpoints also require
+``Authorization: Bearer <token>`` (Prometheus ``authorization`` / ``bearer_token``).
+"""
+import bisect
+import hmac
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in {"1", "true", "yes"}
+TOKEN = os.getenv("METRICS_TOKEN", "")
+# Seconds; spans from a millisecond rule pass to a minute-long LLM stage
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def authorized(authorization: Optional[str]) -> bool:
+    """Whether an ``Authorization`` header may read the operational endpoints."""
+    if not TOKEN:
+        return True
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode("utf-8"), TOKEN.encode("utf-8"))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: Labels, extra: str = "") -> str:
+        parts = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in values]
+
+
+class Gauge(Counter):
+    """Set or moved by the caller, or read from ``fn`` at scrape time (``fn`` returns
+    {label values: value}), so a gauge over existing state costs nothing between scrapes."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable[[], Dict[Labels, float]]] = None):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> List[str]:
+        if self.fn is not None:
+            return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in sorted(self.fn().items())]
+        return super().samples()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one +Inf), sum]
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][i] += 1
+            entry[1][0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, (list(counts), total[0])) for k, (counts, total) in self._values.items())
+        out = []
+        for key, (counts, total) in values:
+            running = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                running += n
+                le = 'le="' + _fmt(bound) + '"'
+                out.append(f"{self.name}_bucket{self._labels(key, le)} {running}")
+            out.append(f"{self.name}_sum{self._labels(key)} {_fmt(total)}")
+            out.append(f"{self.name}_count{self._labels(key)} {running}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def add(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.add(Counter("clausematch_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")))
+REQUEST_SECONDS = REGISTRY.add(Histogram("clausematch_http_request_duration_seconds", "HTTP request latency, until the response is sent.", ("method", "route")))
+IN_FLIGHT = REGISTRY.add(Gauge("clausematch_http_requests_in_flight", "HTTP requests being handled.", ("method",)))
+STAGE_SECONDS = REGISTRY.add(Histogram("clausematch_stage_duration_seconds", "Time spent per pipeline stage.", ("stage",)))
+STAGE_ERRORS = REGISTRY.add(Counter("clausematch_stage_errors_total", "Stages that raised.", ("stage",)))
+
+
+class Spans:
+    """Stage durations of one run, kept as plain data so a pool process can return them with
+    its result; ``observe`` records them in the registry of the process serving ``/metrics``.
+    A stage entered more than once accumulates."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.failed: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.failed = name
+            raise
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v, 6) for k, v in self.seconds.items()}
+
+
+def observe(seconds: Dict[str, float], failed: Optional[str] = None) -> None:
+    for stage, s in seconds.items():
+        STAGE_SECONDS.observe(s, stage=stage)
+    if failed:
+        STAGE_ERRORS.inc(stage=failed)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Observe one stage directly, in the process that serves ``/metrics``."""
+    t = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t, stage=stage)
+
+
+class MetricsMiddleware:
+    """Request count and latency per method and route template (not the raw path, so IDs do
+    not multiply the series), and requests in flight per method. Requests that match no route
+    are counted as ``unmatched``; a streamed response counts until its last chunk is sent."""
+
+    def __init__(self, app, skip: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip = set(skip)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+        t = time.perf_counter()
+        IN_FLIGHT.inc(method=method)
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = scope.get("route")
+            name = getattr(route, "path", None) or "unmatched"
+            IN_FLIGHT.dec(method=method)
+            REQUESTS.inc(method=method, route=name, status=str(status))
+            REQUEST_SECONDS.observe(time.perf_counter() - t, method=method, route=name)
@@ -0,0 +1,246 @@
+"""Bounded in-memory key/value store shared by the three apps: jobs in the clausematch API,
+dev-mode reports in ``backend/``, reports and segmented documents in the serverless app.
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+COUNTERS = ("hits", "misses", "puts", "evictions", "expired", "spilled", "spill_hits")
+# Containers are sized from at most this many items each, scaled to their length
+SIZE_SAMPLE = 32
+SIZE_DEPTH = 6
+
+
+def _size(value: Any, default=str, depth: int = 0) -> int:
+    """Approximate serialized size in bytes, a stand-in for the object graph's footprint.
+
+    Every put is sized (a job is re-put on each status change), so this samples instead of
+    serializing: the cost is bounded by SIZE_SAMPLE and SIZE_DEPTH, not by the value's size.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if value is None or isinstance(value, (bool, int, float)):
+        return len(repr(value))
+    if depth >= SIZE_DEPTH:
+        return 64
+    if isinstance(value, dict):
+        n = len(value)
+        sample = sum(_size(k, default, depth + 1) + _size(v, default, depth + 1) + 2 for k, v in islice(value.items(), SIZE_SAMPLE))
+    elif isinstance(value, (list, tuple)):
+        n = len(value)
+        sample = sum(_size(v, default, depth + 1) + 1 for v in islice(value, SIZE_SAMPLE))
+    else:
+        # Records and other non-JSON values are sized by what they serialize to
+        return _size(default(value), default, depth + 1)
+    return 2 + (sample * n // min(n, SIZE_SAMPLE) if n else 0)
+
+
+class BoundedStore:
+    """In-memory key/value store with LRU eviction under a size and item budget, a TTL,
+    and a per-owner index ordered by ``createdAt``.
+
+    Values must be JSON-serializable. Listing an owner's newest ``k`` values is O(k + log n).
+    With ``spill_path`` set, entries evicted for space are written to SQLite (zlib-compressed
+    JSON) and stay readable and listed until the TTL removes them. ``ttl_s=0`` disables expiry.
+    ``json_default`` encodes non-JSON values (such as records) for sizing and spilling.
+    """
+
+    def __init__(
+        self, max_items: int = 1000, max_bytes: int = 256 << 20, ttl_s: float = 0, spill_path: str = "", json_default=str
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.json_default = json_default
+        self._lock = threading.RLock()
+        # key -> (value, size, stored at); order is recency of use
+        self._items: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        # key -> (owner, createdAt) for every live entry, in memory or spilled
+        self._meta: Dict[str, Tuple[Hashable, float]] = {}
+        # owner -> [(createdAt, key)], ascending
+        self._by_owner: Dict[Hashable, List[Tuple[float, str]]] = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._spill: Optional[sqlite3.Connection] = None
+        if spill_path:
+            os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._spill.execute("PRAGMA journal_mode=WAL")
+            self._spill.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, owner TEXT, created REAL NOT NULL, stored REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            # Spilled entries from an earlier run are still listed
+            for key, owner, created in self._spill.execute("SELECT key, owner, created FROM entries").fetchall():
+                self._index(key, json.loads(owner), created)
+
+    @classmethod
+    def from_env(cls, prefix: str, json_default=str, **defaults: Any) -> "BoundedStore":
+        """Configured by ``<prefix>_MAX_ITEMS``, ``_MAX_BYTES``, ``_TTL_S`` and ``_SPILL_PATH``."""
+        def env(name: str, cast, default):
+            raw = os.getenv(f"{prefix}_{name}")
+            return cast(raw) if raw is not None else defaults.get(name.lower(), default)
+
+        return cls(
+            max_items=env("MAX_ITEMS", int, 1000),
+            max_bytes=env("MAX_BYTES", int, 256 << 20),
+            ttl_s=env("TTL_S", float, 0),
+            spill_path=env("SPILL_PATH", str, ""),
+            json_default=json_default,
+        )
+
+    def _index(self, key: str, owner: Hashable, created: float) -> None:
+        self._meta[key] = (owner, created)
+        bisect.insort(self._by_owner.setdefault(owner, []), (created, key))
+
+    def _unindex(self, key: str) -> None:
+        owner, created = self._meta.pop(key)
+        entries = self._by_owner[owner]
+        i = bisect.bisect_left(entries, (created, key))
+        del entries[i]
+        if not entries:
+            del self._by_owner[owner]
+
+    def _expired(self, stored: float, now: float) -> bool:
+        return bool(self.ttl_s) and now - stored > self.ttl_s
+
+    def _drop(self, key: str) -> None:
+        if key in self._items:
+            self._bytes -= self._items.pop(key)[1]
+        if self._spill is not None:
+            self._spill.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if key in self._meta:
+            self._unindex(key)
+
+    def _evict(self) -> None:
+        while self._items and (len(self._items) > self.max_items or self._bytes > self.max_bytes):
+            key, (value, size, stored) = self._items.popitem(last=False)
+            self._bytes -= size
+            self.counters["evictions"] += 1
+            if self._spill is None:
+                self._unindex(key)
+                continue
+            owner, created = self._meta[key]
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False, default=self.json_default).encode("utf-8"), 6)
+            self._spill.execute(
+                "INSERT OR REPLACE INTO entries (key, owner, created, stored, value) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(owner), created, stored, blob),
+            )
+            self.counters["spilled"] += 1
+
+    def _sweep(self, now: float) -> None:
+        # Entries are in recency order, not age order, so expiry is checked lazily on read
+        # and here for the least recently used end only
+        while self._items:
+            key, (_, _, stored) = next(iter(self._items.items()))
+            if not self._expired(stored, now):
+                break
+            self._drop(key)
+            self.counters["expired"] += 1
+
+    def put(self, key: str, value: Any, owner: Hashable = None, created_at: Optional[float] = None) -> None:
+        """Insert or replace; a replaced entry keeps its owner and ``createdAt`` unless given."""
+        size = _size(value, self.json_default)
+        now = time.time()
+        with self._lock:
+            prev = self._meta.get(key)
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            if self._spill is not None:
+                self._spill.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if prev is None or created_at is not None or owner not in (None, prev[0]):
+                if prev is not None:
+                    self._unindex(key)
+                self._index(key, owner, now if created_at is None else created_at)
+            self._items[key] = (value, size, now)
+            self._bytes += size
+            self.counters["puts"] += 1
+            self._sweep(now)
+            self._evict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is not None:
+                if self._expired(hit[2], now):
+                    self._drop(key)
+                    self.counters["expired"] += 1
+                else:
+                    self._items.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return hit[0]
+            elif self._spill is not None and key in self._meta:
+                row = self._spill.execute("SELECT stored, value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[0], now):
+                    self.counters["spill_hits"] += 1
+                    return json.loads(zlib.decompress(row[1]))
+                self._drop(key)
+                self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def _peek(self, key: str, now: float) -> Any:
+        # A live entry's value without touching recency or counters; None when expired
+        hit = self._items.get(key)
+        if hit is not None:
+            return None if self._expired(hit[2], now) else hit[0]
+        if self._spill is not None:
+            row = self._spill.execute("SELECT stored, value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and not self._expired(row[0], now):
+                return json.loads(zlib.decompress(row[1]))
+        return None
+
+    def page(self, owner: Hashable = None, limit: int = 25, cursor: Optional[str] = None) -> Tuple[List[Tuple[str, Any]], Optional[str]]:
+        """Owner's entries newest first, as (key, value); raises KeyError for a foreign or unknown cursor.
+
+        Listing is not a use: it leaves LRU order and hit/miss counters alone, and skips
+        expired entries without removing them.
+        """
+        now = time.time()
+        with self._lock:
+            entries = self._by_owner.get(owner, [])
+            if cursor is None:
+                end = len(entries)
+            else:
+                meta = self._meta.get(cursor)
+                if meta is None or meta[0] != owner:
+                    raise KeyError(cursor)
+                end = bisect.bisect_left(entries, (meta[1], cursor))
+            out: List[Tuple[str, Any]] = []
+            for i in range(end - 1, -1, -1):
+                if len(out) > limit:
+                    break
+                key = entries[i][1]
+                value = self._peek(key, now)
+                if value is not None:
+                    out.append((key, value))
+        items = out[:limit]
+        next_cursor = items[-1][0] if len(out) > limit else None
+        return items, next_cursor
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c: Dict[str, Any] = dict(self.counters)
+            c["items"] = len(self._items)
+            c["bytes"] = self._bytes
+            c["indexed"] = len(self._meta)
+        c["max_items"] = self.max_items
+        c["max_bytes"] = self.max_bytes
+        lookups = c["hits"] + c["spill_hits"] + c["misses"]
+        c["hit_rate"] = round(c["hits"] / lookups, 4) if lookups else 0.0
+        return c
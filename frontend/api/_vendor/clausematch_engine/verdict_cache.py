@@ -0,0 +1,146 @@
+"""LLM verdict cache shared by the clausematch API and the serverless app: a bounded memory LRU
+in front of SQLite, keyed by model, prompt version and the normalized clause texts.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+_ws_re = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _ws_re.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def make_key(model_id: str, prompt_version: str, *texts: str) -> str:
+    # Pairs are (en, de); an N-way check passes one text per version
+    raw = "\x1f".join([model_id, prompt_version, *map(normalize, texts)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """Two-tier cache for LLM verdicts: bounded in-process LRU in front of SQLite.
+
+    Entries expire ``ttl_s`` seconds after they were written in either tier. Expired memory
+    entries are dropped when read, swept from the least recently used end on every put and
+    purged entirely every ``PURGE_EVERY`` puts, so entries nobody reads again do not linger. The
+    disk tier is trimmed to ``max_disk_items`` by least-recent access at the same interval. A
+    SQLite file that cannot be opened (read-only or missing /tmp) leaves the memory tier only.
+    """
+
+    PURGE_EVERY = 256
+
+    def __init__(self, path: Optional[str], max_items: int = 10000, max_disk_items: int = 200000, ttl_s: float = 7 * 86400):
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.ttl_s = ttl_s
+        self._mem: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.counters = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "puts": 0, "evictions": 0, "expired": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts (accessed)")
+            except (OSError, sqlite3.Error):
+                self._db = None
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                created, value = hit
+                if now - created < self.ttl_s:
+                    self._mem.move_to_end(key)
+                    self.counters["mem_hits"] += 1
+                    return value
+                del self._mem[key]
+                self.counters["expired"] += 1
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM verdicts WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if now - row[1] < self.ttl_s:
+                        self._db.execute("UPDATE verdicts SET accessed = ? WHERE key = ?", (now, key))
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.counters["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self.counters["puts"] += 1
+            self._puts += 1
+            if self._puts % self.PURGE_EVERY == 0:
+                self._purge_mem(now)
+            else:
+                self._sweep_mem(now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now),
+                )
+                if self._puts % self.PURGE_EVERY == 0:
+                    self._trim_disk()
+
+    def _remember(self, key: str, created: float, value: Any) -> None:
+        self._mem[key] = (created, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _sweep_mem(self, now: float) -> None:
+        # The least recently used end, where entries nobody reads collect
+        while self._mem:
+            key, (created, _) = next(iter(self._mem.items()))
+            if now - created < self.ttl_s:
+                break
+            del self._mem[key]
+            self.counters["expired"] += 1
+
+    def _purge_mem(self, now: float) -> None:
+        # Recently read entries can expire too; they are not at the swept end
+        expired = [key for key, (created, _) in self._mem.items() if now - created >= self.ttl_s]
+        for key in expired:
+            del self._mem[key]
+        self.counters["expired"] += len(expired)
+
+    def _trim_disk(self) -> None:
+        self._db.execute("DELETE FROM verdicts WHERE created < ?", (time.time() - self.ttl_s,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+        if count > self.max_disk_items:
+            self._db.execute(
+                "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_disk_items,),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self.counters)
+            c["mem_items"] = len(self._mem)
+            if self._db is not None:
+                c["disk_items"] = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        lookups = c["mem_hits"] + c["disk_hits"] + c["misses"]
+        c["hit_rate"] = round((c["mem_hits"] + c["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return c
+
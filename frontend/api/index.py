@@ -1,15 +1,30 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, List, Tuple, Optional
 import os, json, time, uuid
+import hashlib
 import requests
+import sys
 import uuid
 import time
 
+# The shared engine ships inside the function bundle (frontend/scripts/vendor_engine.py keeps the
+# copy in sync with the repository's clausematch_engine/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "_vendor"))
+from clausematch_engine import segment as engine_segment
+from clausematch_engine import multi, paging
+from clausematch_engine.align import align, digit_signature
+from clausematch_engine.graph import Graph, Stage
+from clausematch_engine.similarity import similarity_batch, summarize
+from clausematch_engine.store import BoundedStore
+from clausematch_engine.verdict_cache import VerdictCache, make_key
+
 app = FastAPI(title="ClauseMatch++ Serverless API")
 
 
-# In-memory store (serverless: per-instance; OK for demo)
-REPORTS: Dict[str, Dict[str, Any]] = {}
+# In-memory store (serverless: per-instance; OK for demo), bounded by REPORT_STORE_* settings
+REPORTS = BoundedStore.from_env("REPORT_STORE", max_items=200, max_bytes=64 << 20)
 
 
 @app.get("/health")
@@ -17,45 +32,38 @@ def health():
     return {"status": "ok"}
 
 
-# --- Minimal ClauseMatch++ stubs (duplicated for serverless) ---
-def segment(text: str) -> List[str]:
-    if not text:
-        return []
-    parts: List[str] = []
-    for line in text.splitlines():
-        for p in line.replace("?", ".").replace("!", ".").split("."):
-            p = p.strip()
-            if p:
-                parts.append(p)
-    return parts
-
-
-def align(en: List[str], de: List[str]) -> List[Tuple[int, str, str]]:
-    m = max(len(en), len(de))
-    out: List[Tuple[int, str, str]] = []
-    for i in range(m):
-        out.append((i, en[i] if i < len(en) else "", de[i] if i < len(de) else ""))
-    return out
-
-
-def similarity(a: str, b: str) -> float:
-    if not a and not b:
-        return 1.0
-    if not a or not b:
-        return 0.0
-    sa, sb = set(a.lower().split()), set(b.lower().split())
-    overlap = len(sa & sb) / max(1, len(sa | sb))
-    min_len = min(len(a), len(b))
-    avg_len = (len(a) + len(b)) / 2 or 1
-    shape = min_len / avg_len
-    return max(0.0, min(1.0, 0.5 * overlap + 0.5 * shape))
-
-
-def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
-    total = len(rows)
-    mismatches = sum(1 for r in rows if r.get("isMismatch"))
-    avg = sum(r.get("similarity", 0.0) for r in rows) / total if total else 0.0
-    return {"total": total, "mismatches": mismatches, "avgSimilarity": round(avg, 3)}
+# --- Pipeline: the shared clausematch_engine (vendored under api/_vendor/) ---
+async def _chunks(upload: UploadFile, chunk_size: int = 1 << 16):
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def segment_upload(upload: UploadFile) -> List[str]:
+    # Chunked read + incremental decode; only the current line is buffered, never the whole file
+    return [s async for s in engine_segment.segment_stream(_chunks(upload))]
+
+
+# Segmented documents and their alignments to a pivot, by content hash: a master uploaded again
+# with new translations is segmented and aligned once. Bounded by DOC_STORE_* settings.
+DOCUMENTS = BoundedStore.from_env("DOC_STORE", max_items=64, max_bytes=64 << 20)
+
+
+async def prepare_upload(upload: UploadFile) -> Dict[str, Any]:
+    # Hash the (spooled) upload first; the segmenting pass only runs on a miss
+    digest = hashlib.sha256()
+    async for chunk in _chunks(upload):
+        digest.update(chunk)
+    key = digest.hexdigest()
+    doc = DOCUMENTS.get(key)
+    if doc is None:
+        await upload.seek(0)
+        segs = await segment_upload(upload)
+        doc = {"key": key, "segments": segs, "signatures": [digit_signature(s) for s in segs]}
+        DOCUMENTS.put(key, doc)
+    return doc
 
 
 def _iam_token() -> str:
@@ -72,10 +80,29 @@ def _iam_token() -> str:
     return r.json().get("access_token", "")
 
 
+# --- Verdict cache (memory LRU + /tmp SQLite), shared with the clausematch API ---
+PROMPT_VERSION = "serverless-v1"
+VERDICTS = VerdictCache(os.getenv("VERDICT_CACHE_PATH", "/tmp/clausematch_verdicts.sqlite") or None, max_items=5000, max_disk_items=50000)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return VERDICTS.stats()
+
+
 def watsonx_check(a_txt: str, b_txt: str) -> Dict[str, Any]:
+    return watsonx_check_versions([("EN", a_txt), ("DE", b_txt)])
+
+
+def watsonx_check_versions(versions: List[Tuple[str, str]]) -> Dict[str, Any]:
+    # versions: (label, text); the labels only name the versions in the prompt, the cache keys on the texts
     project_id = os.getenv("WML_PROJECT_ID")
     base_url = os.getenv("WML_API_URL", "https://us-south.ml.cloud.ibm.com")
     model_id = os.getenv("WML_MODEL_ID", "ibm/granite-3-2-8b-instruct")
+    cache_key = make_key(model_id, PROMPT_VERSION, *(text for _, text in versions))
+    cached = VERDICTS.get(cache_key)
+    if cached is not None:
+        return cached
     token = _iam_token()
     if not (project_id and token):
         return {"status": "REVIEW", "confidence": 0.0, "issues": []}
@@ -84,7 +111,7 @@ def watsonx_check(a_txt: str, b_txt: str) -> Dict[str, Any]:
         "Detect mismatches in numbers, dates, monetary amounts, or entities. If most versions agree and one differs, mark it as suspect.\n"
         "Output only a valid JSON object using this schema:\n"
         "{\\\"status\\\": \\\"MATCH|MISMATCH|REVIEW\\\", \\\"confidence\\\": 0.0-1.0, \\\"issues\\\":[{\\\"type\\\":\\\"number|date|monetary|entity\\\", \\\"comment\\\": \\\"brief reason\\\"}]}\n"
-        f"Input: EN: {a_txt}\nDE: {b_txt}\n\nOutput:"
+        "Input: " + "\n".join(f"{label}: {text}" for label, text in versions) + "\n\nOutput:"
     )
     body = {
         "input": prompt,
@@ -103,9 +130,149 @@ def watsonx_check(a_txt: str, b_txt: str) -> Dict[str, Any]:
     out = r.json()
     text = out.get("results", [{}])[0].get("generated_text", "{}")
     try:
-        return json.loads(text)
+        verdict = json.loads(text)
     except Exception:
         return {"status": "REVIEW", "confidence": 0.0, "issues": []}
+    VERDICTS.put(cache_key, verdict)
+    return verdict
+
+
+def _verdict(pair: Tuple[str, str]) -> Dict[str, Any]:
+    return watsonx_check(*pair) if os.getenv("WML_API_KEY") else {"issues": []}
+
+
+def _similarities(pairs: List[Tuple[str, str]]) -> List[float]:
+    return similarity_batch([s for s, _ in pairs], [t for _, t in pairs]).tolist()
+
+
+def _rows(pairs: List[Tuple[str, str]], sims: List[float], verdicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for i, ((s, t), sim, verdict) in enumerate(zip(pairs, sims, verdicts)):
+        sim = round(sim, 3)
+        ai_mismatch = bool(verdict.get("issues"))
+        rows.append({"index": i, "source": s, "target": t, "similarity": sim, "isMismatch": ai_mismatch or sim < 0.6, "ai": verdict})
+    return rows
+
+
+# watsonx verdicts go out per pair on the engine's thread pool while the similarity batch runs
+ANALYZE = Graph(
+    [
+        Stage("align", align, ("source", "target")),
+        Stage("similarity", _similarities, ("align",)),
+        Stage("verdicts", _verdict, ("align",), executor="thread", per_item=True),
+        Stage("rows", _rows, ("align", "similarity", "verdicts")),
+    ],
+    inputs=("source", "target"),
+)
+
+
+def _align_version(version: Dict[str, Any], pivot: Dict[str, Any]) -> List[Any]:
+    key = f"align:{pivot['key']}:{version['key']}"
+    beads = DOCUMENTS.get(key)
+    if beads is None:
+        # Signatures come back as lists from a spilled entry
+        beads = multi.align_to_pivot(
+            pivot["segments"], version["segments"],
+            [tuple(s) for s in pivot["signatures"]], [tuple(s) for s in version["signatures"]],
+        )
+        DOCUMENTS.put(key, beads)
+    return beads
+
+
+def _version_rows(pivot: Dict[str, Any], others: List[Dict[str, Any]], beads: List[List[Any]]) -> List[List[str]]:
+    return multi.rows(pivot["segments"], [(o["segments"], b) for o, b in zip(others, beads)])
+
+
+def _version_similarities(rows: List[List[str]]) -> List[List[float]]:
+    # Per row, each version against the pivot: one batch per version
+    if not rows:
+        return []
+    pivot = [r[0] for r in rows]
+    columns = [similarity_batch(pivot, [r[v] for r in rows]).tolist() for v in range(1, len(rows[0]))]
+    return [list(sims) for sims in zip(*columns)]
+
+
+def _vote(texts: List[str]) -> Tuple[str, List[int]]:
+    return multi.vote([multi.fact_key(t) for t in texts])
+
+
+def _voted(rows: List[List[str]], votes: List[Tuple[str, List[int]]]) -> List[Tuple[List[str], Tuple[str, List[int]]]]:
+    return list(zip(rows, votes))
+
+
+def _version_verdict(item: Tuple[List[str], Tuple[str, List[int]]], names: List[str]) -> Dict[str, Any]:
+    # Only rows the vote did not settle go to watsonx, with every version in one prompt
+    texts, (status, _) = item
+    if status == "OK" or not os.getenv("WML_API_KEY"):
+        return {"issues": []}
+    return watsonx_check_versions(list(zip(names, texts)))
+
+
+def _version_clauses(
+    rows: List[List[str]], sims: List[List[float]], votes: List[Tuple[str, List[int]]],
+    verdicts: List[Dict[str, Any]], perm: List[int],
+) -> List[Dict[str, Any]]:
+    # Columns are pivot first; perm maps them back to upload order
+    def upload_order(values: List[Any]) -> List[Any]:
+        out = [None] * len(values)
+        for c, v in enumerate(values):
+            out[perm[c]] = v
+        return out
+
+    clauses: List[Dict[str, Any]] = []
+    for i, (texts, row_sims, (status, outliers), verdict) in enumerate(zip(rows, sims, votes, verdicts)):
+        clauses.append({
+            "index": i,
+            "texts": upload_order(texts),
+            "similarity": round(sum(row_sims) / len(row_sims), 3) if row_sims else 1.0,
+            "similarities": upload_order([1.0] + [round(x, 3) for x in row_sims]),
+            "status": status,
+            "outliers": sorted(perm[c] for c in outliers),
+            "isMismatch": status != "OK" or bool(verdict.get("issues")),
+            "ai": verdict,
+        })
+    return clauses
+
+
+# N-way: every version aligned to the pivot (N - 1 alignments), a majority vote on each clause
+# row's facts, and watsonx only for the rows the vote flags
+MULTI = Graph(
+    [
+        Stage("align", _align_version, ("others", "pivot"), per_item=True),
+        Stage("rows", _version_rows, ("pivot", "others", "align")),
+        Stage("similarity", _version_similarities, ("rows",)),
+        Stage("vote", _vote, ("rows",), per_item=True),
+        Stage("voted", _voted, ("rows", "vote")),
+        Stage("verdicts", _version_verdict, ("voted", "names"), executor="thread", per_item=True),
+        Stage("clauses", _version_clauses, ("rows", "similarity", "vote", "verdicts", "perm")),
+    ],
+    inputs=("pivot", "others", "names", "perm"),
+)
+
+
+async def analyze_versions(files: List[UploadFile], pivot: int, logs: List[str]) -> Dict[str, Any]:
+    docs = [await prepare_upload(f) for f in files]
+    perm = [pivot] + [i for i in range(len(files)) if i != pivot]
+    names = [files[i].filename or f"file{i}" for i in perm]
+    stages = await run_in_threadpool(MULTI.run, {
+        "pivot": docs[pivot], "others": [docs[i] for i in perm[1:]], "names": names, "perm": perm,
+    })
+    clauses = stages["clauses"]
+    logs.append(f"aligned {len(files) - 1} versions to pivot {names[0]!r}; {len(clauses)} clause rows")
+    summary = summarize([c["similarity"] for c in clauses], [c["isMismatch"] for c in clauses])
+    summary["documents"] = len(files)
+    summary["review"] = sum(c["status"] == "REVIEW" for c in clauses)
+    # Rows where each document (upload order) disagreed with the majority
+    summary["outliers"] = [0] * len(files)
+    for c in clauses:
+        for i in c["outliers"]:
+            summary["outliers"][i] += 1
+    return {
+        "mode": "multi",
+        "filenames": {"files": [f.filename for f in files], "pivot": files[pivot].filename},
+        "summary": summary,
+        "pairs": clauses,
+    }
 
 
 @app.post("/analyze")
@@ -113,62 +280,78 @@ async def analyze(
     files: Optional[List[UploadFile]] = File(None),
     source: Optional[UploadFile] = File(None),
     target: Optional[UploadFile] = File(None),
+    pivot: int = Form(0),
 ):
+    # Three or more files: every version against the pivot (index into files), majority vote per clause
     logs: List[str] = []
-    texts: List[Tuple[str, str]] = []
     names: List[str] = []
 
-    if files and len(files) >= 2:
-        logs.append(f"received {len(files)} files; comparing first two")
+    if files and len(files) >= 3:
+        if not 0 <= pivot < len(files):
+            raise HTTPException(status_code=400, detail=f"pivot must be between 0 and {len(files) - 1}")
+        logs.append(f"received {len(files)} files; comparing every version to file {pivot}")
+        project_id = str(uuid.uuid4())
+        data = {"projectId": project_id, "createdAt": int(time.time())}
+        data.update(await analyze_versions(files, pivot, logs))
+        data["logs"] = logs
+        REPORTS.put(project_id, data, created_at=data["createdAt"])
+        return data
+    if files and len(files) == 2:
+        logs.append("received 2 files; comparing pair")
         a, b = files[0], files[1]
-        src = (await a.read()).decode("utf-8", "ignore")
-        tgt = (await b.read()).decode("utf-8", "ignore")
-        texts.append((src, tgt))
-        names = [a.filename, b.filename]
     elif source and target:
         logs.append("received source/target; comparing pair")
-        src = (await source.read()).decode("utf-8", "ignore")
-        tgt = (await target.read()).decode("utf-8", "ignore")
-        texts.append((src, tgt))
-        names = [source.filename, target.filename]
+        a, b = source, target
     else:
         raise HTTPException(status_code=400, detail="Provide at least two files under 'files' or 'source'/'target'.")
+    names = [a.filename, b.filename]
 
     # process first pair for demo
-    src, tgt = texts[0]
-    s_segs, t_segs = segment(src), segment(tgt)
-    pairs = align(s_segs, t_segs)
-    rows: List[Dict[str, Any]] = []
-    for i, s, t in pairs:
-        sim = round(similarity(s, t), 3)
-        verdict = watsonx_check(s, t) if os.getenv("WML_API_KEY") else {"issues": []}
-        ai_mismatch = bool(verdict.get("issues"))
-        rows.append({"index": i, "source": s, "target": t, "similarity": sim, "isMismatch": ai_mismatch or sim < 0.6, "ai": verdict})
+    s_segs, t_segs = await segment_upload(a), await segment_upload(b)
+    stages = await run_in_threadpool(ANALYZE.run, {"source": s_segs, "target": t_segs})
+    rows = stages["rows"]
 
     project_id = str(uuid.uuid4())
     data = {
         "projectId": project_id,
         "createdAt": int(time.time()),
         "filenames": {"a": names[0], "b": names[1]} if len(names) == 2 else {},
-        "summary": summarize(rows),
+        "summary": summarize([r["similarity"] for r in rows], [r["isMismatch"] for r in rows]),
         "pairs": rows,
         "logs": logs,
     }
-    REPORTS[project_id] = data
+    REPORTS.put(project_id, data, created_at=data["createdAt"])
     return data
 
 
 @app.get("/results/{project_id}")
-def get_results(project_id: str):
+def get_results(
+    project_id: str,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    # One page of pairs; pass nextCursor for the following page. status filters (OK, MISMATCH,
+    # and REVIEW for N-way reports; comma-separated); Accept: application/x-ndjson streams every match instead.
     data = REPORTS.get(project_id)
     if not data:
         raise HTTPException(status_code=404, detail="Report not found")
-    return data
+    filters = paging.parse_filters(status=status)
+    try:
+        start = paging.parse_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    entries = paging.positioned(data.get("pairs", []), start)
+    if paging.wants_ndjson(request):
+        return StreamingResponse(paging.ndjson_lines(entries, filters), media_type=paging.NDJSON)
+    page, next_cursor = paging.take_page(entries, limit, filters)
+    return {**{k: v for k, v in data.items() if k != "pairs"}, "pairs": page, "nextCursor": next_cursor}
 
 
 @app.get("/reports")
 def list_reports():
-    items = sorted(REPORTS.values(), key=lambda x: x.get("createdAt", 0), reverse=True)[:25]
-    return {"items": [{"projectId": x["projectId"], "createdAt": x["createdAt"], "filenames": x["filenames"], "summary": x["summary"]} for x in items]}
+    entries, _ = REPORTS.page(None, 25)
+    return {"items": [{"projectId": x["projectId"], "createdAt": x["createdAt"], "filenames": x["filenames"], "summary": x["summary"]} for _, x in entries]}
 
 
@@ -0,0 +1,55 @@
+"""Copy the shared clausematch_engine package into the serverless function bundle.
+
+The Vercel project's root is frontend/, so the repository-level ``clausematch_engine/`` is not
+uploaded with ``api/index.py``. Its modules are copied to ``api/_vendor/clausematch_engine/``
+(an underscore directory: bundled, but not turned into functions) and committed. Run after
+changing the engine:
+
+    python frontend/scripts/vendor_engine.py          # refresh the copy
+    python frontend/scripts/vendor_engine.py --check  # exit 1 if it is stale (run by the tests)
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[2]
+SOURCE = ROOT / "clausematch_engine"
+TARGET = ROOT / "frontend" / "api" / "_vendor" / "clausematch_engine"
+
+
+def stale() -> List[str]:
+    """Modules that differ between the engine and the vendored copy, or exist on one side only."""
+    src = {p.name: p.read_bytes() for p in SOURCE.glob("*.py")}
+    dst = {p.name: p.read_bytes() for p in TARGET.glob("*.py")} if TARGET.is_dir() else {}
+    return sorted(name for name in src.keys() | dst.keys() if src.get(name) != dst.get(name))
+
+
+def sync() -> List[str]:
+    changed = stale()
+    TARGET.mkdir(parents=True, exist_ok=True)
+    for name in changed:
+        source = SOURCE / name
+        if source.exists():
+            (TARGET / name).write_bytes(source.read_bytes())
+        else:
+            (TARGET / name).unlink()
+    return changed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="report stale modules instead of copying")
+    args = parser.parse_args()
+    if args.check:
+        changed = stale()
+        for name in changed:
+            print(f"stale: {name}")
+        return 1 if changed else 0
+    for name in sync():
+        print(f"updated: {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# backend/, clausematch_engine/ and the clausematch API's app package, importable from any cwd
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "clausematch-backend", "services", "api"), os.path.join(ROOT, "clausematch-backend", "services")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
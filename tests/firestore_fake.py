@@ -0,0 +1,157 @@
+"""In-process stand-in for the subset of the Firestore client that ``backend.reports`` uses.
+
+Documents are deep-copied on write and read, like a real round trip. Supports collections and
+subcollections, ``get``/``set``, batched writes, and queries with comparison and ``in`` filters,
+``order_by``, ``start_after(snapshot)`` and ``limit``.
+"""
+import copy
+import operator
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+}
+
+
+class FakeSnapshot:
+    def __init__(self, ref: "FakeDocument", data: Optional[Dict[str, Any]]):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class FakeQuery:
+    def __init__(self, coll: "FakeCollection", filters=(), orders=(), after=None, limit=None):
+        self._coll = coll
+        self._filters: Tuple = tuple(filters)
+        self._orders: Tuple = tuple(orders)
+        self._after: Optional[FakeSnapshot] = after
+        self._limit: Optional[int] = limit
+
+    def _with(self, **kw) -> "FakeQuery":
+        args = {"filters": self._filters, "orders": self._orders, "after": self._after, "limit": self._limit}
+        args.update(kw)
+        return FakeQuery(self._coll, **args)
+
+    def where(self, field: str, op: str, value: Any) -> "FakeQuery":
+        if op not in OPERATORS:
+            # The real client rejects unknown operators the same way
+            raise ValueError(f"Operator string {op!r} is invalid")
+        return self._with(filters=self._filters + ((field, OPERATORS[op], value),))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return self._with(orders=self._orders + ((field, direction == "DESCENDING"),))
+
+    def start_after(self, snapshot: FakeSnapshot) -> "FakeQuery":
+        return self._with(after=snapshot)
+
+    def limit(self, n: int) -> "FakeQuery":
+        return self._with(limit=n)
+
+    def stream(self):
+        with self._coll.client._lock:
+            docs = [(i, copy.deepcopy(d)) for i, d in self._coll._docs().items()]
+        # Like Firestore, a filter never matches a document that lacks the field
+        docs = [(i, d) for i, d in docs if all(f in d and op(d[f], v) for f, op, v in self._filters)]
+        # Stable sorts from the least significant key; ties go by document ID in the
+        # direction of the last ordering, as in Firestore
+        docs.sort(key=lambda item: item[0], reverse=bool(self._orders) and self._orders[-1][1])
+        for field, desc in reversed(self._orders):
+            docs.sort(key=lambda item: item[1].get(field), reverse=desc)
+        if self._after is not None:
+            ids = [i for i, _ in docs]
+            if self._after.id not in ids:
+                raise ValueError("start_after() snapshot is not in this query's results")
+            docs = docs[ids.index(self._after.id) + 1:]
+        if self._limit is not None:
+            docs = docs[: self._limit]
+        for i, d in docs:
+            yield FakeSnapshot(self._coll.document(i), d)
+
+
+class FakeDocument:
+    def __init__(self, client: "FakeClient", path: Tuple[str, ...]):
+        self.client = client
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self.client, self.path + (name,))
+
+    def get(self) -> FakeSnapshot:
+        with self.client._lock:
+            data = self.client._store.get(self.path)
+        return FakeSnapshot(self, copy.deepcopy(data))
+
+    def set(self, data: Dict[str, Any]) -> None:
+        with self.client._lock:
+            self.client._store[self.path] = copy.deepcopy(data)
+            self.client.writes += 1
+
+    def delete(self) -> None:
+        with self.client._lock:
+            self.client._store.pop(self.path, None)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client: "FakeClient", path: Tuple[str, ...]):
+        self.client = client
+        self.path = path
+        super().__init__(self)
+
+    def document(self, doc_id: str) -> FakeDocument:
+        return FakeDocument(self.client, self.path + (doc_id,))
+
+    def _docs(self) -> Dict[str, Dict[str, Any]]:
+        n = len(self.path)
+        return {p[-1]: d for p, d in self.client._store.items() if len(p) == n + 1 and p[:n] == self.path}
+
+
+class FakeBatch:
+    MAX_WRITES = 500
+
+    def __init__(self, client: "FakeClient"):
+        self.client = client
+        self._ops: List[Tuple[FakeDocument, Dict[str, Any]]] = []
+
+    def set(self, ref: FakeDocument, data: Dict[str, Any]) -> None:
+        self._ops.append((ref, copy.deepcopy(data)))
+
+    def commit(self) -> None:
+        if len(self._ops) > self.MAX_WRITES:
+            raise ValueError(f"batch of {len(self._ops)} writes exceeds {self.MAX_WRITES}")
+        with self.client._lock:
+            for ref, data in self._ops:
+                self.client._store[ref.path] = data
+            self.client.writes += len(self._ops)
+            self.client.commits += 1
+        self._ops = []
+
+
+class FakeClient:
+    def __init__(self):
+        self._store: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.commits = 0
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, (name,))
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
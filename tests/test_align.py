@@ -0,0 +1,79 @@
+from app.pipeline import align, semantic
+from clausematch_engine.align import find_anchors, gale_church
+
+# Segment lengths with one fact signature each; the German side has an extra sentence at 2
+EN_LENS, EN_SIGS = [100, 120, 90, 110, 100], [("1",), ("2",), ("3",), ("4",), ("5",)]
+DE_LENS, DE_SIGS = [105, 125, 100, 95, 115, 105], [("1",), ("2",), ("9",), ("3",), ("4",), ("5",)]
+
+
+def _covered(beads):
+    return [i for ii, _ in beads for i in ii], [j for _, jj in beads for j in jj]
+
+
+def test_anchors_are_unique_and_monotonic():
+    # "b" crosses two later anchors and is dropped; "x" is not unique, empty signatures never anchor
+    en = [("a",), ("b",), ("c",), ("d",), ("x",), ("x",), ()]
+    de = [("a",), ("c",), ("d",), ("b",), ("x",), ()]
+    assert find_anchors(en, de) == [(0, 0), (2, 1), (3, 2)]
+    assert find_anchors([], de) == []
+
+
+def test_inserted_sentence_does_not_shift_later_pairs():
+    anchors = find_anchors(EN_SIGS, DE_SIGS)
+    assert anchors == [(0, 0), (1, 1), (2, 3), (3, 4), (4, 5)]
+    beads = gale_church(EN_LENS, DE_LENS, anchors, en_sigs=EN_SIGS, de_sigs=DE_SIGS)
+    assert _covered(beads) == (list(range(5)), list(range(6)))
+    # The extra sentence joins a neighbour's bead; every anchored pair stays together
+    assert [b for b in beads if 2 in b[1]] in ([((1,), (1, 2))], [((2,), (2, 3))])
+    assert all(any(i in ii and j in jj for ii, jj in beads) for i, j in anchors)
+
+
+def test_dropped_sentence_does_not_shift_later_pairs():
+    anchors = find_anchors(DE_SIGS, EN_SIGS)
+    beads = gale_church(DE_LENS, EN_LENS, anchors, en_sigs=DE_SIGS, de_sigs=EN_SIGS)
+    assert _covered(beads) == (list(range(6)), list(range(5)))
+    assert [b for b in beads if 2 in b[0]] in ([((1, 2), (1,))], [((2, 3), (2,))])
+    assert beads[-3:] == [((3,), (2,)), ((4,), (3,)), ((5,), (4,))]
+
+
+def test_band_widens_without_anchors():
+    beads = gale_church([50] * 30, [50] * 5 + [10] * 40, width=2)
+    assert _covered(beads) == (list(range(30)), list(range(45)))
+
+
+EN = [
+    "ACME Industries GmbH delivers 500 units to Berlin by 2025-06-30.",
+    "Invoice INV-4471 of EUR 12,000 is payable to Deutsche Bank account DE89 3704 0044.",
+    "Disputes go to the Landgericht München I.",
+    "Contact: Maria Schneider, maria.schneider@acme.example, +49 30 1234567.",
+]
+DE = [
+    "ACME Industries GmbH liefert 500 Einheiten nach Berlin bis 2025-06-30.",
+    "Rechnung INV-4471 über EUR 12.000 ist auf das Konto DE89 3704 0044 bei der Deutsche Bank zu zahlen.",
+    "Streitigkeiten gehen an das Landgericht München I.",
+    "Kontakt: Maria Schneider, maria.schneider@acme.example, +49 30 1234567.",
+]
+EXTRA = "Mündliche Nebenabreden bestehen nicht."
+
+
+def _texts(pairs):
+    return [(a, b) for _, a, b in pairs]
+
+
+def test_embed_align_keeps_inserted_and_dropped_sentences_one_sided():
+    inserted = semantic.embed_align(EN, DE[:2] + [EXTRA] + DE[2:])
+    assert _texts(inserted) == [(EN[0], DE[0]), (EN[1], DE[1]), ("", EXTRA), (EN[2], DE[2]), (EN[3], DE[3])]
+    assert [k for k, _, _ in inserted] == [f"clause_{k}" for k in range(5)]
+    dropped = semantic.embed_align(EN, DE[:2] + DE[3:])
+    assert _texts(dropped) == [(EN[0], DE[0]), (EN[1], DE[1]), (EN[2], ""), (EN[3], DE[3])]
+    assert semantic.embed_align([], DE[:1]) == [("clause_0", "", DE[0])]
+
+
+def test_job_align_falls_back_to_embed_align(monkeypatch):
+    from app.services import orchestrator_client
+
+    monkeypatch.setattr(align, "anchor_align", lambda *args: [])
+    assert orchestrator_client._align((EN, DE), None) == semantic.embed_align(EN, DE)
+    monkeypatch.undo()
+    monkeypatch.setenv("ALIGN_STRATEGY", "embed")
+    assert orchestrator_client._align((EN, DE[:2] + DE[3:]), None) == semantic.embed_align(EN, DE[:2] + DE[3:])
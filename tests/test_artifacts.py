@@ -0,0 +1,41 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.pipeline import storage
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(storage, "_backend", storage.LocalBackend(str(tmp_path)))
+    monkeypatch.setenv("ARTIFACT_COMPRESSION", "gzip")
+    return TestClient(app)
+
+
+def test_malformed_q_value_is_ignored(client):
+    body = b'{"findings": []}' * 200
+    art = storage.put_bytes("job/findings.json", body)
+    assert art.codec == "gzip"
+
+    res = client.get("/artifacts/job/findings.json", headers={"Accept-Encoding": "gzip;q=x"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    res = client.get("/artifacts/job/findings.json", headers={"Accept-Encoding": "gzip;q=0"})
+    assert res.status_code == 200
+    assert "content-encoding" not in res.headers
+    assert res.content == body
+
+
+def test_legacy_fallback_skips_blob_and_ref_files(client, tmp_path):
+    art = storage.put_bytes("job/findings.json", b"x" * 4096)
+    (tmp_path / "old").mkdir()
+    (tmp_path / "old" / "report.txt").write_bytes(b"legacy report")
+
+    assert client.get("/artifacts/old/report.txt").content == b"legacy report"
+    assert client.get(f"/artifacts/blobs/{art.blob[:2]}/{art.blob}").status_code == 404
+    assert client.get("/artifacts/refs/job/findings.json").status_code == 404
+    assert client.get("/artifacts/../outside").status_code == 404
+    assert gzip.decompress(storage.open_raw(art).read()) == b"x" * 4096
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("FIREBASE_ALLOW_INSECURE", "1")
+
+from backend import auth  # noqa: E402
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """Replace Firebase verification with one that blocks until ``release`` is set."""
+    release = threading.Event()
+    calls = []
+
+    def verify(id_token):
+        calls.append(id_token)
+        release.wait(5)
+        if id_token == "bad":
+            raise ValueError("invalid token")
+        return {"uid": id_token, "exp": time.time() + 3600, "firebase": {"sign_in_provider": "password"}}
+
+    monkeypatch.setattr(auth.admin_auth, "verify_id_token", verify)
+    monkeypatch.setattr(auth, "TOKENS", auth.TokenCache())
+    monkeypatch.setattr(auth, "_INFLIGHT", {})
+    return release, calls
+
+
+async def _settle(predicate):
+    for _ in range(500):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_cancelled_leader_does_not_strand_waiters(verifier):
+    release, calls = verifier
+
+    async def scenario():
+        leader = asyncio.create_task(auth.verify_id_token_cached("tok"))
+        await _settle(lambda: calls)
+        waiters = [asyncio.create_task(auth.verify_id_token_cached("tok")) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        results = await asyncio.wait_for(asyncio.gather(*waiters), 5)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    results = asyncio.run(scenario())
+    assert [r["uid"] for r in results] == ["tok"] * 3
+    assert calls == ["tok"]
+    assert auth._INFLIGHT == {}
+    assert auth.TOKENS.counters["coalesced"] == 3
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached(verifier):
+    release, calls = verifier
+
+    async def scenario():
+        tasks = [asyncio.create_task(auth.verify_id_token_cached("bad")) for _ in range(3)]
+        await _settle(lambda: calls)
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 5)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert auth._INFLIGHT == {}
+    assert auth.TOKENS.stats()["items"] == 0
+
+
+def test_callers_get_their_own_claims(verifier):
+    release, calls = verifier
+    release.set()
+
+    first = asyncio.run(auth.verify_id_token_cached("tok"))
+    first["uid"] = "someone-else"
+    first["firebase"]["sign_in_provider"] = "custom"
+    second = asyncio.run(auth.verify_id_token_cached("tok"))
+    assert second["uid"] == "tok"
+    assert second["firebase"]["sign_in_provider"] == "password"
+    assert calls == ["tok"]
+    assert auth.TOKENS.counters["hits"] == 1
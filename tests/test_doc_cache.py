@@ -0,0 +1,26 @@
+from app.pipeline import ingestion
+from app.pipeline.doc_cache import DocCache, file_key
+
+
+def test_key_depends_on_suffix(tmp_path):
+    txt, csv = tmp_path / "a.txt", tmp_path / "a.csv"
+    txt.write_bytes(b"Payment within 30 days.\n")
+    csv.write_bytes(b"Payment within 30 days.\n")
+    assert file_key(txt, "en") != file_key(csv, "en")
+    assert file_key(txt, "en") != file_key(txt, "de")
+    assert file_key(txt, "en") == file_key(tmp_path / "a.txt", "en")
+
+
+def test_load_document_caches_segments_only(tmp_path, monkeypatch):
+    cache = DocCache(str(tmp_path / "docs.sqlite"))
+    monkeypatch.setattr(ingestion, "get_doc_cache", lambda: cache)
+    path = tmp_path / "contract.txt"
+    path.write_text("Payment is due within 30 days.\nThe term is 12 months.\n", encoding="utf-8")
+
+    first = ingestion.load_document(path, "en")
+    second = ingestion.load_document(path, "en")
+    assert not first["cached"] and second["cached"]
+    assert "text" not in first and "text" not in second
+    assert second["segments"] == first["segments"] == list(ingestion.iter_document_segments(path, "en"))
+    assert second["facts"] == first["facts"]
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,85 @@
+import pytest
+
+from app.pipeline import facts, rules
+from clausematch_engine.segment import segment_text
+
+
+def test_number_led_kinds_share_one_match():
+    found = facts.scan("Pay 1.234,56 € and 12 % within 30 days, or 7 EUR.", "de")
+    assert [(f.kind, f.value, f.text) for f in found] == [
+        ("money", {"currency": "EUR", "amount_minor": 123456}, "1.234,56 €"),
+        ("percent", "12", "12 %"),
+        ("number", "30", "30"),
+        ("money", {"currency": "EUR", "amount_minor": 700}, "7 EUR"),
+    ]
+    assert facts.scan("30days 007", "en") == [facts.Fact("number", "7", 7, 10, "007")]
+
+
+def test_en_and_de_amounts_agree():
+    en = rules.extract_facts("The fee is EUR 1,234.56, due June 30, 2025, plus 5 percent.", "en")
+    de = rules.extract_facts("Die Gebühr beträgt 1.234,56 €, fällig am 30. Juni 2025, zzgl. 5 Prozent.", "de")
+    for field in ("money", "dates", "percentages", "numbers"):
+        assert en[field] == de[field], field
+
+
+def test_invalid_date_keeps_its_numbers():
+    found = facts.scan("due 31.02.2025", "de")
+    assert [(f.kind, f.value) for f in found] == [("number", "31"), ("number", "2"), ("number", "2025")]
+
+
+def test_section_numbers_and_space_grouping():
+    assert rules.extract_facts("Section 3.2.1 and 1.234.567 units", "de")["numbers"] == ["3", "2", "1", "1234567"]
+    assert rules.extract_facts("Gebühr 1 234,56 EUR", "de")["money"] == [{"currency": "EUR", "amount_minor": 123456}]
+
+
+def test_segmented_clauses_keep_amounts_and_dates():
+    # Facts are extracted per segment, so the segmenter must not cut inside them
+    de = segment_text("Der Lieferant zahlt 654.791,12 € spätestens am 24.11.2030. Fällig am 30. Juni 2025.")
+    assert [rules.extract_facts(s, "de")["dates"] for s in de] == [["2030-11-24"], ["2025-06-30"]]
+    assert rules.extract_facts(de[0], "de")["money"] == [{"currency": "EUR", "amount_minor": 65479112}]
+    assert rules.extract_facts(segment_text("EUR 654,791.12 by 24.11.2030.")[0], "de") == {
+        "money": [{"currency": "EUR", "amount_minor": 65479112}], "dates": ["2030-11-24"],
+        "numbers": ["654791.12"], "percentages": [], "ids": [],
+    }
+
+
+def test_lowercase_prefix_currencies():
+    for text, minor in (("pay eur 1,250.00 now", 125000), ("pay euro 100", 10000), ("Pay Eur 5", 500), ("chf 20 or usd 7", 2000)):
+        money = rules.extract_facts(text, "en")["money"]
+        assert money and money[0]["amount_minor"] == minor, text
+    assert rules.extract_facts("deliver goods europe 100", "en")["money"] == []
+
+
+@pytest.fixture
+def kinds(monkeypatch):
+    # register() mutates module state; restore it afterwards
+    monkeypatch.setattr(facts, "_KINDS", list(facts._KINDS))
+    yield facts.register
+    monkeypatch.undo()
+    facts._compile()
+
+
+def test_registered_kind_wins_over_builtin_kinds(kinds):
+    kinds("po", r"(?<!\w)(?i:PO)-(?P<po_n>\d+)(?!\w)", lambda m, lang: int(m.group("po_n")), first="Pp")
+    assert [(f.kind, f.value) for f in facts.scan("order PO-1 and po-123", "en")] == [("po", 1), ("po", 123)]
+    assert rules.extract_facts("order PO-17", "en")["po"] == [17]
+
+
+def test_registered_kind_without_first_chars_still_matches(kinds):
+    kinds("ref", r"(?<!\w)ref#(?P<ref_n>\d+)", lambda m, lang: m.group("ref_n"))
+    assert [(f.kind, f.value) for f in facts.scan("see ref#42, 5 %", "en")] == [("ref", "42"), ("percent", "5")]
+
+
+def test_register_before_number_led_kinds(kinds):
+    kinds("duration", r"(?<!\w)(?P<duration_n>\d+)\s(?:days|Tage)(?!\w)", lambda m, lang: int(m.group("duration_n")), before="number", first=r"\d")
+    found = facts.scan("ABC-12 within 30 days, 5 %", "en")
+    assert [(f.kind, f.value) for f in found] == [("id", "ABC-12"), ("duration", 30), ("percent", "5")]
+    with pytest.raises(ValueError):
+        kinds("id", r"x", lambda m, lang: None)
+    with pytest.raises(ValueError):
+        kinds("other", r"x", lambda m, lang: None, before="missing")
+
+
+def test_registered_kinds_are_removed_again():
+    assert facts.scan("30 days", "en")[0].kind == "number"
+    assert facts.scan("PO-1", "en")[0].kind == "id"
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clausematch_engine import metrics
+
+os.environ.setdefault("FIREBASE_ALLOW_INSECURE", "1")
+
+
+@pytest.fixture
+def client():
+    from backend.main import app
+
+    return TestClient(app)
+
+
+def test_render():
+    registry = metrics.Registry()
+    hist = registry.add(metrics.Histogram("t_seconds", "Test.", ("stage",), buckets=(0.1, 1.0)))
+    hist.observe(0.5, stage='a"b')
+    text = registry.render()
+    assert 't_seconds_bucket{stage="a\\"b",le="0.1"} 0' in text
+    assert 't_seconds_bucket{stage="a\\"b",le="+Inf"} 1' in text
+    assert 't_seconds_count{stage="a\\"b"} 1' in text
+
+
+def test_operational_endpoints_open_without_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "TOKEN", "")
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/auth/stats").status_code == 200
+
+
+def test_operational_endpoints_need_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "TOKEN", "s3cret")
+    for path in ("/metrics", "/auth/stats"):
+        assert client.get(path).status_code == 401
+        assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get(path, headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+def test_operational_endpoints_disabled(client, monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/auth/stats").status_code == 404
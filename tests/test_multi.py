@@ -0,0 +1,60 @@
+from clausematch_engine.multi import align_to_pivot, fact_key, rows, vote
+
+PIVOT = ["Fee is 10 EUR", "Term is 12 months", "Notice in 30 days"]
+
+
+def test_one_version_merging_pivot_segments_joins_their_row():
+    # v1 has the first two clauses as one segment; v2 keeps them apart
+    v1 = (["Fee 10 EUR, term 12 months", "Notice 30 days"], [((0, 1), (0,)), ((2,), (1,))])
+    v2 = (["Fee 10", "Term 12", "Notice 31"], [((0,), (0,)), ((1,), (1,)), ((2,), (2,))])
+    assert rows(PIVOT, [v1, v2]) == [
+        ["Fee is 10 EUR Term is 12 months", "Fee 10 EUR, term 12 months", "Fee 10 Term 12"],
+        ["Notice in 30 days", "Notice 30 days", "Notice 31"],
+    ]
+
+
+def test_inserted_segments_get_rows_of_their_own():
+    # v1 inserts before the first clause and after the second; v2 also after the second
+    v1 = (["Preamble", "Fee 10", "Term 12", "Extra", "Notice 30"],
+          [((), (0,)), ((0,), (1,)), ((1,), (2,)), ((), (3,)), ((2,), (4,))])
+    v2 = (["Fee 10", "Term 12", "Added", "Notice 30"], [((0,), (0,)), ((1,), (1,)), ((), (2,)), ((2,), (3,))])
+    assert rows(PIVOT, [v1, v2]) == [
+        ["", "Preamble", ""],
+        [PIVOT[0], "Fee 10", "Fee 10"],
+        [PIVOT[1], "Term 12", "Term 12"],
+        ["", "Extra", "Added"],
+        [PIVOT[2], "Notice 30", "Notice 30"],
+    ]
+
+
+def test_dropped_segment_leaves_its_cell_empty():
+    v1 = (["Fee 10", "Notice 30"], [((0,), (0,)), ((1,), ()), ((2,), (1,))])
+    assert [r[1] for r in rows(PIVOT, [v1])] == ["Fee 10", "", "Notice 30"]
+
+
+def test_align_to_pivot_covers_both_sides():
+    version = ["Gebühr 10 EUR", "Zusatz", "Laufzeit 12 Monate", "Kündigung in 30 Tagen"]
+    beads = align_to_pivot(PIVOT, version)
+    assert [i for ii, _ in beads for i in ii] == [0, 1, 2]
+    assert [j for _, jj in beads for j in jj] == [0, 1, 2, 3]
+    assert ((2,), (3,)) in beads
+
+
+def test_vote():
+    assert vote([]) == ("OK", [])
+    assert vote(["a", "a", "a"]) == ("OK", [])
+    assert vote(["a", "b", "a"]) == ("MISMATCH", [1])
+    assert vote(["a", "a", "b", "c"]) == ("REVIEW", [])
+    # Two against two: no majority, so nobody is named
+    assert vote(["a", "b", "a", "b"]) == ("REVIEW", [])
+    assert vote(["a", "b"]) == ("REVIEW", [])
+
+
+def test_fact_key_compares_number_values():
+    assert fact_key("due 06.05.2025") == fact_key("due 6.5.2025") == fact_key("fällig 2025-05-06")
+    assert fact_key("Fee 1,234.50") == fact_key("Gebühr 1.234,50")
+    assert fact_key("Fee 10") != fact_key("Fee 11")
+    # A missing clause differs from one without numbers
+    assert fact_key("") != fact_key("No numbers here")
+    statuses = vote([fact_key(t) for t in ("pay in 06 days", "zahlbar in 6 Tagen", "payable in 7 days")])
+    assert statuses == ("MISMATCH", [2])
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from app.pipeline.records import Finding
+from clausematch_engine import paging
+
+
+PAIRS = [{"index": i, "isMismatch": i % 3 == 0} for i in range(10)]
+
+
+def test_pages_follow_cursors():
+    filters = paging.parse_filters(status="mismatch")
+    page, cursor = paging.take_page(paging.positioned(PAIRS, paging.parse_cursor(None)), 2, filters)
+    assert [p["index"] for p in page] == [0, 3] and cursor == "0:3"
+    page, cursor = paging.take_page(paging.positioned(PAIRS, paging.parse_cursor(cursor)), 2, filters)
+    assert [p["index"] for p in page] == [6, 9] and cursor is None
+
+
+def test_cursor_forms():
+    assert paging.parse_cursor("2:5") == (2, 6)
+    # A bare offset (the earlier clausematch API form) is chunk 0
+    assert paging.parse_cursor("5") == (0, 6)
+    for bad in ("x", "1:", "-1", "0:-2"):
+        with pytest.raises(ValueError):
+            paging.parse_cursor(bad)
+    assert list(paging.positioned(PAIRS, (1, 0))) == []
+
+
+def test_status_of_rows_and_records():
+    rows = [{"status": "REVIEW", "isMismatch": True}, {"isMismatch": False}, Finding("c1", "MISMATCH", risk="high")]
+    assert [paging.value(r, "status") for r in rows] == ["REVIEW", "OK", "MISMATCH"]
+    page, _ = paging.take_page(paging.positioned(rows, (0, 0)), 10, paging.parse_filters(status="MISMATCH", risk="HIGH"))
+    assert page == [rows[2].to_dict()]
+
+
+def test_ndjson_chunks(monkeypatch):
+    monkeypatch.setattr(paging, "NDJSON_CHUNK_BYTES", 40)
+    chunks = list(paging.ndjson_lines(paging.positioned(PAIRS, (0, 0)), {}))
+    assert len(chunks) > 1
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == PAIRS
@@ -0,0 +1,28 @@
+import json
+import pickle
+
+from app.pipeline.records import Finding
+from backend.clausematch.records import Comparison, PairMetrics
+from clausematch_engine.records import as_dict, json_default
+
+
+def test_finding_round_trip():
+    f = Finding("c1", "MISMATCH", field="amount", rationale="EUR 10 vs 12", rules_triggered=["money"], contexts=({"id": "r1"},))
+    assert Finding.from_dict(json.loads(json.dumps(f, default=json_default))) == f
+    g = pickle.loads(pickle.dumps(f))
+    assert g == f and g.rules_triggered is f.rules_triggered
+    assert f.replace(risk="high").risk == "high" and f.risk is None
+
+
+def test_comparison_round_trip():
+    c = Comparison(3, "Fee: 10 EUR", "Gebühr: 10 EUR", 0.8, False, PairMetrics(3, 11, 14, 3, 3))
+    assert Comparison.from_dict(as_dict(c)) == c
+    assert pickle.loads(pickle.dumps(c)) == c
+    assert as_dict(c)["metrics"]["targetLength"] == 14
+    assert c != Finding("3", "OK")
+
+
+def test_records_have_no_dict():
+    assert not hasattr(Finding("c", "OK"), "__dict__")
+    assert not hasattr(PairMetrics(0, 1, 1, 1, 1), "__dict__")
+    assert as_dict({"plain": 1}) == {"plain": 1}
@@ -0,0 +1,109 @@
+import asyncio
+import os
+from functools import partial
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("FIREBASE_ALLOW_INSECURE", "1")
+
+from backend import reports  # noqa: E402
+from backend.auth import verify_token  # noqa: E402
+from backend.reports import ReportRepository  # noqa: E402
+from firestore_fake import FakeClient  # noqa: E402
+
+
+def _pairs(n):
+    return [{"index": i, "source": f"clause {i} " * 20, "target": f"Klausel {i} " * 20, "isMismatch": i % 3 == 0} for i in range(n)]
+
+
+@pytest.fixture
+def db():
+    return FakeClient()
+
+
+@pytest.fixture
+def repo(db):
+    return ReportRepository(db)
+
+
+def test_save_chunks_pairs_in_batches(db, repo, monkeypatch):
+    monkeypatch.setattr(reports, "chunk_pairs", partial(reports.chunk_pairs, max_bytes=2048))
+    monkeypatch.setattr(reports, "MAX_BATCH_WRITES", 3)
+    pairs = _pairs(40)
+    asyncio.run(repo.save("p1", {"userId": "alice", "createdAt": 1}, pairs))
+
+    meta = asyncio.run(repo.get("p1"))
+    chunks = meta["pairChunks"]
+    assert meta["pairCount"] == 40 and chunks > 3
+    assert db.writes == chunks + 1
+    assert db.commits == chunks // 3 + 1
+    assert asyncio.run(repo.pairs("p1")) == pairs
+    assert asyncio.run(repo.get("missing")) is None
+
+
+def test_iter_pairs_resumes_from_cursor(repo, monkeypatch):
+    monkeypatch.setattr(reports, "chunk_pairs", partial(reports.chunk_pairs, max_bytes=2048))
+    pairs = _pairs(25)
+    asyncio.run(repo.save("p1", {"userId": "alice", "createdAt": 1}, pairs))
+    chunks = asyncio.run(repo.get("p1"))["pairChunks"]
+
+    entries = list(repo.iter_pairs("p1", chunks))
+    assert [p for _, p in entries] == pairs
+    cursor = entries[9][0]
+    k, i = (int(x) for x in cursor.split(":"))
+    assert [p for _, p in repo.iter_pairs("p1", chunks, (k, i + 1))] == pairs[10:]
+
+
+def test_page_is_newest_first_and_per_user(repo):
+    for n in range(5):
+        asyncio.run(repo.save(f"a{n}", {"userId": "alice", "createdAt": n}, []))
+    asyncio.run(repo.save("b0", {"userId": "bob", "createdAt": 10}, []))
+
+    items, cursor = asyncio.run(repo.page("alice", limit=2))
+    assert [i["projectId"] for i in items] == ["a4", "a3"]
+    items, cursor = asyncio.run(repo.page("alice", limit=2, cursor=cursor))
+    assert [i["projectId"] for i in items] == ["a2", "a1"]
+    items, cursor = asyncio.run(repo.page("alice", limit=2, cursor=cursor))
+    assert [i["projectId"] for i in items] == ["a0"] and cursor is None
+    with pytest.raises(KeyError):
+        asyncio.run(repo.page("alice", cursor="b0"))
+    with pytest.raises(KeyError):
+        asyncio.run(repo.page("alice", cursor="missing"))
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    from backend.main import app
+    from backend.routes import analyze
+
+    monkeypatch.setattr(analyze, "INSECURE_MODE", False)
+    monkeypatch.setattr(analyze, "get_db", lambda: db)
+    app.dependency_overrides[verify_token] = lambda x_user: {"uid": x_user}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _as(uid):
+    return {"params": {"x_user": uid}}
+
+
+def test_reports_are_only_visible_to_their_owner(client):
+    files = {
+        "source": ("en.txt", b"Payment is due within 30 days.\nThe term is 12 months.\n"),
+        "target": ("de.txt", b"Die Zahlung ist innerhalb von 60 Tagen faellig.\nDie Laufzeit betraegt 12 Monate.\n"),
+    }
+    created = client.post("/api/analyze", files=files, **_as("alice"))
+    assert created.status_code == 200
+    project_id = created.json()["projectId"]
+
+    own = client.get(f"/api/results/{project_id}", **_as("alice"))
+    assert own.status_code == 200
+    assert own.json()["pairs"] == created.json()["pairs"]
+    assert client.get(f"/api/results/{project_id}", **_as("bob")).status_code == 403
+    assert client.get("/api/results/missing", **_as("alice")).status_code == 404
+
+    assert [i["projectId"] for i in client.get("/api/reports", **_as("alice")).json()["items"]] == [project_id]
+    assert client.get("/api/reports", **_as("bob")).json()["items"] == []
+    resubmit = dict(files, previous_project_id=(None, project_id))
+    assert client.post("/api/analyze", files=resubmit, **_as("bob")).status_code == 403
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+os.environ.setdefault("FIREBASE_ALLOW_INSECURE", "1")
+
+from app.pipeline import revision, storage  # noqa: E402
+from app.pipeline.records import Finding  # noqa: E402
+from backend.clausematch import revision as backend_revision  # noqa: E402
+from backend.clausematch.records import Comparison  # noqa: E402
+
+OLD = [
+    ("clause_0", "Payment is due within 30 days.", "Die Zahlung ist innerhalb von 30 Tagen fällig."),
+    ("clause_1", "The term is 12 months.", "Die Laufzeit beträgt 12 Monate."),
+]
+# The first pair is the same text re-extracted (other spacing, NFKC variant), now one clause
+# later; the second one was edited
+NEW = [
+    ("clause_0", "This agreement is confidential.", "Dieser Vertrag ist vertraulich."),
+    ("clause_1", "Payment is due  within 30 days. ", "Die Zahlung ist innerhalb von 30\u00a0Tagen fällig."),
+    ("clause_2", "The term is 24 months.", "Die Laufzeit beträgt 12 Monate."),
+]
+
+
+def test_both_apps_key_pairs_alike():
+    assert backend_revision.pair_digest is revision.pair_digest
+    assert revision.pair_digest(*OLD[0][1:]) == revision.pair_digest(*NEW[1][1:])
+    assert revision.pair_digest(*OLD[1][1:]) != revision.pair_digest(*NEW[2][1:])
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_backend", storage.LocalBackend(str(tmp_path)))
+
+
+def test_unchanged_pair_carries_its_findings_over(artifacts):
+    from app.services import orchestrator_client
+
+    revision.save_pairs("old", OLD)
+    findings = [Finding("clause_0", "MISMATCH", field="money", rationale="10 != 12"), Finding("clause_1", "OK")]
+    storage.put_json("old/findings.json", [f.to_dict() for f in findings])
+
+    carried = orchestrator_client._revision(NEW, "new", "old")
+    assert list(carried) == [1]
+    moved = revision.carry_over(NEW[1][0], carried[1])
+    assert [(f.clause_key, f.status, f.field, f.carried_over) for f in moved] == [("clause_1", "MISMATCH", "money", True)]
+    # The new job's pairs are stored for the next revision
+    assert revision.exists("new") and orchestrator_client._revision(NEW, "newer", "new") == {}
+    assert revision.previous_findings("missing") == {} and revision.previous_findings(None) == {}
+
+
+def _pair(index, source, target):
+    return {"index": index, "source": source, "target": target}
+
+
+def test_backend_recomputes_only_changed_pairs():
+    previous = [Comparison(i, a, b, 0.9, False, None).to_dict() for i, (_, a, b) in enumerate(OLD)]
+    pairs = [_pair(i, a, b) for i, (_, a, b) in enumerate(NEW)]
+
+    todo, carried = backend_revision.split_pairs(pairs, previous)
+    assert todo == [pairs[0], pairs[2]]
+    assert list(carried) == [1] and carried[1].index == 1 and carried[1].source == OLD[0][1]
+    computed = [Comparison(p["index"], p["source"], p["target"], 0.5, True, None) for p in todo]
+    merged = backend_revision.merge(pairs, computed, carried)
+    assert [c.index for c in merged] == [0, 1, 2] and [c.is_mismatch for c in merged] == [True, False, True]
+
+
+def test_backend_carries_stored_records_without_touching_them():
+    # The in-memory report store keeps Comparison records rather than dicts
+    previous = [Comparison(i, a, b, 0.9, False, None) for i, (_, a, b) in enumerate(OLD)]
+    _, carried = backend_revision.split_pairs([_pair(i, a, b) for i, (_, a, b) in enumerate(NEW)], previous)
+    assert carried[1].index == 1 and carried[1].source == OLD[0][1]
+    assert previous[0].index == 0
@@ -0,0 +1,42 @@
+import random
+
+from clausematch_engine.segment import LineBuffer, iter_segments, segment_text
+
+
+def test_chunked_segments_match_whole_text():
+    rng = random.Random(7)
+    alphabet = "ab. ?!\n\r x\x85 "
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 8))))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert list(iter_segments(chunks)) == segment_text(text), chunks
+
+
+def test_sentences_end_only_at_punctuation_before_whitespace():
+    assert segment_text("Pay EUR 1,234.56 by 24.11.2030. Section 3.2.1 applies! Ok?Yes") == [
+        "Pay EUR 1,234.56 by 24.11.2030", "Section 3.2.1 applies", "Ok?Yes",
+    ]
+    # Ordinals and list markers are not sentence ends; "3.2.1." is
+    assert segment_text("1. Fällig am 30. Juni 2025... See 3.2.1. Done") == ["1. Fällig am 30. Juni 2025", "See 3.2.1", "Done"]
+
+
+def test_line_buffer_holds_only_the_partial_line():
+    lines = LineBuffer()
+    assert lines.feed("first li") == []
+    assert lines.feed("ne\r") == ["first line\r"]
+    assert lines.feed("\nsecond") == ["\n"]
+    assert lines.flush() == ["second"]
+    assert lines.flush() == []
+
+
+def test_long_unbroken_input_is_not_rescanned():
+    # Without a line break, each chunk is kept as it came in: nothing is joined or scanned
+    # again until the line ends, so 4 MB in 40 KB chunks costs one pass, not one per chunk
+    lines = LineBuffer()
+    chunks = ["word " * (1 << 13) for _ in range(100)]
+    for chunk in chunks:
+        assert lines.feed(chunk) == []
+    assert len(lines.tail) == 100 and all(piece is chunk for piece, chunk in zip(lines.tail, chunks))
+    assert lines.feed("end\nnext") == ["".join(chunks) + "end\n"]
+    assert lines.tail == ["next"]
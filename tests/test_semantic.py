@@ -0,0 +1,99 @@
+import asyncio
+import json
+from functools import partial
+
+import httpx
+import pytest
+
+from app.pipeline import semantic
+from clausematch_engine.verdict_cache import VerdictCache
+
+
+def _verdict(comment):
+    text = json.dumps({"status": "MISMATCH", "confidence": 0.9, "issues": [{"type": "number", "comment": comment}]})
+    return {"results": [{"generated_text": text}]}
+
+
+class WatsonxStub:
+    """MockTransport handler: echoes the EN text back as the issue comment, slower for earlier items."""
+
+    def __init__(self):
+        self.requests = []
+        self.active = self.peak = 0
+
+    async def __call__(self, request):
+        prompt = json.loads(request.content)["input"]
+        a_txt = prompt.split("EN: ", 1)[1].split("\n", 1)[0]
+        self.requests.append(a_txt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            # Later items answer first, so results come back out of order
+            await asyncio.sleep(0.05 / (1 + len(self.requests)))
+            if a_txt.startswith("error"):
+                return httpx.Response(500)
+            if a_txt.startswith("timeout"):
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(200, json=_verdict(a_txt))
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def watsonx(monkeypatch):
+    stub = WatsonxStub()
+    monkeypatch.setenv("WML_PROJECT_ID", "p")
+    monkeypatch.setattr(semantic, "_get_iam_token", lambda: "token")
+    monkeypatch.setattr(semantic, "get_cache", lambda cache=VerdictCache(None): cache)
+    monkeypatch.setattr(semantic.httpx, "AsyncClient", partial(httpx.AsyncClient, transport=httpx.MockTransport(stub)))
+    return stub
+
+
+def _items(texts):
+    return [(t, f"DE {t}", {}, {}) for t in texts]
+
+
+def _comments(results):
+    return [r[0]["rationale"] if r else None for r in results]
+
+
+def test_results_keep_item_order_within_the_concurrency_bound(watsonx):
+    texts = [f"clause {i}" for i in range(12)]
+    stats = {}
+    results = asyncio.run(semantic.llm_check_batch(_items(texts), concurrency=3, stats=stats))
+    assert _comments(results) == texts
+    assert watsonx.peak == 3
+    assert stats == {"ok": 12}
+
+
+def test_cached_and_repeated_pairs_are_sent_once(watsonx):
+    stats = {}
+    semantic.llm_check_many(_items(["a", "b"]), stats=stats)
+    results = semantic.llm_check_many(_items(["a", "c", "c", "b", "c"]), stats=stats)
+    assert _comments(results) == ["a", "c", "c", "b", "c"]
+    assert sorted(watsonx.requests) == ["a", "b", "c"]
+    assert stats == {"ok": 3, "cached": 2}
+
+
+def test_errors_and_timeouts_leave_empty_slots(watsonx):
+    stats = {}
+    results = semantic.llm_check_many(_items(["error 1", "ok", "timeout 1", "error 1"]), stats=stats)
+    assert _comments(results) == [None, "ok", None, None]
+    # One request per distinct pair, and failures are not cached
+    assert stats == {"error": 2, "ok": 1}
+    semantic.llm_check_many(_items(["error 1"]), stats=stats)
+    assert stats["error"] == 3
+
+
+def test_many_runs_inside_an_event_loop(watsonx):
+    async def caller():
+        return semantic.llm_check_many(_items(["x", "y"]))
+
+    assert _comments(asyncio.run(caller())) == ["x", "y"]
+
+
+def test_no_credentials_skips_every_item(watsonx, monkeypatch):
+    monkeypatch.setattr(semantic, "_get_iam_token", lambda: "")
+    stats = {}
+    assert semantic.llm_check_many(_items(["a", "b"]), stats=stats) == [[], []]
+    assert stats == {"skipped": 2} and watsonx.requests == []
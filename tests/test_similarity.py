@@ -0,0 +1,41 @@
+import random
+
+import numpy as np
+
+from backend.clausematch.compare import compare_pairs
+from clausematch_engine.similarity import similarity, similarity_batch
+
+# Few distinct tokens so sides repeat and share them; "\x00" is the batch's own separator
+WORDS = ["a", "A", "the", "The", "x", "y", "z", "q", "\x00", "Ünïcode", "30.06.2025", "1.250,00"]
+
+
+def _text(rnd: random.Random) -> str:
+    if rnd.random() < 0.1:
+        return rnd.choice(["", " ", "\n\t"])
+    return rnd.choice([" ", "  ", "\n"]).join(rnd.choices(WORDS, k=rnd.randint(1, 12)))
+
+
+def test_batch_matches_scalar_fuzz():
+    rnd = random.Random(6)
+    for _ in range(200):
+        n = rnd.randint(1, 40)
+        sources = [_text(rnd) for _ in range(n)]
+        targets = [_text(rnd) for _ in range(n)]
+        expected = np.array([similarity(a, b) for a, b in zip(sources, targets)])
+        assert np.array_equal(similarity_batch(sources, targets), expected), (sources, targets)
+
+
+def test_repeated_tokens_do_not_collide():
+    assert similarity_batch(["the the the x"], ["y z"])[0] == similarity("the the the x", "y z") == 0.1875
+    assert similarity_batch(["a a a a b", "q"], ["c d", "q"]).tolist() == [similarity("a a a a b", "c d"), 1.0]
+
+
+def test_compare_pairs_with_repeated_tokens():
+    pairs = [{"index": 0, "source": "a a a a b", "target": "c d"}, {"index": 1, "source": "q", "target": "q"}]
+    results = compare_pairs(pairs, [None, None])
+    assert [r.similarity for r in results] == [round(similarity("a a a a b", "c d"), 3), 1.0]
+    assert [r.is_mismatch for r in results] == [True, False]
+
+
+def test_empty_batch():
+    assert similarity_batch([], []).shape == (0,)
@@ -0,0 +1,44 @@
+import json
+import time
+
+from clausematch_engine.store import BoundedStore, _size
+
+
+def test_page_does_not_count_or_reorder():
+    store = BoundedStore(max_items=3)
+    for i in range(3):
+        store.put(f"k{i}", {"n": i}, owner="u", created_at=i)
+    items, cursor = store.page("u", limit=2)
+    assert [k for k, _ in items] == ["k2", "k1"] and cursor == "k1"
+    assert store.page("u", limit=2, cursor=cursor) == ([("k0", {"n": 0})], None)
+    assert store.stats()["hits"] == store.stats()["misses"] == 0
+    # k0 is still least recently used, so it is the one evicted
+    store.put("k3", {"n": 3}, owner="u", created_at=3)
+    assert store.get("k0") is None and store.get("k1") == {"n": 1}
+
+
+def test_page_skips_expired():
+    store = BoundedStore(ttl_s=60)
+    store.put("old", 1, owner="u", created_at=1)
+    store.put("new", 2, owner="u", created_at=2)
+    store._items["old"] = (1, 1, time.time() - 120)
+    assert store.page("u") == ([("new", 2)], None)
+
+
+def test_page_reads_spilled(tmp_path):
+    store = BoundedStore(max_items=1, spill_path=str(tmp_path / "spill.sqlite"))
+    store.put("a", {"v": "a"}, owner="u", created_at=1)
+    store.put("b", {"v": "b"}, owner="u", created_at=2)
+    assert store.page("u") == ([("b", {"v": "b"}), ("a", {"v": "a"})], None)
+    assert store.stats()["spill_hits"] == 0
+
+
+def _close(value) -> bool:
+    exact = len(json.dumps(value, separators=(",", ":")))
+    return abs(_size(value) - exact) <= 0.1 * exact
+
+
+def test_size_estimate():
+    assert _close({"status": "COMPLETED", "summary": {"total": 3, "mismatches": 1}, "findings": [{"clause_key": "c1", "rationale": "ok"}]})
+    # Long lists are sampled and scaled to their length
+    assert _close({"findings": [{"clause_key": f"c{i:05d}", "status": "MISMATCH", "contexts": []} for i in range(10000)]})
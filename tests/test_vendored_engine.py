@@ -0,0 +1,27 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _vendor_engine():
+    spec = importlib.util.spec_from_file_location("vendor_engine", ROOT / "frontend" / "scripts" / "vendor_engine.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_vendored_engine_is_current():
+    # After changing clausematch_engine/, run: python frontend/scripts/vendor_engine.py
+    assert _vendor_engine().stale() == []
+
+
+def test_serverless_app_imports_without_repo_root():
+    # -I: no cwd, no PYTHONPATH; only frontend/ is importable, as in the deployed function
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import api.index, clausematch_engine; "
+        "assert '_vendor' in clausematch_engine.__file__, clausematch_engine.__file__"
+    )
+    subprocess.run([sys.executable, "-I", "-c", code, str(ROOT / "frontend")], check=True, cwd="/")
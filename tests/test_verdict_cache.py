@@ -0,0 +1,43 @@
+from clausematch_engine.verdict_cache import VerdictCache, make_key
+
+
+def test_key_normalizes_texts():
+    assert make_key("m", "v1", "Fee  10 EUR", "Gebühr 10 EUR ") == make_key("m", "v1", "Fee 10 EUR", "Gebühr 10 EUR")
+    assert make_key("m", "v1", "a", "b") != make_key("m", "v2", "a", "b")
+    assert make_key("m", "v1", "a", "b", "c") != make_key("m", "v1", "a", "b")
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    cache = VerdictCache(path, max_items=2)
+    cache.put("k", {"status": "OK"})
+    assert cache.get("k") == {"status": "OK"}
+    assert VerdictCache(path).get("k") == {"status": "OK"}
+    assert cache.stats()["mem_hits"] == 1
+
+
+def _age(cache, key, seconds):
+    created, value = cache._mem[key]
+    cache._mem[key] = (created - seconds, value)
+
+
+def test_expired_entries_leave_memory():
+    cache = VerdictCache(None, ttl_s=60)
+    for key in ("old1", "old2", "fresh", "read"):
+        cache.put(key, 1)
+    for key in ("old1", "old2", "read"):
+        _age(cache, key, 120)
+    # A put sweeps the least recently used end up to the first live entry
+    cache.put("new", 1)
+    assert list(cache._mem) == ["fresh", "read", "new"]
+    # The periodic purge also drops expired entries behind live ones
+    cache._puts = VerdictCache.PURGE_EVERY - 1
+    cache.put("newer", 1)
+    assert list(cache._mem) == ["fresh", "new", "newer"]
+    assert cache.stats()["expired"] == 3
+
+
+def test_unwritable_path_keeps_memory_tier():
+    cache = VerdictCache("/proc/clausematch/verdicts.sqlite")
+    cache.put("k", 1)
+    assert cache.get("k") == 1 and "disk_items" not in cache.stats()
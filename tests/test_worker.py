@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+
+from orchestrator.worker import JobWorker, report_progress
+
+
+def _job(job_id, crash=False):
+    if crash:
+        os._exit(1)
+    return {"status": "COMPLETED", "job_id": job_id}
+
+
+def _reporting_job(job_id, crash=False):
+    for i in range(20):
+        report_progress(job_id, "step", {"i": i})
+    return _job(job_id, crash)
+
+
+class Recorder:
+    def __init__(self):
+        self.updates = []
+        self.done = {}
+
+    def __call__(self, job_id, record):
+        self.updates.append((job_id, record["status"]))
+        if record["status"] in {"COMPLETED", "FAILED"}:
+            self.done.setdefault(job_id, threading.Event()).set()
+
+    def wait(self, job_id):
+        assert self.done.setdefault(job_id, threading.Event()).wait(60)
+        return [status for j, status in self.updates if j == job_id]
+
+
+def test_states_in_order_and_pool_rebuilt_after_crash():
+    rec = Recorder()
+    worker = JobWorker(_job, rec, workers=1, max_queue=4)
+    try:
+        worker.submit("ok-1")
+        assert rec.wait("ok-1") == ["QUEUED", "RUNNING", "COMPLETED"]
+        worker.submit("crash", True)
+        assert rec.wait("crash") == ["QUEUED", "RUNNING", "FAILED"]
+        worker.submit("ok-2")
+        assert rec.wait("ok-2") == ["QUEUED", "RUNNING", "COMPLETED"]
+        assert worker.stats()["running"] == 0
+    finally:
+        worker.shutdown()
+
+
+def test_progress_arrives_before_the_result_and_failures_do_not_wait(monkeypatch):
+    # A crashed job never sends its end marker; it must not sit out the flush timeout
+    monkeypatch.setenv("ORCH_PROGRESS_FLUSH_S", "30")
+    rec = Recorder()
+    progress = lambda job_id, event, data: rec.updates.append((job_id, event))  # noqa: E731
+    worker = JobWorker(_reporting_job, rec, workers=1, max_queue=4, on_progress=progress)
+    try:
+        worker.submit("ok-1")
+        assert rec.wait("ok-1") == ["QUEUED", "RUNNING"] + ["step"] * 20 + ["COMPLETED"]
+        started = time.monotonic()
+        worker.submit("crash", True)
+        assert rec.wait("crash")[-1] == "FAILED"
+        assert time.monotonic() - started < 20
+        worker.submit("ok-2")
+        assert rec.wait("ok-2")[-1] == "COMPLETED"
+        assert worker.stats()["running"] == 0
+    finally:
+        worker.shutdown()